@@ -1,111 +1,651 @@
-import pandas as pd
-import requests
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from contextlib import nullcontext
+from functools import lru_cache
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter, deque
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
 import warnings
-import tkinter as tk
-from tkinter import ttk
+
+# 무거운 모듈은 처음 쓸 때 불러옵니다. (--help와 대화형 모드의 첫 프롬프트가 바로 뜨도록)
+from timefolio_lazy import lazy_import
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+requests = lazy_import('requests')
+plt = lazy_import('matplotlib.pyplot')
+tk = lazy_import('tkinter')
+ttk = lazy_import('tkinter.ttk')
+
+from timefolio_calendar import (CACHE_DIR, trading_days, etf_idx, NegativeCache, find_first_pdf_date,
+                                PROBE_WINDOW, UNCOVERED_PROBE_WINDOW, uncovered_years)
+from timefolio_store import HoldingsStore, select_holding_columns
+from timefolio_parser import parse_holdings_table
+from timefolio_index import HoldingsIndex
+from timefolio_asof import HoldingsHistory
+from timefolio_analytics import PortfolioAnalytics, DEFAULT_WINDOW
+from timefolio_changes import REBALANCE_THRESHOLD, to_datetime_index, compute_rebalance_events, status_labels, change_table
+# 그래프/창 모듈(timefolio_plot, timefolio_stream, timefolio_table)은 matplotlib/tkinter를 바로 불러오므로 쓰는 함수 안에서 import합니다.
 
 # 경고 메시지 무시
 warnings.filterwarnings('ignore', category=FutureWarning)
 
+# 동시에 보낼 최대 요청 수 (서버 부하를 고려해 너무 크게 잡지 마세요)
+DEFAULT_MAX_WORKERS = 8
+
+# 요청할 거래일이 이보다 많으면 첫 PDF 날짜를 이분 탐색으로 먼저 찾습니다.
+BISECT_MIN_DAYS = 120
+
+# 스트리밍 수집 시 받은 페이지를 이 일수만큼 모아 저장소에 저장합니다. (저장된 날도 이 단위로 나눠 읽음)
+STREAM_SAVE_EVERY = 50
+
+# 일괄 수집 시 모든 ETF가 함께 지키는 초당 최대 요청 수 (0이면 제한 없음)
+DEFAULT_RATE_LIMIT = 50
+
+# 최근 요청 중 오류(5xx/429/연결 오류) 비율이 이 값을 넘으면 동시 요청 수를 절반으로 줄입니다.
+TARGET_ERROR_RATE = 0.1
+
+# 일시적 오류의 최대 재시도 횟수와 재시도 대기 시간(초) 기준값/상한
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+
+# 다시 시도할 HTTP 상태 코드 (서버 과부하/일시 오류)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# fetch_day 반환값: 조건부 요청에 304 응답 (저장된 페이지가 그대로임)
+NOT_MODIFIED = object()
+
+# ETF 목록 정의 (key: 메뉴 선택값, value: (ETF 이름, PDF 페이지 URL 템플릿))
+ETF_LIST = {
+    # 글로벌 시리즈
+    '1': ("미국나스닥100액티브", "https://timefolioetf.co.kr/m11_view.php?idx=2&cate=&pdfDate={}"),
+    '2': ("차이나AI테크액티브", "https://timefolioetf.co.kr/m11_view.php?idx=19&cate=&pdfDate={}"),
+    '3': ("글로벌AI인공지능액티브", "https://timefolioetf.co.kr/m11_view.php?idx=6&cate=&pdfDate={}"),
+    '4': ("미국S&P500액티브", "https://timefolioetf.co.kr/m11_view.php?idx=5&cate=&pdfDate={}"),
+    '5': ("미국배당다우존스액티브", "https://timefolioetf.co.kr/m11_view.php?idx=18&cate=&pdfDate={}"),
+    '6': ("글로벌우주테크&방산액티브", "https://timefolioetf.co.kr/m11_view.php?idx=20&cate=&pdfDate={}"),
+    '7': ("미국나스닥100채권혼합50액티브", "https://timefolioetf.co.kr/m11_view.php?idx=10&cate=&pdfDate={}"),
+    '8': ("글로벌소비트렌드액티브", "https://timefolioetf.co.kr/m11_view.php?idx=8&cate=&pdfDate={}"),
+    '9': ("글로벌안티에이징바이오액티브", "https://timefolioetf.co.kr/m11_view.php?idx=9&cate=&pdfDate={}"),
+    '10': ("글로벌탑픽액티브", "https://timefolioetf.co.kr/m11_view.php?idx=22&cate=&pdfDate={}"),
+    # K 시리즈
+    'a': ("K바이오액티브", "https://timefolioetf.co.kr/m11_view.php?idx=13&cate=&pdfDate={}"),
+    'b': ("Korea플러스배당액티브", "https://timefolioetf.co.kr/m11_view.php?idx=12&cate=&pdfDate={}"),
+    'c': ("코스피액티브", "https://timefolioetf.co.kr/m11_view.php?idx=11&cate=&pdfDate={}"),
+    'd': ("코리아밸류업액티브", "https://timefolioetf.co.kr/m11_view.php?idx=15&cate=&pdfDate={}"),
+    'e': ("K이노베이션액티브", "https://timefolioetf.co.kr/m11_view.php?idx=17&cate=&pdfDate={}"),
+    'f': ("K컬처액티브", "https://timefolioetf.co.kr/m11_view.php?idx=1&cate=&pdfDate={}"),
+    'g': ("K신재생에너지액티브", "https://timefolioetf.co.kr/m11_view.php?idx=16&cate=&pdfDate={}")
+}
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+KOREAN_FONTS = ['NanumGothic', 'AppleGothic', 'Malgun Gothic', 'Noto Sans KR']
+FONT_CACHE_PATH = os.path.join(CACHE_DIR, 'font.json')
+
+@lru_cache(maxsize=None)
+def resolve_korean_font():
+    """설치된 한글 폰트 이름을 찾습니다. 없으면 None.
+
+    전체 폰트 목록(fontManager.ttflist)을 훑는 대신, 한 번 찾은 폰트는 matplotlib 버전과 함께
+    FONT_CACHE_PATH에 기록해 다음 실행부터 바로 씁니다. (못 찾은 경우는 기록하지 않아 폰트를 설치하면 다시 찾음)
+    """
+    import matplotlib
+    try:
+        with open(FONT_CACHE_PATH, encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('matplotlib') == matplotlib.__version__ and cached.get('font') in KOREAN_FONTS:
+            return cached['font']
+    except (OSError, ValueError):
+        pass
+
+    from matplotlib import font_manager
+    installed = {f.name for f in font_manager.fontManager.ttflist}
+    font_name = next((name for name in KOREAN_FONTS if name in installed), None)
+    if font_name is not None:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(FONT_CACHE_PATH, 'w', encoding='utf-8') as f:
+                json.dump({'matplotlib': matplotlib.__version__, 'font': font_name}, f)
+        except OSError:
+            pass
+    return font_name
+
 def set_korean_font():
     """Matplotlib에서 한글 폰트를 자동으로 찾아 설정합니다."""
     try:
-        font_list = [f.name for f in fm.fontManager.ttflist]
-        priority_list = ['NanumGothic', 'AppleGothic', 'Malgun Gothic', 'Noto Sans KR']
-        for font_name in priority_list:
-            if font_name in font_list:
-                plt.rc('font', family=font_name)
-                plt.rcParams['axes.unicode_minus'] = False
-                print(f"✅ 한글 폰트 '{font_name}'을(를) 설정했습니다.")
-                return
+        import matplotlib
+        font_name = resolve_korean_font()
+        if font_name is not None:
+            matplotlib.rc('font', family=font_name)
+            matplotlib.rcParams['axes.unicode_minus'] = False
+            print(f"✅ 한글 폰트 '{font_name}'을(를) 설정했습니다.")
+            return
         print("⚠️ 경고: 한글 폰트를 찾지 못했습니다. 그래프의 글자가 깨질 수 있습니다.")
     except Exception as e:
         print(f"⚠️ 경고: 폰트 설정 중 오류가 발생했습니다. ({e})")
 
-def fetch_data_from_web(url_template, start_date_str, end_date_str):
-    """(디버깅용) 웹사이트에서 실제로 어떤 내용을 보내주는지 파일로 저장하여 확인합니다."""
-    all_dfs = []
-    start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
-    end_date = datetime.strptime(end_date_str, "%Y-%m-%d")
-    date_range = [start_date + timedelta(days=x) for x in range((end_date - start_date).days + 1)]
-
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-
-    print("\n데이터 수집을 시작합니다...")
-    for i, current_date in enumerate(date_range):
-        date_str = current_date.strftime("%Y-%m-%d")
-        url = url_template.format(date_str)
-
-        print(f"   - [{i+1}/{len(date_range)}] {date_str} 데이터 확인 중...", end='\r')
-
+class FetchScheduler:
+    """여러 스레드가 공유하는 요청 스케줄러.
+
+    - 속도 제한: 요청 사이 간격을 1/rate초 이상으로 유지 (rate가 0이면 제한 없음)
+    - 동시 요청 수: 최근 window개 요청의 오류율이 target_error_rate를 넘으면 절반으로 줄이고,
+      오류 없이 window개를 마칠 때마다 1씩 늘립니다. (AIMD, 최대 max_concurrency)
+    - 재시도 대기: 지수 백오프에 무작위 지터를 더해 여러 스레드가 동시에 다시 몰리지 않게 합니다.
+    """
+
+    def __init__(self, rate_per_sec=0, max_concurrency=DEFAULT_MAX_WORKERS, target_error_rate=TARGET_ERROR_RATE,
+                 window=20, max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE, backoff_cap=BACKOFF_CAP):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec else 0.0
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self.limit = self.max_concurrency
+        self.target_error_rate = target_error_rate
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._cond = threading.Condition()
+        self._active = 0
+        self._next_time = 0.0
+        self._outcomes = deque(maxlen=window)
+        self.stats = Counter()
+
+    def acquire(self):
+        """동시 요청 자리가 날 때까지 기다린 뒤 속도 제한 간격을 지킵니다. 요청 후 반드시 release를 호출하세요."""
+        with self._cond:
+            while self._active >= self.limit:
+                self._cond.wait()
+            self._active += 1
+            self.stats['요청'] += 1
+            now = time.monotonic()
+            wait_until = max(self._next_time, now)
+            self._next_time = wait_until + self.interval
+        if wait_until > now:
+            time.sleep(wait_until - now)
+
+    def release(self, ok):
+        """요청 결과를 기록하고 동시 요청 수를 조절합니다. ok=False는 서버 과부하/일시 오류."""
+        with self._cond:
+            self._active -= 1
+            self._outcomes.append(ok)
+            errors = self._outcomes.count(False)
+            if not ok:
+                self.stats['오류'] += 1
+                if len(self._outcomes) >= 5 and errors / len(self._outcomes) > self.target_error_rate:
+                    self.limit = max(self.limit // 2, 1)
+                    self._outcomes.clear()  # 같은 오류로 연달아 줄이지 않도록 새로 집계
+            elif len(self._outcomes) == self._outcomes.maxlen and self.limit < self.max_concurrency:
+                if errors / len(self._outcomes) <= self.target_error_rate:
+                    self.limit += 1
+                    self._outcomes.clear()
+            self._cond.notify_all()
+
+    def count(self, key):
+        with self._cond:
+            self.stats[key] += 1
+
+    def backoff(self, attempt, retry_after=None):
+        """attempt번째 재시도 전 대기 시간(초). 서버가 Retry-After를 주면 그 값을 따릅니다."""
+        if retry_after is not None:
+            return min(retry_after, self.backoff_cap)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def summary(self):
+        s = self.stats
+        return (f"요청 {s['요청']}회, 재시도 {s['재시도']}회, 변경 없음(304) {s['변경 없음']}회, "
+                f"최종 실패 {s['실패']}일, 동시 요청 한도 {self.limit}/{self.max_concurrency}")
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+def create_session(max_workers=DEFAULT_MAX_WORKERS):
+    """keep-alive 연결을 재사용하는 공용 세션을 만듭니다. (연결 풀 크기 = 동시 요청 수)"""
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def fetch_day(session, url_template, date_str, save_debug=False, scheduler=None, validators=None):
+    """하루치 PDF 페이지를 받아 보유종목 테이블을 반환합니다.
+
+    페이지는 받았지만 보유종목 테이블이 없으면 빈 DataFrame, 재시도 후에도 네트워크/서버 오류면 None을 반환합니다.
+    scheduler(FetchScheduler)가 속도 제한/동시 요청 수/재시도 대기를 정합니다.
+    validators=(ETag, Last-Modified)를 주면 조건부 요청을 보내고, 바뀌지 않았으면(304) NOT_MODIFIED를 반환합니다.
+    받은 테이블의 attrs에 응답의 ETag/Last-Modified를 담아 저장소가 보관하게 합니다.
+    """
+    url = url_template.format(date_str)
+    scheduler = scheduler or FetchScheduler()
+    headers = {}
+    if validators:
+        etag, last_modified = validators
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+    error, retry_after = None, None
+    for attempt in range(scheduler.max_retries + 1):
+        if attempt:
+            scheduler.count('재시도')
+            time.sleep(scheduler.backoff(attempt - 1, retry_after))
+        scheduler.acquire()
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = session.get(url, headers=headers, timeout=10)
+        except requests.exceptions.RequestException as e:
+            scheduler.release(False)
+            error, retry_after = e, None
+            continue
+        retryable = response.status_code in RETRY_STATUS
+        scheduler.release(not retryable)
+        if retryable:
+            error, retry_after = f"HTTP {response.status_code}", _retry_after(response)
+            continue
 
-            if i == 0 and response.status_code != 200:
-                with open("debug_page.html", "w", encoding="utf-8") as f:
-                    f.write(response.text)
-                print(f"\n\n[알림] 디버깅을 위해 첫 날짜({date_str})의 접속 결과가 'debug_page.html' 파일로 저장되었습니다.")
-                print("스크립트 실행 후 이 파일을 열어 내용을 꼭 확인해주세요.\n")
+        if response.status_code == 304:
+            scheduler.count('변경 없음')
+            return NOT_MODIFIED
 
-            if response.status_code != 200:
-                continue
+        if save_debug and response.status_code != 200:
+            with open("debug_page.html", "w", encoding="utf-8") as f:
+                f.write(response.text)
+            print(f"\n\n[알림] 디버깅을 위해 첫 날짜({date_str})의 접속 결과가 'debug_page.html' 파일로 저장되었습니다.")
+            print("스크립트 실행 후 이 파일을 열어 내용을 꼭 확인해주세요.\n")
 
-            tables = pd.read_html(response.text, header=0, encoding='utf-8')
-            if tables:
-                df = tables[0]
-                if '종목명' not in df.columns:
-                    continue
-                df['날짜'] = pd.to_datetime(date_str)
-                all_dfs.append(df)
+        if response.status_code != 200:
+            return None
 
-        except requests.exceptions.RequestException as e:
-            print(f"\n   - {date_str} 에서 네트워크 오류 발생: {e}")
-            continue
+        try:
+            df = parse_holdings_table(response.text)
         except Exception:
-            continue
-
-    print("\n✅ 데이터 수집 완료!")
+            return None
+        if df is None:  # 페이지에 보유종목 테이블이 없음
+            return pd.DataFrame()
+        df['날짜'] = pd.to_datetime(date_str)
+        df.attrs.update(etag=response.headers.get('ETag'), last_modified=response.headers.get('Last-Modified'))
+        return df
+
+    scheduler.count('실패')
+    print(f"\n   - {date_str} 요청 실패 ({scheduler.max_retries + 1}회 시도): {error}")
+    return None
+
+def iter_holdings(url_template, start_date_str, end_date_str, max_workers=DEFAULT_MAX_WORKERS,
+                  use_calendar=True, use_store=True, session=None, scheduler=None, verbose=True,
+                  revalidate=False, progress=None, cancel=None):
+    """기간 내 하루치 보유종목을 준비되는 대로 (날짜 문자열, DataFrame)으로 내보내는 제너레이터.
+
+    use_calendar=True이면 주말/KRX 휴장일과 'PDF 없음'으로 기록된 날을 요청하지 않고,
+    기간이 길면 첫 PDF 날짜를 이분 탐색으로 찾아 그 이전은 건너뜁니다.
+    use_store=True이면 로컬 저장소에 있는 날을 먼저(날짜 순으로) 내보내고, 비어 있는 날과 오늘 페이지만 받아
+    도착 순으로 내보냅니다. (전체적으로는 날짜 순서가 보장되지 않음)
+    저장소에 있지만 확정되지 않은 날(장중에 받은 페이지)과 revalidate=True일 때의 모든 저장된 날은
+    ETag/Last-Modified 조건부 요청으로 확인해, 바뀌지 않았으면(304) 저장본을 그대로 씁니다.
+    오류가 나면 scheduler(FetchScheduler)에 따라 재시도하고 동시 요청 수를 줄입니다.
+
+    동시에 진행 중인 요청은 max_workers의 두 배까지만 두고, 받은 페이지는 STREAM_SAVE_EVERY일마다
+    저장소에 나눠 저장한 뒤 놓아주므로 메모리 사용량은 기간 길이와 관계없이 일정합니다.
+
+    progress(counts, total)를 주면 하루를 처리할 때마다 호출합니다. counts는 결과별 날짜 수
+    ('저장소'/'수집'/'변경 없음'/'PDF 없음'/'실패'), total은 처리할 전체 날짜 수입니다.
+    cancel(threading.Event)이 설정되면 새 요청을 보내지 않고 진행 중인 요청만 마친 뒤 멈춥니다. (받은 날은 저장)
+    """
+    log = print if verbose else (lambda *args, **kwargs: None)
+    start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
+    end_date = datetime.strptime(end_date_str, "%Y-%m-%d")
+    if use_calendar:
+        date_range = trading_days(start_date, end_date)
+    else:
+        date_range = [start_date + timedelta(days=x) for x in range((end_date - start_date).days + 1)]
+    date_strs = [d.strftime("%Y-%m-%d") for d in date_range]
+
+    idx = etf_idx(url_template)
+    negative_cache = NegativeCache() if use_calendar else None
+    store = HoldingsStore() if use_store else None
+    cached = store.cached_dates(idx, date_strs) if store is not None and not revalidate else set()
+    validators = store.validators(idx, [d for d in date_strs if d not in cached]) if store is not None else {}
+    own_scheduler = scheduler is None
+    if own_scheduler:
+        scheduler = FetchScheduler(max_concurrency=max_workers)
+    fetched = {}
+    pending = {}
+    not_modified = []
+    counts = Counter()
+    total = 0
+
+    def report(kind):
+        counts[kind] += 1
+        if progress is not None:
+            progress(counts, total)
+
+    def cancelled():
+        return cancel is not None and cancel.is_set()
+
+    def flush():
+        if store is not None and pending:
+            store.save_days(idx, pending)
+        pending.clear()
+
+    def emit(date_str, result):
+        """받은 결과 하나를 정리(저장/캐시 기록)하고, 보유종목이 있으면 내보냅니다."""
+        if result is NOT_MODIFIED:
+            not_modified.append(date_str)
+            report('변경 없음')
+            yield date_str, store.load(idx, [date_str])
+        elif result is None:
+            report('실패')
+        elif result.empty:
+            if negative_cache is not None:
+                negative_cache.add(idx, date_str)
+            report('PDF 없음')
+        else:
+            if negative_cache is not None:
+                negative_cache.discard(idx, date_str)
+            pending[date_str] = result
+            if len(pending) >= STREAM_SAVE_EVERY:
+                flush()
+            report('수집')
+            yield date_str, select_holding_columns(result)
 
+    try:
+        with (nullcontext(session) if session is not None else create_session(max_workers)) as session:
+            if negative_cache is not None:
+                known_first = negative_cache.first_pdf_date(idx)
+                date_strs = [d for d in date_strs
+                             if not negative_cache.contains(idx, d) and (known_first is None or d >= known_first)]
+
+                if len(date_strs) >= BISECT_MIN_DAYS and known_first is None:
+                    def has_pdf(date_str):
+                        if date_str in cached or date_str in validators:
+                            return True
+                        if date_str not in fetched:
+                            fetched[date_str] = fetch_day(session, url_template, date_str, scheduler=scheduler)
+                        if fetched[date_str] is None:
+                            # 요청 실패는 'PDF 없음'이 아닙니다. 잘못된 상장일을 영구 기록하지 않도록 탐색을 멈춥니다.
+                            raise ConnectionError(f"{date_str} 요청 실패")
+                        return not fetched[date_str].empty
+
+                    try:
+                        # 휴장일 목록이 없는 해가 있으면 긴 연휴를 PDF 없음으로 오판하지 않도록 넓게 확인합니다.
+                        window = UNCOVERED_PROBE_WINDOW if uncovered_years(start_date, end_date) else PROBE_WINDOW
+                        first_date = find_first_pdf_date(has_pdf, date_strs, window)
+                    except ConnectionError as e:
+                        log(f"\n⚠️ 첫 PDF 날짜를 찾지 못했습니다 ({e}). 전체 기간을 요청합니다.")
+                    else:
+                        skipped = date_strs.index(first_date) if first_date else len(date_strs)
+                        if first_date and skipped:
+                            # 앞쪽에 PDF 없는 날을 확인했으므로 첫 PDF 날짜(상장일)로 기록합니다.
+                            negative_cache.set_first_pdf_date(idx, first_date)
+                        if skipped:
+                            log(f"\nℹ️ 첫 PDF 날짜: {first_date or '없음'} (이전 {skipped}일은 요청하지 않습니다)")
+                        date_strs = date_strs[skipped:]
+
+            stored = sorted(cached & set(date_strs))
+            todo = [d for d in date_strs if d not in fetched and d not in cached]
+            prefetched = [d for d in date_strs if d in fetched]
+            total = len(stored) + len(prefetched) + len(todo)
+            log(f"\n데이터 수집을 시작합니다... (저장소 {len(stored)}일, "
+                  f"요청 {len(todo)}일 중 조건부 {sum(d in validators for d in todo)}일, 동시 요청 {max_workers}개)")
+            if progress is not None:
+                progress(counts, total)
+
+            # 1) 저장소에 있는 날 (STREAM_SAVE_EVERY일씩 나눠 읽음)
+            for i in range(0, len(stored), STREAM_SAVE_EVERY):
+                if cancelled():
+                    return
+                chunk = store.load(idx, stored[i:i + STREAM_SAVE_EVERY])
+                for day, day_df in chunk.groupby('날짜', sort=True):
+                    report('저장소')
+                    yield day.strftime("%Y-%m-%d"), day_df.reset_index(drop=True)
+
+            # 2) 이분 탐색 중에 이미 받은 날
+            for date_str in prefetched:
+                yield from emit(date_str, fetched.pop(date_str))
+            fetched.clear()
+
+            # 3) 나머지 날: 진행 중인 요청을 일정 개수로 유지하며 끝나는 대로 내보냄
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            try:
+                remaining = iter(enumerate(todo))
+                in_flight = {}
+
+                def submit_next():
+                    item = next(remaining, None) if not cancelled() else None
+                    if item is not None:
+                        i, date_str = item
+                        future = executor.submit(fetch_day, session, url_template, date_str, i == 0, scheduler,
+                                                 validators.get(date_str))
+                        in_flight[future] = date_str
+
+                for _ in range(max_workers * 2):
+                    submit_next()
+                done = 0
+                while in_flight:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        date_str = in_flight.pop(future)
+                        submit_next()
+                        done += 1
+                        log(f"   - [{done}/{len(todo)}] {date_str} 데이터 확인 완료...", end='\r')
+                        yield from emit(date_str, future.result())
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+    finally:
+        if store is not None:
+            with store:
+                flush()
+                store.touch_days(idx, not_modified)
+        if negative_cache is not None:
+            negative_cache.save()
+        log("\n⏹ 데이터 수집을 취소했습니다." if cancelled() else "\n✅ 데이터 수집 완료!")
+        if own_scheduler:
+            log(f"   ({scheduler.summary()})")
+
+def fetch_data_from_web(url_template, start_date_str, end_date_str, max_workers=DEFAULT_MAX_WORKERS,
+                        use_calendar=True, use_store=True, session=None, scheduler=None, verbose=True,
+                        revalidate=False):
+    """기간 내 날짜별 PDF를 최대 max_workers개씩 동시에 받아 하나의 DataFrame으로 합칩니다.
+
+    모든 요청은 하나의 세션(연결 풀)을 공유하며, 결과는 완료 순서와 관계없이 날짜 순으로 합쳐집니다.
+    수집 방식(달력/저장소/조건부 요청/재시도)은 iter_holdings와 같습니다.
+    여러 ETF를 함께 받을 때는 session/scheduler를 넘겨 연결 풀과 요청 제어를 공유합니다. (fetch_batch 참고)
+    """
+    all_dfs = [df for _, df in iter_holdings(url_template, start_date_str, end_date_str, max_workers, use_calendar,
+                                             use_store, session, scheduler, verbose, revalidate)]
+    all_dfs = [df for df in all_dfs if not df.empty]
     if not all_dfs:
         return pd.DataFrame()
     master_df = pd.concat(all_dfs, ignore_index=True)
-    master_df['평가금액(원)'] = pd.to_numeric(master_df['평가금액(원)'].astype(str).str.replace(',', ''), errors='coerce')
-    master_df['비중(%)'] = pd.to_numeric(master_df['비중(%)'], errors='coerce')
+    master_df = master_df.sort_values('날짜', kind='stable', ignore_index=True)
+    # 파서가 이미 숫자로 만든 열이므로 문자열 정리 없이 타입만 맞춥니다. (날짜마다 다른 category는 concat 후 object가 됨)
     master_df.dropna(subset=['종목명', '평가금액(원)', '비중(%)'], inplace=True)
+    master_df['종목명'] = master_df['종목명'].astype('category')
+    master_df['평가금액(원)'] = master_df['평가금액(원)'].astype('int64')
+    master_df['비중(%)'] = master_df['비중(%)'].astype('float32')
     return master_df
 
-# --- 이하 그래프 및 테이블 함수는 변경 사항 없음 ---
+def resolve_etf_keys(keys):
+    """'all' 또는 ETF_LIST 키 목록('1,2,a' 등)을 ETF_LIST 순서의 키 목록으로 바꿉니다."""
+    if isinstance(keys, str):
+        keys = [k.strip() for k in keys.split(',') if k.strip()]
+    if 'all' in keys:
+        return list(ETF_LIST)
+    unknown = [k for k in keys if k not in ETF_LIST]
+    if unknown:
+        raise ValueError(f"ETF_LIST에 없는 키입니다: {', '.join(unknown)}")
+    return [k for k in ETF_LIST if k in set(keys)]
+
+def fetch_batch(keys, start_date_str, end_date_str, max_workers=DEFAULT_MAX_WORKERS,
+                rate_limit=DEFAULT_RATE_LIMIT, use_calendar=True, use_store=True, revalidate=False):
+    """여러 ETF를 동시에 받아 'ETF' 열이 붙은 하나의 long-format DataFrame으로 합칩니다.
+
+    ETF마다 max_workers개씩 동시에 요청하되, 모든 ETF가 하나의 세션과 스케줄러(초당 rate_limit회 속도 제한,
+    오류율에 따른 동시 요청 수 조절, 재시도)를 공유합니다.
+    """
+    keys = resolve_etf_keys(keys)
+    scheduler = FetchScheduler(rate_limit, max_concurrency=max_workers * len(keys))
+    results = {}
+
+    rate_text = f"초당 최대 {rate_limit:g}회 요청" if rate_limit else "요청 속도 제한 없음"
+    print(f"\n{len(keys)}개 ETF 일괄 수집을 시작합니다... ({start_date_str} ~ {end_date_str}, {rate_text})")
+    with create_session(max_workers * len(keys)) as session, ThreadPoolExecutor(max_workers=len(keys)) as executor:
+        futures = {
+            executor.submit(fetch_data_from_web, ETF_LIST[key][1], start_date_str, end_date_str, max_workers,
+                            use_calendar, use_store, session, scheduler, False, revalidate): key
+            for key in keys
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            key = futures[future]
+            results[key] = future.result()
+            days = results[key]['날짜'].nunique() if not results[key].empty else 0
+            print(f"   - [{done}/{len(keys)}] {ETF_LIST[key][0]}: {days}일치 수집 완료")
+
+    frames = [results[key].assign(ETF=ETF_LIST[key][0]) for key in keys if not results[key].empty]
+    if not frames:
+        return pd.DataFrame()
+    combined = pd.concat(frames, ignore_index=True)
+    combined = combined[['ETF'] + [c for c in combined.columns if c != 'ETF']]
+    combined['ETF'] = pd.Categorical(combined['ETF'], categories=[ETF_LIST[k][0] for k in keys])
+    combined['종목명'] = combined['종목명'].astype('category')
+    print(f"✅ 일괄 수집 완료! ({scheduler.summary()})")
+    return combined
+
+def save_frame(df, path):
+    """확장자에 따라 CSV(엑셀에서 한글이 깨지지 않도록 utf-8-sig) 또는 XLSX로 저장합니다."""
+    if path.lower().endswith('.xlsx'):
+        df.to_excel(path, index=False)
+    else:
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+
+def run_batch(args):
+    """명령행 일괄 수집 실행: 선택한 ETF들을 받아 하나의 파일로 저장합니다."""
+    data = fetch_batch(args.batch, args.start, args.end, max_workers=args.workers, rate_limit=args.rate,
+                       revalidate=args.revalidate)
+    if data.empty:
+        print("\n❌ 수집된 데이터가 없습니다.")
+        return
+    output = args.output or f"timefolio_batch_{args.start}_{args.end}.csv"
+    save_frame(data, output)
+    print(f"💾 '{output}' 파일로 저장했습니다. ({len(data)}행, ETF {data['ETF'].nunique()}개)")
+
+def run_stream(args):
+    """명령행 스트리밍 모드: ETF 하나를 받는 동안 그래프를 실시간으로 갱신하고, 끝나면 파이 그래프와 변동 테이블을 띄웁니다.
+
+    원본 보유종목은 쌓아 두지 않고 집계(StreamingAggregates)만 유지합니다.
+    """
+    from timefolio_stream import StreamingAggregates, LiveCharts
+    keys = resolve_etf_keys(args.stream)
+    etf_name, url_template = ETF_LIST[keys[0]]
+    set_korean_font()
+    plt.ion()
+    aggregates = StreamingAggregates()
+    charts = LiveCharts(aggregates, args.top_n, etf_name)
+    plt.show(block=False)
+
+    print(f"\n📡 '{etf_name}' 스트리밍 수집을 시작합니다... ({args.start} ~ {args.end})")
+    scheduler = FetchScheduler(args.rate, max_concurrency=args.workers)
+    for _, day_df in iter_holdings(url_template, args.start, args.end, max_workers=args.workers,
+                                   scheduler=scheduler, revalidate=args.revalidate):
+        aggregates.update(day_df['날짜'].iloc[0], day_df)
+        charts.refresh()
+    charts.refresh(force=True)
+    print(f"   ({scheduler.summary()})")
+    plt.ioff()
+
+    if aggregates.days == 0:
+        print("\n❌ 분석할 데이터를 찾지 못했습니다.")
+        return
+    weights = aggregates.to_frame()
+    plot_pie_chart_for_last_day(weights)
+    plt.show(block=False)
+    display_table_in_new_window(weights)
+
+# 압축 보유종목 프레임에 남기는 열 (ETF 열은 일괄 수집 결과에만 있음)
+COMPACT_COLUMNS = ['ETF', '날짜', '종목명', '평가금액(원)', '비중(%)']
+
+def compact_holdings(df, report=True):
+    """그래프/테이블 분석에 필요한 열만 남긴 압축 보유종목 프레임을 만듭니다.
+
+    - 날짜: 정렬된 날짜 목록을 카테고리로 갖는 순서형 category (내부적으로는 날짜 번호 정수만 저장)
+    - 종목명, ETF: 사전 인코딩(category)
+    - 평가금액(원): int64, 비중(%): float32
+    report=True이면 변환 전후 메모리 사용량을 출력합니다.
+    """
+    if df.empty:
+        return df
+    compact = df[[c for c in COMPACT_COLUMNS if c in df.columns]].reset_index(drop=True)
+    if not isinstance(compact['날짜'].dtype, pd.CategoricalDtype):
+        dates = pd.DatetimeIndex(compact['날짜'].unique()).sort_values()
+        compact['날짜'] = pd.Categorical(compact['날짜'], categories=dates, ordered=True)
+    compact['종목명'] = compact['종목명'].astype('category')
+    if 'ETF' in compact.columns:
+        compact['ETF'] = compact['ETF'].astype('category')
+    compact['평가금액(원)'] = compact['평가금액(원)'].astype('int64')
+    compact['비중(%)'] = compact['비중(%)'].astype('float32')
+
+    if report:
+        before = df.memory_usage(deep=True).sum() / 1024 ** 2
+        after = compact.memory_usage(deep=True).sum() / 1024 ** 2
+        saved = (1 - after / before) * 100 if before else 0
+        print(f"🗜️ 보유종목 데이터 압축: {before:.2f}MB → {after:.2f}MB ({saved:.0f}% 절감, {len(compact):,}행)")
+    return compact
+
+# --- 이하 그래프 및 테이블 함수 (compact_holdings 결과와 원본 master_df 모두 사용 가능) ---
+def top_weight_matrix(df, names):
+    """names 종목들의 (날짜, 날짜 x 종목 비중 행렬). 보유하지 않은 날은 NaN이며 날짜는 기간 내 모든 날입니다."""
+    dates = to_datetime_index(pd.Index(df['날짜'].unique())).sort_values()
+    sub = df[df['종목명'].isin(names)]
+    rows = dates.get_indexer(to_datetime_index(pd.Index(sub['날짜'])))
+    cols = pd.Index(names).get_indexer(sub['종목명'].astype(str))
+    matrix = np.full((len(dates), len(names)), np.nan)
+    matrix[rows, cols] = sub['비중(%)'].to_numpy(dtype=np.float64)
+    return dates, matrix
+
 def plot_total_value(df):
-    daily_total = df.groupby('날짜')['평가금액(원)'].sum() / 1_000_000_000
+    from timefolio_plot import DecimatedChart
+    daily_total = df.groupby('날짜', observed=True)['평가금액(원)'].sum() / 1_000_000_000
+    daily_total.index = to_datetime_index(daily_total.index)
     plt.figure(figsize=(12, 6))
-    daily_total.plot(kind='line', marker='o', grid=True)
+    chart = DecimatedChart(plt.gca())
+    chart.set_series('총 평가금액', daily_total.index, daily_total.to_numpy(), marker='o')
+    chart.autoscale()
+    plt.grid(True)
     plt.title('총 평가금액 변화 추이', fontsize=16)
     plt.ylabel('평가금액 (십억원)', fontsize=12)
     plt.xlabel('날짜', fontsize=12)
     plt.tight_layout()
+    return chart
 
 def plot_top_n_weight_change(df, top_n):
+    from timefolio_plot import DecimatedChart
     last_day = df['날짜'].max()
-    top_n_stocks = df[df['날짜'] == last_day].nlargest(top_n, '비중(%)')['종목명'].tolist()
-    pivot_df = df[df['종목명'].isin(top_n_stocks)].pivot_table(index='날짜', columns='종목명', values='비중(%)')
+    top_n_stocks = df[df['날짜'] == last_day].nlargest(top_n, '비중(%)')['종목명'].astype(str).tolist()
+    dates, weights = top_weight_matrix(df, top_n_stocks)
     colors = plt.get_cmap('tab20').colors
     linestyles = ['-', '--', ':', '-.']
     plt.figure(figsize=(12, 7))
-    ax = plt.gca()
-    for i, column in enumerate(pivot_df.columns):
+    chart = DecimatedChart(plt.gca())
+    for i, name in enumerate(top_n_stocks):
         color = colors[i % len(colors)]
         linestyle = linestyles[(i // len(colors)) % len(linestyles)]
-        pivot_df[column].plot(kind='line', marker='.', ax=ax, grid=True, color=color, linestyle=linestyle, label=column)
+        chart.set_series(name, dates, weights[:, i], marker='.', color=color, linestyle=linestyle, label=name)
+    chart.autoscale()
+    plt.grid(True)
     plt.title(f'보유 비중 상위 {top_n}개 종목 비중 변화', fontsize=16)
     plt.ylabel('비중 (%)', fontsize=12)
     plt.xlabel('날짜', fontsize=12)
-    plt.legend(title='종목명', bbox_to_anchor=(1.02, 1), loc='upper left')
+    chart.legend(top_n_stocks, title='종목명')
     plt.tight_layout()
+    return chart
 
 def plot_pie_chart_for_last_day(df):
     last_day = df['날짜'].max()
@@ -114,7 +654,7 @@ def plot_pie_chart_for_last_day(df):
     top10 = last_day_data.nlargest(10, '비중(%)')
     others_weight = 100 - top10['비중(%)'].sum()
     pie_data = pd.concat([
-        top10[['종목명', '비중(%)']].set_index('종목명'),
+        top10[['종목명', '비중(%)']].astype({'종목명': str}).set_index('종목명'),
         pd.DataFrame({'비중(%)': [others_weight]}, index=['기타'])
     ])
     plt.figure(figsize=(10, 10))
@@ -123,91 +663,206 @@ def plot_pie_chart_for_last_day(df):
     plt.ylabel('')
     plt.tight_layout()
 
-def display_table_in_new_window(df):
+PERCENT_FORMATS = {'시작일 비중': '{:.2f}%', '종료일 비중': '{:.2f}%', '이전 비중': '{:.2f}%',
+                   '비중': '{:.2f}%', '비중 변화': '{:+.2f}%', '날짜': '{:%Y-%m-%d}'}
+
+def display_table_in_new_window(df, threshold=REBALANCE_THRESHOLD, parent=None):
+    """종목 변동 내역 창을 띄웁니다. parent(이미 실행 중인 Tk 창)를 주면 그 하위 창으로 띄우고 바로 돌아옵니다."""
+    from timefolio_table import VirtualTreeview
     if df['날짜'].nunique() < 2:
         print("\n⚠️ 기간 내 데이터가 하루치밖에 없어 종목 변동을 분석할 수 없습니다.")
         return
-    start_date = df['날짜'].min()
-    end_date = df['날짜'].max()
-    start_df = df[df['날짜'] == start_date].set_index('종목명')
-    end_df = df[df['날짜'] == end_date].set_index('종목명')
-    all_stocks = set(start_df.index) | set(end_df.index)
-    table_data = []
-    for stock in all_stocks:
-        start_weight = start_df.loc[stock, '비중(%)'] if stock in start_df.index else 0
-        end_weight = end_df.loc[stock, '비중(%)'] if stock in end_df.index else 0
-        change = end_weight - start_weight
-        if start_weight == 0:
-            first_appearance_date = df[df['종목명'] == stock]['날짜'].min().strftime('%Y-%m-%d')
-            status = f'신규 편입 ({first_appearance_date})'
-        elif end_weight == 0:
-            status = '편출'
-        else:
-            status = '비중 변경'
-        table_data.append([stock, f"{start_weight:.2f}%", f"{end_weight:.2f}%", f"{change:+.2f}%", status])
-    if not table_data:
+    events, summary = compute_rebalance_events(df, threshold)
+    if summary.empty:
         print("\nℹ️ 기간 내 종목 변동이 없습니다.")
         return
-    root = tk.Tk()
+    start_date = df['날짜'].min()
+    end_date = df['날짜'].max()
+
+    # 표시용 문자열 대신 타입이 있는 값을 그대로 넘기고, 형식은 화면에 보이는 행만 적용합니다.
+    name_cols = ['ETF', '종목명'] if 'ETF' in summary.columns else ['종목명']
+    summary_table = summary[name_cols + ['시작일 비중', '종료일 비중', '비중 변화']].assign(상태=status_labels(summary))
+    event_table = events[['날짜'] + name_cols + ['구분', '이전 비중', '비중', '비중 변화']]
+
+    root = tk.Tk() if parent is None else tk.Toplevel(parent)
     root.title(f"종목 변동 내역 ({start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')})")
-    frame = ttk.Frame(root, padding="10")
-    frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
     root.grid_rowconfigure(0, weight=1)
     root.grid_columnconfigure(0, weight=1)
-    columns = ['종목명', '시작일 비중', '종료일 비중', '비중 변화', '상태']
-    tree = ttk.Treeview(frame, columns=columns, show='headings')
-    for col in columns:
-        tree.heading(col, text=col, command=lambda _col=col: treeview_sort_column(tree, _col, False))
-        tree.column(col, width=150, anchor='center')
-    for row in table_data:
-        tree.insert('', 'end', values=row)
-    scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
-    tree.configure(yscroll=scrollbar.set)
-    tree.grid(row=0, column=0, sticky='nsew')
-    scrollbar.grid(row=0, column=1, sticky='ns')
-    frame.grid_rowconfigure(0, weight=1)
-    frame.grid_columnconfigure(0, weight=1)
+    notebook = ttk.Notebook(root)
+    notebook.grid(row=0, column=0, sticky='nsew')
+    notebook.add(VirtualTreeview(notebook, summary_table, PERCENT_FORMATS), text=f"종목별 변동 ({len(summary)})")
+    notebook.add(VirtualTreeview(notebook, event_table, PERCENT_FORMATS),
+                 text=f"일별 이벤트 ({len(events)}, 비중 변화 ≥ {threshold:g}%p)")
     print("\n📜 종목 변동 내역 테이블을 별도 창에 표시합니다.")
-    root.mainloop()
+    if parent is None:
+        root.mainloop()
 
-def treeview_sort_column(tree, col, reverse):
-    try:
-        data_list = [(float(tree.set(k, col).replace('%','')), k) for k in tree.get_children('')]
-    except (ValueError, AttributeError):
-        data_list = [(tree.set(k, col), k) for k in tree.get_children('')]
-    data_list.sort(reverse=reverse)
-    for index, (val, k) in enumerate(data_list):
-        tree.move(k, '', index)
-    tree.heading(col, command=lambda: treeview_sort_column(tree, col, not reverse))
+# --- 헤드리스 리포트 (cron/서버용: 창 없이 그래프와 테이블을 파일로 저장) ---
+def render_report(etf_name, df, top_n, out_dir, image_format='png', table_format='csv', window=DEFAULT_WINDOW):
+    """ETF 하나의 그래프 3종, 종목 변동 테이블, 일별 분석 지표를 파일로 저장하고, 저장한 파일 경로 목록을 반환합니다.
+
+    프로세스 풀 작업자에서 실행되므로 여기서 GUI 없는 Agg 백엔드로 바꿉니다.
+    """
+    plt.switch_backend('Agg')
+    set_korean_font()
+    df = compact_holdings(df, report=False)
+    start, end = df['날짜'].min(), df['날짜'].max()
+    prefix = os.path.join(out_dir, f"{etf_name}_{start:%Y%m%d}_{end:%Y%m%d}")
+    saved = []
+
+    for suffix, draw in (('total_value', plot_total_value),
+                         ('top_weights', lambda d: plot_top_n_weight_change(d, top_n)),
+                         ('pie_last_day', plot_pie_chart_for_last_day)):
+        draw(df)
+        path = f"{prefix}_{suffix}.{image_format}"
+        plt.gcf().savefig(path, format=image_format, dpi=120)
+        plt.close('all')
+        saved.append(path)
+
+    if df['날짜'].nunique() >= 2:
+        events, summary = compute_rebalance_events(df)
+        table = change_table(summary)
+        events = events.assign(날짜=events['날짜'].dt.strftime('%Y-%m-%d'))
+        if table_format == 'xlsx':
+            path = f"{prefix}_changes.xlsx"
+            with pd.ExcelWriter(path) as writer:
+                table.to_excel(writer, sheet_name='종목별_변동', index=False)
+                events.to_excel(writer, sheet_name='일별_이벤트', index=False)
+            saved.append(path)
+        else:
+            for suffix, frame in (('changes', table), ('events', events)):
+                path = f"{prefix}_{suffix}.csv"
+                frame.to_csv(path, index=False, encoding='utf-8-sig')
+                saved.append(path)
+
+    metrics = PortfolioAnalytics(df, etf_name, window).metrics().reset_index()
+    path = f"{prefix}_analytics.{table_format}"
+    save_frame(metrics.assign(날짜=metrics['날짜'].dt.strftime('%Y-%m-%d')), path)
+    saved.append(path)
+    return saved
+
+def run_report(args):
+    """명령행 리포트 실행: ETF들을 받아 ETF별 그래프/테이블을 프로세스 풀에서 나눠 렌더링합니다."""
+    plt.switch_backend('Agg')
+    data = fetch_batch(args.report, args.start, args.end, max_workers=args.workers, rate_limit=args.rate,
+                       revalidate=args.revalidate)
+    if data.empty:
+        print("\n❌ 분석할 데이터를 찾지 못했습니다.")
+        return
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    groups = [(str(name), group.drop(columns='ETF'))
+              for name, group in data.groupby('ETF', observed=True, sort=False)]
+    print(f"\n🖼️ {len(groups)}개 ETF 리포트를 렌더링합니다... (프로세스 {args.processes or os.cpu_count()}개)")
+    with ProcessPoolExecutor(max_workers=args.processes) as executor:
+        futures = {
+            executor.submit(render_report, name, group, args.top_n, args.out_dir,
+                            args.image_format, args.table_format, args.window): name
+            for name, group in groups
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            name = futures[future]
+            try:
+                saved = future.result()
+                print(f"   - [{done}/{len(groups)}] {name}: 파일 {len(saved)}개 저장")
+            except Exception as e:
+                print(f"   - [{done}/{len(groups)}] {name}: 렌더링 실패 ({e})")
+    print(f"✅ 리포트 저장 완료: {os.path.abspath(args.out_dir)}")
+
+def run_analytics(args):
+    """명령행 분석 실행: ETF들을 받아 회전율/집중도/드리프트 요약을 출력하고, --output이 있으면 일별 지표를 저장합니다."""
+    data = fetch_batch(args.analytics, args.start, args.end, max_workers=args.workers, rate_limit=args.rate,
+                       revalidate=args.revalidate)
+    if data.empty:
+        print("\n❌ 분석할 데이터를 찾지 못했습니다.")
+        return
+    analytics = PortfolioAnalytics(data, window=args.window)
+    summary = analytics.summary()
+    summary[['시작일', '종료일']] = summary[['시작일', '종료일']].apply(lambda col: col.dt.strftime('%Y-%m-%d'))
+    print(f"\n📈 포트폴리오 지표 요약 (드리프트/평균 회전율 기간 {args.window}거래일)")
+    print(summary.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+    if args.output:
+        metrics = analytics.all_metrics()
+        save_frame(metrics.assign(날짜=metrics['날짜'].dt.strftime('%Y-%m-%d')), args.output)
+        print(f"💾 일별 지표를 '{args.output}' 파일로 저장했습니다. ({len(metrics)}행)")
+
+# --- ETF 간 보유종목 조회 (역색인) ---
+def load_holdings_index():
+    """저장된 역색인을 불러오고, 로컬 저장소에 새로 쌓이거나 다시 받은 날짜만 추가로 반영합니다."""
+    index = HoldingsIndex.load()
+    with HoldingsStore() as store:
+        added = index.sync_from_store(store, {etf_idx(url): name for name, url in ETF_LIST.values()})
+    if added:
+        index.save()
+        print(f"🔎 보유종목 색인에 {added}일치를 새로 반영했습니다.")
+    return index
+
+def run_who_holds(args):
+    """명령행 조회: 기간 내 종목을 보유한 ETF와 보유 구간/비중을 출력합니다."""
+    index = load_holdings_index()
+    names = [args.who_holds] if args.who_holds in index else index.search(args.who_holds)
+    if not names:
+        print(f"\n❌ '{args.who_holds}'을(를) 보유한 기록이 없습니다. (먼저 --batch 등으로 데이터를 수집하세요)")
+        return
+    for name in names:
+        result = index.funds_holding(name, args.start, args.end)
+        if result.empty:
+            continue
+        print(f"\n📌 {name} ({args.start} ~ {args.end}) — {len(result)}개 ETF 보유")
+        print(result.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+def run_overlap(args):
+    """명령행 조회: 두 ETF가 --end 기준으로 함께 보유한 종목과 비중을 출력합니다."""
+    keys = resolve_etf_keys(args.overlap)
+    if len(keys) != 2:
+        print("\n❌ --overlap에는 ETF_LIST 키 두 개를 쉼표로 구분해 입력하세요. (예: 1,3)")
+        return
+    index = load_holdings_index()
+    fund_a, fund_b = (ETF_LIST[k][0] for k in keys)
+    result = index.overlap(fund_a, fund_b, args.end)
+    print(f"\n📌 {fund_a} ∩ {fund_b} ({args.end} 기준) — 공통 {len(result)}종목, "
+          f"겹치는 비중 합 {result['겹치는 비중'].sum():.2f}%")
+    if not result.empty:
+        print(result.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+def run_as_of(args):
+    """명령행 조회: 저장소에 쌓인 이력에서 --end 기준(그날 이전 가장 최근 PDF) 보유종목을 출력합니다."""
+    keys = resolve_etf_keys(args.as_of)
+    funds = {ETF_LIST[k][0]: etf_idx(ETF_LIST[k][1]) for k in keys}
+    with HoldingsStore() as store:
+        result = HoldingsHistory(store, funds).snapshots(funds, args.end)
+    if result.empty:
+        print(f"\n❌ {args.end} 이전에 저장된 보유종목이 없습니다. (먼저 --batch 등으로 데이터를 수집하세요)")
+        return
+    for name, group in result.groupby('ETF', sort=False):
+        print(f"\n📌 {name} ({args.end} 기준, PDF {group['날짜'].iloc[0]:%Y-%m-%d}) — {len(group)}종목")
+        print(group.drop(columns=['ETF', '날짜']).to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+    if args.output:
+        save_frame(result.assign(날짜=result['날짜'].dt.strftime('%Y-%m-%d')), args.output)
+        print(f"💾 보유종목을 '{args.output}' 파일로 저장했습니다. ({len(result)}행)")
+
+def run_diff(args):
+    """명령행 조회: 저장소에 쌓인 이력에서 --start 기준과 --end 기준 보유종목을 비교해 종목 변동을 출력합니다."""
+    keys = resolve_etf_keys(args.diff)
+    funds = {ETF_LIST[k][0]: etf_idx(ETF_LIST[k][1]) for k in keys}
+    with HoldingsStore() as store:
+        result = HoldingsHistory(store, funds).diff(funds, args.start, args.end)
+    if result.empty:
+        print(f"\n❌ {args.end} 이전에 저장된 보유종목이 없습니다. (먼저 --batch 등으로 데이터를 수집하세요)")
+        return
+    for name, group in result.groupby('ETF', sort=False):
+        changed = group[group['비중 변화'] != 0]
+        print(f"\n📌 {name} ({group['시작 기준일'].iloc[0]} → {group['종료 기준일'].iloc[0]}) — 변동 {len(changed)}종목")
+        if not changed.empty:
+            print(changed[['종목명', '시작일 비중', '종료일 비중', '비중 변화', '상태']]
+                  .to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+    if args.output:
+        save_frame(result, args.output)
+        print(f"💾 종목 변동 테이블을 '{args.output}' 파일로 저장했습니다. ({len(result)}행)")
 
 # ✨✨✨ [수정된 부분] ETF 목록에 '글로벌탑픽액티브' 추가 ✨✨✨
 def main():
     """메인 실행 함수"""
-    set_korean_font()
-
-    # ETF 목록 정의
-    ETF_LIST = {
-        # 글로벌 시리즈
-        '1': ("미국나스닥100액티브", "https://timefolioetf.co.kr/m11_view.php?idx=2&cate=&pdfDate={}"),
-        '2': ("차이나AI테크액티브", "https://timefolioetf.co.kr/m11_view.php?idx=19&cate=&pdfDate={}"),
-        '3': ("글로벌AI인공지능액티브", "https://timefolioetf.co.kr/m11_view.php?idx=6&cate=&pdfDate={}"),
-        '4': ("미국S&P500액티브", "https://timefolioetf.co.kr/m11_view.php?idx=5&cate=&pdfDate={}"),
-        '5': ("미국배당다우존스액티브", "https://timefolioetf.co.kr/m11_view.php?idx=18&cate=&pdfDate={}"),
-        '6': ("글로벌우주테크&방산액티브", "https://timefolioetf.co.kr/m11_view.php?idx=20&cate=&pdfDate={}"),
-        '7': ("미국나스닥100채권혼합50액티브", "https://timefolioetf.co.kr/m11_view.php?idx=10&cate=&pdfDate={}"),
-        '8': ("글로벌소비트렌드액티브", "https://timefolioetf.co.kr/m11_view.php?idx=8&cate=&pdfDate={}"),
-        '9': ("글로벌안티에이징바이오액티브", "https://timefolioetf.co.kr/m11_view.php?idx=9&cate=&pdfDate={}"),
-        '10': ("글로벌탑픽액티브", "https://timefolioetf.co.kr/m11_view.php?idx=22&cate=&pdfDate={}"),
-        # K 시리즈
-        'a': ("K바이오액티브", "https://timefolioetf.co.kr/m11_view.php?idx=13&cate=&pdfDate={}"),
-        'b': ("Korea플러스배당액티브", "https://timefolioetf.co.kr/m11_view.php?idx=12&cate=&pdfDate={}"),
-        'c': ("코스피액티브", "https://timefolioetf.co.kr/m11_view.php?idx=11&cate=&pdfDate={}"),
-        'd': ("코리아밸류업액티브", "https://timefolioetf.co.kr/m11_view.php?idx=15&cate=&pdfDate={}"),
-        'e': ("K이노베이션액티브", "https://timefolioetf.co.kr/m11_view.php?idx=17&cate=&pdfDate={}"),
-        'f': ("K컬처액티브", "https://timefolioetf.co.kr/m11_view.php?idx=1&cate=&pdfDate={}"),
-        'g': ("K신재생에너지액티브", "https://timefolioetf.co.kr/m11_view.php?idx=16&cate=&pdfDate={}")
-    }
-
     print("-" * 50)
     print("Timefolio ETF 포트폴리오 분석기")
     print("-" * 50)
@@ -250,8 +905,10 @@ def main():
     if data.empty:
         print("\n❌ 분석할 데이터를 찾지 못했습니다. 기간 내에 PDF 자료가 없는 날이 많을 수 있습니다.")
         return
+    data = compact_holdings(data)
 
     print("\n📊 분석 그래프를 생성합니다...")
+    set_korean_font()
     plot_total_value(data)
     plot_top_n_weight_change(data, top_n)
     plot_pie_chart_for_last_day(data)
@@ -263,5 +920,61 @@ def main():
 
     print("\n모든 분석 창이 닫혔습니다. 프로그램을 종료합니다.")
 
+def parse_args(argv=None):
+    today = datetime.now()
+    parser = argparse.ArgumentParser(description="Timefolio ETF 포트폴리오 분석기 (인자 없이 실행하면 대화형 모드)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--batch', metavar='KEYS',
+                      help="일괄 수집할 ETF_LIST 키 (쉼표로 구분, 예: 1,2,a) 또는 all")
+    mode.add_argument('--report', metavar='KEYS',
+                      help="창 없이 그래프/테이블을 파일로 저장할 ETF_LIST 키 (쉼표로 구분) 또는 all")
+    mode.add_argument('--analytics', metavar='KEYS',
+                      help="ETF별 회전율/집중도(HHI, 상위 10)/비중 드리프트 요약 (쉼표로 구분) 또는 all")
+    mode.add_argument('--stream', metavar='KEY',
+                      help="ETF_LIST 키 하나를 받으면서 그래프를 실시간으로 갱신 (긴 기간용)")
+    mode.add_argument('--who-holds', metavar='NAME',
+                      help="기간 내 종목을 보유한 ETF와 비중 조회 (종목명 일부만 입력해도 됨)")
+    mode.add_argument('--overlap', metavar='KEY1,KEY2', help="두 ETF의 --end 기준 공통 보유종목 조회")
+    mode.add_argument('--as-of', metavar='KEYS', help="저장된 이력에서 ETF들의 --end 기준 보유종목 조회 (예: 1,3)")
+    mode.add_argument('--diff', metavar='KEYS', help="저장된 이력에서 ETF들의 --start 기준 대비 --end 기준 종목 변동 조회")
+    mode.add_argument('--gui', action='store_true',
+                      help="ETF/기간 선택, 진행률, 취소를 창에서 처리하는 GUI 모드 (수집 중에도 결과가 바로 표시됨)")
+    parser.add_argument('--start', default=(today - timedelta(days=30)).strftime('%Y-%m-%d'), help="시작일 (YYYY-MM-DD)")
+    parser.add_argument('--end', default=today.strftime('%Y-%m-%d'), help="종료일 (YYYY-MM-DD)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS, help="ETF당 동시 요청 수")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE_LIMIT, help="전체 초당 최대 요청 수 (0이면 제한 없음)")
+    parser.add_argument('--revalidate', action='store_true',
+                        help="저장소에 있는 날도 조건부 요청(ETag/If-Modified-Since)으로 바뀌었는지 다시 확인")
+    parser.add_argument('--output', help="[--batch/--analytics/--as-of/--diff] 저장할 파일 경로 (.csv 또는 .xlsx)")
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW,
+                        help="[--analytics/--report] 드리프트/평균 회전율 기간 (거래일)")
+    parser.add_argument('--top-n', type=int, default=5, help="[--report/--stream] 비중 변화 그래프에 그릴 상위 종목 수")
+    parser.add_argument('--out-dir', default='timefolio_reports', help="[--report] 리포트를 저장할 폴더")
+    parser.add_argument('--image-format', choices=['png', 'svg'], default='png', help="[--report] 그래프 파일 형식")
+    parser.add_argument('--table-format', choices=['csv', 'xlsx'], default='csv', help="[--report] 변동 테이블 파일 형식")
+    parser.add_argument('--processes', type=int, default=None, help="[--report] 렌더링 프로세스 수 (기본값: CPU 수)")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    cli_args = parse_args()
+    if cli_args.batch:
+        run_batch(cli_args)
+    elif cli_args.report:
+        run_report(cli_args)
+    elif cli_args.analytics:
+        run_analytics(cli_args)
+    elif cli_args.stream:
+        run_stream(cli_args)
+    elif cli_args.who_holds:
+        run_who_holds(cli_args)
+    elif cli_args.overlap:
+        run_overlap(cli_args)
+    elif cli_args.as_of:
+        run_as_of(cli_args)
+    elif cli_args.diff:
+        run_diff(cli_args)
+    elif cli_args.gui:
+        from timefolio_gui import main as run_gui
+        run_gui()
+    else:
+        main()
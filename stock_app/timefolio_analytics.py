@@ -0,0 +1,166 @@
+"""Timefolio 포트폴리오 분석 지표 (회전율, 집중도, 비중 드리프트)
+
+fetch_data_from_web / fetch_batch 결과(보유종목 long-format 프레임)를 ETF별 날짜 x 종목 비중 행렬로 바꾼 뒤
+모든 지표를 행렬 연산으로 한 번에 계산합니다. (날짜별 반복 없음)
+
+  - 회전율(%): 전날 대비 종목별 비중 변화 절댓값 합의 절반 (편도 회전율)
+  - HHI: 비중(소수) 제곱합 x 10,000 (0~10,000, 클수록 집중)
+  - 유효 종목 수: 1 / 비중(소수) 제곱합
+  - 상위 10 비중(%): 비중 상위 10개 종목의 합
+  - 드리프트(%): window 거래일 전 대비 종목별 비중 변화 절댓값 합의 절반
+  - 평균 회전율(%): 최근 window 거래일 회전율 평균
+PortfolioAnalytics는 (ETF, 시작일, 종료일, window) 단위로 결과를 캐시합니다.
+"""
+from timefolio_lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# 드리프트/평균 회전율을 계산하는 기본 기간 (거래일)
+DEFAULT_WINDOW = 20
+
+# 집중도 지표에 사용하는 상위 종목 수
+TOP_K = 10
+
+METRIC_COLUMNS = ['종목 수', '회전율(%)', 'HHI', '유효 종목 수', f'상위 {TOP_K} 비중(%)', '드리프트(%)', '평균 회전율(%)']
+
+
+def _factorize_dates(dates):
+    """날짜 열을 (행 번호 배열, 정렬된 DatetimeIndex)로 바꿉니다. 압축 프레임의 날짜 category도 지원합니다."""
+    if isinstance(dates.dtype, pd.CategoricalDtype):
+        codes = dates.cat.codes.to_numpy().astype(np.int64)  # int8/int16 코드는 행렬 위치 계산에서 넘침
+        categories = dates.cat.categories
+        observed = np.unique(codes)
+        if len(observed) != len(categories):  # 다른 ETF에만 있는 날짜는 제외
+            codes = np.searchsorted(observed, codes).astype(np.int64)
+            categories = categories[observed]
+        index = pd.DatetimeIndex(categories)
+        if not index.is_monotonic_increasing:  # 순서 없는 category면 날짜 순으로 다시 매김
+            order = np.argsort(index.to_numpy(), kind='stable')
+            codes = np.argsort(order)[codes]
+            index = index[order]
+        return codes, index
+    codes, uniques = pd.factorize(dates, sort=True)
+    return codes, pd.DatetimeIndex(uniques)
+
+
+def fund_weight_matrix(df):
+    """ETF 하나의 보유종목으로 (날짜 DatetimeIndex, 종목명 Index, 날짜 x 종목 비중 행렬)을 만듭니다.
+
+    보유하지 않은 날의 비중은 0입니다. 같은 날 같은 종목이 여러 행이면 비중을 더합니다.
+    """
+    date_codes, dates = _factorize_dates(df['날짜'])
+    name_codes, names = pd.factorize(df['종목명'].astype(str))
+    n_dates, n_names = len(dates), len(names)
+    flat = np.bincount(date_codes * n_names + name_codes,
+                       weights=df['비중(%)'].to_numpy(dtype=np.float64), minlength=n_dates * n_names)
+    return dates, pd.Index(names), flat.reshape(n_dates, n_names)
+
+
+def compute_metrics(dates, weights, window=DEFAULT_WINDOW):
+    """날짜 x 종목 비중 행렬로 날짜별 지표 DataFrame(인덱스: 날짜)을 계산합니다."""
+    n_dates, n_names = weights.shape
+    turnover = np.full(n_dates, np.nan)
+    if n_dates > 1:
+        turnover[1:] = 0.5 * np.abs(np.diff(weights, axis=0)).sum(axis=1)
+    drift = np.full(n_dates, np.nan)
+    if n_dates > window:
+        drift[window:] = 0.5 * np.abs(weights[window:] - weights[:-window]).sum(axis=1)
+
+    squares = np.square(weights / 100).sum(axis=1)
+    k = min(TOP_K, n_names)
+    top_k = np.partition(weights, n_names - k, axis=1)[:, n_names - k:].sum(axis=1) if k else np.zeros(n_dates)
+    with np.errstate(divide='ignore'):
+        effective_n = np.where(squares > 0, 1 / squares, np.nan)
+
+    metrics = pd.DataFrame({
+        '종목 수': (weights > 0).sum(axis=1),
+        '회전율(%)': turnover,
+        'HHI': squares * 10_000,
+        '유효 종목 수': effective_n,
+        f'상위 {TOP_K} 비중(%)': top_k,
+        '드리프트(%)': drift,
+    }, index=pd.DatetimeIndex(dates, name='날짜'))
+    metrics['평균 회전율(%)'] = metrics['회전율(%)'].rolling(window, min_periods=window).mean()
+    return metrics
+
+
+class PortfolioAnalytics:
+    """보유종목 프레임 하나에 대한 분석 엔진.
+
+    ETF 열이 있으면 ETF별로, 없으면 fund_name(기본값 '')이라는 ETF 하나로 봅니다.
+    ETF별 비중 행렬은 한 번만 만들고, 같은 (ETF, 시작일, 종료일, window) 요청은 캐시된 결과를 돌려줍니다.
+    기간을 지정해도 드리프트/평균 회전율은 시작일 이전 이력을 포함해 계산합니다.
+    """
+
+    def __init__(self, df, fund_name='', window=DEFAULT_WINDOW):
+        self.window = window
+        if 'ETF' in df.columns:
+            self._frames = {str(name): group for name, group in df.groupby('ETF', observed=True, sort=False)}
+        else:
+            self._frames = {fund_name: df}
+        self._matrices = {}
+        self._cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def funds(self):
+        return list(self._frames)
+
+    def _matrix(self, fund):
+        if fund not in self._matrices:
+            self._matrices[fund] = fund_weight_matrix(self._frames[fund])
+        return self._matrices[fund]
+
+    def metrics(self, fund=None, start=None, end=None, window=None):
+        """ETF 하나의 날짜별 지표 (인덱스: 날짜, 열: METRIC_COLUMNS). fund를 생략하면 첫 번째 ETF."""
+        fund = self.funds()[0] if fund is None else fund
+        window = window or self.window
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        key = (fund, start, end, window)
+        if key in self._cache:
+            self.hits += 1
+            return self._cache[key]
+        self.misses += 1
+
+        dates, _, weights = self._matrix(fund)
+        stop = len(dates) if end is None else dates.searchsorted(end, side='right')
+        result = compute_metrics(dates[:stop], weights[:stop], window)
+        if start is not None:
+            result = result[result.index >= start]
+        self._cache[key] = result
+        return result
+
+    def all_metrics(self, start=None, end=None, window=None):
+        """모든 ETF의 날짜별 지표를 ETF 열이 붙은 long-format 프레임으로 합칩니다."""
+        frames = [self.metrics(fund, start, end, window).reset_index().assign(ETF=fund) for fund in self.funds()]
+        combined = pd.concat(frames, ignore_index=True)
+        return combined[['ETF', '날짜'] + METRIC_COLUMNS]
+
+    def summary(self, start=None, end=None, window=None):
+        """ETF별 기간 요약: 평균/누적 회전율, 마지막 날 집중도, 평균/최대 드리프트."""
+        window = window or self.window
+        rows = []
+        for fund in self.funds():
+            m = self.metrics(fund, start, end, window)
+            if m.empty:
+                continue
+            last = m.iloc[-1]
+            rows.append({
+                'ETF': fund,
+                '시작일': m.index[0],
+                '종료일': m.index[-1],
+                '거래일 수': len(m),
+                '평균 회전율(%)': m['회전율(%)'].mean(),
+                '누적 회전율(%)': m['회전율(%)'].sum(),
+                '종목 수': int(last['종목 수']),
+                'HHI': last['HHI'],
+                f'상위 {TOP_K} 비중(%)': last[f'상위 {TOP_K} 비중(%)'],
+                f'평균 드리프트 {window}일(%)': m['드리프트(%)'].mean(),
+                f'최대 드리프트 {window}일(%)': m['드리프트(%)'].max(),
+            })
+        return pd.DataFrame(rows)
+
+    def cache_info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache)}
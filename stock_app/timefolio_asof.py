@@ -0,0 +1,114 @@
+"""Timefolio 기준일 보유종목 조회 (as-of 스냅샷과 두 날짜 비교)
+
+"3월 15일 기준 보유종목은?", "연초 대비 지금 무엇이 바뀌었나?" 같은 질문에 답할 때
+기간 전체를 다시 받거나 읽지 않고 로컬 저장소(HoldingsStore)에 쌓인 날짜만 사용합니다.
+  - ETF별로 저장된 PDF 날짜를 정렬해 두고, 기준일은 그날 이전 가장 최근 PDF로 이분 탐색(O(log n))합니다.
+    (휴장일/PDF가 없는 날을 물어도 직전 거래일 기준으로 답함)
+  - 하루치 보유종목은 처음 읽을 때만 SQLite에서 불러오고 최근 사용한 SNAPSHOT_CACHE_SIZE일치를 메모리에 둡니다.
+  - 두 날짜 비교는 종목 변동 창과 같은 compute_rebalance_events 계산을 씁니다. (상태: 신규 편입/편출/비중 변경)
+"""
+from bisect import bisect_right
+from collections import OrderedDict
+
+from timefolio_changes import REBALANCE_THRESHOLD, compute_rebalance_events, change_table
+from timefolio_lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+# 메모리에 남겨 둘 하루치 보유종목 수 (ETF x 날짜)
+SNAPSHOT_CACHE_SIZE = 256
+
+
+def _day_str(day):
+    """'YYYY-MM-DD' 문자열, datetime, Timestamp를 저장소 날짜 문자열로 바꿉니다."""
+    if isinstance(day, str):
+        return day[:10]
+    return day.strftime('%Y-%m-%d')
+
+
+class HoldingsHistory:
+    """저장소에 쌓인 보유종목 이력에 대한 기준일 조회.
+
+    funds: {ETF 이름: ETF idx}. 날짜 목록은 처음 조회할 때 ETF별로 한 번 읽고, 이후 수집한 날짜는 refresh()로 반영합니다.
+    """
+
+    def __init__(self, store, funds, cache_size=SNAPSHOT_CACHE_SIZE):
+        self.store = store
+        self.funds = dict(funds)
+        self.cache_size = cache_size
+        self._dates = {}
+        self._snapshots = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def refresh(self):
+        """저장소가 바뀌었을 때 날짜 목록을 다시 읽도록 비웁니다. (캐시된 하루치는 그대로 재사용)"""
+        self._dates.clear()
+
+    def dates(self, fund):
+        """fund의 저장된 PDF 날짜 목록 ('YYYY-MM-DD', 오름차순)."""
+        if fund not in self._dates:
+            self._dates[fund] = [d for _, d in self.store.stored_days(self.funds[fund])]
+        return self._dates[fund]
+
+    def resolve(self, fund, day):
+        """day 이전(당일 포함) 가장 최근 PDF 날짜. 그 전에 저장된 날이 없으면 None."""
+        dates = self.dates(fund)
+        pos = bisect_right(dates, _day_str(day))
+        return dates[pos - 1] if pos else None
+
+    def _load(self, fund, date_str):
+        key = (fund, date_str)
+        if key in self._snapshots:
+            self.hits += 1
+            self._snapshots.move_to_end(key)
+            return self._snapshots[key]
+        self.misses += 1
+        df = self.store.load(self.funds[fund], [date_str])
+        self._snapshots[key] = df
+        if len(self._snapshots) > self.cache_size:
+            self._snapshots.popitem(last=False)
+        return df
+
+    def snapshot(self, fund, day):
+        """day 기준 fund의 보유종목 (날짜 열 = 실제 PDF 날짜). 저장된 날이 없으면 빈 DataFrame."""
+        date_str = self.resolve(fund, day)
+        if date_str is None:
+            return pd.DataFrame()
+        return self._load(fund, date_str).copy()
+
+    def snapshots(self, funds, day):
+        """여러 ETF의 day 기준 보유종목을 ETF 열이 붙은 long-format 프레임으로 합칩니다."""
+        frames = [self.snapshot(fund, day).assign(ETF=fund) for fund in funds]
+        frames = [df for df in frames if len(df)]
+        if not frames:
+            return pd.DataFrame()
+        combined = pd.concat(frames, ignore_index=True)
+        return combined[['ETF'] + [c for c in combined.columns if c != 'ETF']]
+
+    def diff(self, funds, start, end, threshold=REBALANCE_THRESHOLD):
+        """start 기준과 end 기준 보유종목을 ETF별로 비교한 종목 변동 테이블.
+
+        열: ETF, 종목명, 시작일 비중, 종료일 비중, 비중 변화, 상태, 첫 편입일, 마지막 보유일, 시작 기준일, 종료 기준일
+        (change_table과 같은 형식에 ETF별 실제 PDF 날짜를 덧붙임, 비중 변화 절댓값 순)
+        두 기준일이 같은 PDF로 정해지면 모든 종목이 비중 변화 0으로 나옵니다.
+        """
+        if isinstance(funds, str):
+            funds = [funds]
+        tables = []
+        for fund in funds:
+            end_str = self.resolve(fund, end)
+            if end_str is None:
+                continue
+            # 시작 기준일 이전 기록이 없으면(상장 전/수집 전) 저장된 첫 PDF부터 비교합니다.
+            start_str = min(self.resolve(fund, start) or self.dates(fund)[0], end_str)
+            df = pd.concat([self._load(fund, d) for d in dict.fromkeys([start_str, end_str])], ignore_index=True)
+            _, summary = compute_rebalance_events(df.assign(ETF=fund), threshold)
+            tables.append(change_table(summary).assign(**{'시작 기준일': start_str, '종료 기준일': end_str}))
+        if not tables:
+            return pd.DataFrame()
+        combined = pd.concat(tables, ignore_index=True)
+        return combined.sort_values('비중 변화', key=abs, ascending=False, ignore_index=True)
+
+    def cache_info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._snapshots)}
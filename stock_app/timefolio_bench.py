@@ -0,0 +1,754 @@
+"""timefolio.fetch_data_from_web / 보유종목 파서 벤치마크
+
+실제 timefolioetf.co.kr 대신 로컬 HTTP 서버가 m11_view.php 페이지를 지연시간을 넣어 돌려줍니다.
+--pages 폴더에 저장해 둔 페이지(파일명: YYYY-MM-DD.html)가 있으면 그대로 서빙하고,
+없으면 실제 PDF 테이블과 같은 형식의 페이지를 만들어 사용합니다. (주말은 테이블 없는 페이지)
+서버는 ETag/Last-Modified를 붙여 조건부 요청에 304로 답하며, 5xx 오류와 느린 응답, PDF 없는 날을 섞을 수 있습니다.
+suite는 수집 방식(FETCH_MODES)마다 새 프로세스에서 실행해 days/s, 요청 지연 p50/p95, 파싱 시간, 최대 RSS를 비교하고,
+--output으로 저장한 이전 결과(--baseline)와의 차이를 보여 줍니다. record는 실제 페이지를 --pages 폴더용으로 저장합니다.
+
+사용 예:
+    python timefolio_bench.py record --key 1 --start 2024-01-02 --end 2024-06-28 --out saved_pages/
+    python timefolio_bench.py suite --pages saved_pages/ --latency 0.05 --error-rate 0.05 --missing-rate 0.1
+    python timefolio_bench.py suite --modes concurrent stream --output after.csv --baseline before.csv
+    python timefolio_bench.py startup --repeat 5 --profile 8
+    python timefolio_bench.py fetch --days 60 --latency 0.2 --workers 1 8 16
+    python timefolio_bench.py parse --pages saved_pages/
+    python timefolio_bench.py resilience --days 60 --error-rate 0.2 --slow-rate 0.05
+    python timefolio_bench.py render --years 5 --stocks 200 --top-n 50
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import resource  # Windows에는 없음 (최대 RSS를 표시하지 않음)
+except ImportError:
+    resource = None
+
+# 벤치마크가 실제 캐시(.timefolio_cache)를 오염시키지 않도록 임시 폴더를 사용합니다.
+os.environ.setdefault("TIMEFOLIO_CACHE_DIR", tempfile.mkdtemp(prefix="timefolio_bench_"))
+
+import timefolio
+from timefolio_calendar import trading_days
+from timefolio_parser import parse_holdings_table
+
+EMPTY_PAGE = "<html><body><p>해당 일자의 PDF 자료가 없습니다.</p></body></html>"
+
+
+def make_synthetic_page(date_str, n_stocks=40, seed=0):
+    """실제 PDF 페이지와 같은 열 구성을 가진 가짜 보유종목 페이지를 만듭니다."""
+    day = datetime.strptime(date_str, "%Y-%m-%d")
+    if day.weekday() >= 5:
+        return EMPTY_PAGE
+    rng = random.Random(f"{seed}-{date_str}")
+    weights = [rng.random() for _ in range(n_stocks)]
+    total = sum(weights)
+    rows = []
+    for i, w in enumerate(weights):
+        weight = w / total * 100
+        value = int(weight * 1_000_000_000)
+        rows.append(
+            f"<tr><td>종목{i:03d}</td><td>{100000 + i}</td><td>{rng.randint(1, 50000):,}</td>"
+            f"<td>{weight:.2f}</td><td>{value:,}</td></tr>"
+        )
+    return (
+        "<html><body><table><thead><tr><th>종목명</th><th>종목코드</th><th>수량</th>"
+        "<th>비중(%)</th><th>평가금액(원)</th></tr></thead><tbody>"
+        + "".join(rows)
+        + "</tbody></table><table><tr><th>공지</th></tr><tr><td>-</td></tr></table></body></html>"
+    )
+
+
+class PageStore:
+    """날짜별 페이지를 돌려줍니다. 저장된 페이지가 우선이며 없으면 가짜 페이지를 만듭니다."""
+
+    def __init__(self, pages_dir=None):
+        self.pages_dir = pages_dir
+        self._cache = {}
+
+    def get(self, date_str):
+        if date_str not in self._cache:
+            path = os.path.join(self.pages_dir, f"{date_str}.html") if self.pages_dir else None
+            if path and os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    self._cache[date_str] = f.read()
+            else:
+                self._cache[date_str] = make_synthetic_page(date_str)
+        return self._cache[date_str]
+
+
+LAST_MODIFIED = "Fri, 28 Jun 2024 09:00:00 GMT"
+
+
+def is_missing_day(date_str, missing_rate, seed=0):
+    """missing_rate 비율의 날짜를 'PDF 없음'으로 정합니다. (같은 날짜는 요청 순서와 관계없이 항상 같은 결과)"""
+    return missing_rate > 0 and random.Random(f"missing-{seed}-{date_str}").random() < missing_rate
+
+
+def start_server(store, latency=0.0, error_rate=0.0, slow_rate=0.0, slow_latency=2.0, seed=0, missing_rate=0.0):
+    """로컬 스탠드인 서버를 백그라운드 스레드로 띄우고 (server, url_template)을 반환합니다.
+
+    error_rate 비율의 요청에는 503, slow_rate 비율의 요청에는 slow_latency초 지연을 넣습니다.
+    missing_rate 비율의 날짜는 테이블 없는 페이지로 답합니다. (임시 휴장일/PDF 누락)
+    응답 상태 코드별 횟수는 server.status_counts에 기록됩니다.
+    """
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+    status_counts = Counter()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive 연결 재사용을 위해 필요
+        disable_nagle_algorithm = True  # 헤더와 본문을 따로 보낼 때 생기는 Nagle/지연 ACK 대기(~40ms) 방지
+
+        def _reply(self, status, body=b"", headers=()):
+            status_counts[status] += 1
+            self.send_response(status)
+            for name, value in headers:
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            if parsed.path != "/m11_view.php":
+                self.send_error(404)
+                return
+            date_str = parse_qs(parsed.query).get("pdfDate", [""])[0]
+            with rng_lock:
+                fail, slow = rng.random() < error_rate, rng.random() < slow_rate
+            if latency:
+                time.sleep(latency)
+            if slow:
+                time.sleep(slow_latency)
+            if fail:
+                self._reply(503, "Service Unavailable".encode("utf-8"))
+                return
+            page = EMPTY_PAGE if is_missing_day(date_str, missing_rate, seed) else store.get(date_str)
+            body = page.encode("utf-8")
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'
+            validators = (("ETag", etag), ("Last-Modified", LAST_MODIFIED))
+            if self.headers.get("If-None-Match") == etag:
+                self._reply(304, headers=validators)
+                return
+            self._reply(200, body, (("Content-Type", "text/html; charset=utf-8"),) + validators)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.status_counts = status_counts
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}/m11_view.php?idx=2&cate=&pdfDate={{}}"
+
+
+def run_fetch(url_template, start, end, workers, use_store=False, scheduler=None, revalidate=False):
+    """fetch_data_from_web을 한 번 실행하고 (결과, 소요 시간)을 반환합니다. 진행 출력은 숨깁니다.
+
+    기본값은 로컬 저장소를 쓰지 않아 매번 모든 날짜를 실제로 요청합니다.
+    """
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = timefolio.fetch_data_from_web(url_template, start, end, max_workers=workers, use_store=use_store,
+                                           scheduler=scheduler, revalidate=revalidate)
+    return df, time.perf_counter() - t0
+
+
+def read_html_baseline(html):
+    """기존 방식: pd.read_html로 모든 테이블을 만든 뒤 첫 테이블을 쓰고 문자열을 숫자로 정리합니다."""
+    try:
+        tables = pd.read_html(io.StringIO(html), header=0, encoding="utf-8")
+    except ValueError:
+        return None
+    if not tables or "종목명" not in tables[0].columns:
+        return None
+    df = tables[0]
+    df["평가금액(원)"] = pd.to_numeric(df["평가금액(원)"].astype(str).str.replace(",", ""), errors="coerce")
+    df["비중(%)"] = pd.to_numeric(df["비중(%)"], errors="coerce")
+    return df.dropna(subset=["종목명", "평가금액(원)", "비중(%)"])
+
+
+def load_pages(pages_dir, count):
+    """저장된 페이지를 읽습니다. 폴더가 없으면 가짜 페이지 count개(주말 제외)를 만듭니다."""
+    if pages_dir:
+        names = sorted(n for n in os.listdir(pages_dir) if n.endswith(".html"))
+        pages = []
+        for name in names:
+            with open(os.path.join(pages_dir, name), encoding="utf-8") as f:
+                pages.append(f.read())
+        return pages
+    pages, day = [], datetime(2024, 1, 1)
+    while len(pages) < count:
+        if day.weekday() < 5:
+            pages.append(make_synthetic_page(day.strftime("%Y-%m-%d")))
+        day += timedelta(days=1)
+    return pages
+
+
+def bench_fetch(args):
+    end = datetime.strptime(args.end, "%Y-%m-%d")
+    start = (end - timedelta(days=args.days - 1)).strftime("%Y-%m-%d")
+    end = end.strftime("%Y-%m-%d")
+
+    server, url_template = start_server(PageStore(args.pages), args.latency)
+    print(f"스탠드인 서버: {url_template}")
+    print(f"기간: {start} ~ {end} ({args.days}일), 요청당 지연 {args.latency:.3f}s\n")
+
+    baseline = None
+    try:
+        for workers in args.workers:
+            df, elapsed = run_fetch(url_template, start, end, workers)
+            same = "-"
+            if baseline is None:
+                baseline = df
+            else:
+                same = "일치" if df.equals(baseline) else "불일치!"
+            print(f"  workers={workers:>3}  {elapsed:7.2f}s  {args.days / elapsed:7.1f} days/s  "
+                  f"rows={len(df):>6}  기준 결과와 {same}")
+    finally:
+        server.shutdown()
+
+
+def bench_parse(args):
+    pages = load_pages(args.pages, args.count)
+    print(f"페이지 {len(pages)}개, 각 {args.repeat}회 반복\n")
+
+    results = {}
+    for label, func in (("read_html", read_html_baseline), ("parse_holdings_table", parse_holdings_table)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            out = [func(page) for page in pages]
+            best = min(best, time.perf_counter() - t0)
+        results[label] = out
+        print(f"  {label:<22} {best / len(pages) * 1000:8.3f} ms/page")
+
+    mismatches = 0
+    for old, new in zip(results["read_html"], results["parse_holdings_table"]):
+        if (old is None) != (new is None):
+            mismatches += 1
+        elif old is not None and not (
+            old["종목명"].astype(str).tolist() == new["종목명"].astype(str).tolist()
+            and (old["평가금액(원)"].to_numpy() == new["평가금액(원)"].to_numpy()).all()
+            and np.allclose(old["비중(%)"].to_numpy(), new["비중(%)"].to_numpy(), atol=1e-4)
+        ):
+            mismatches += 1
+    print(f"\n  결과 비교: {'일치' if not mismatches else f'{mismatches}개 페이지 불일치!'}")
+
+
+def bench_resilience(args):
+    end = datetime.strptime(args.end, "%Y-%m-%d")
+    start = (end - timedelta(days=args.days - 1)).strftime("%Y-%m-%d")
+    end = end.strftime("%Y-%m-%d")
+    pages = PageStore(args.pages)
+
+    server, url_template = start_server(pages, args.latency)
+    try:
+        baseline, _ = run_fetch(url_template, start, end, args.workers)
+    finally:
+        server.shutdown()
+    expected = baseline["날짜"].nunique()
+    print(f"기간: {start} ~ {end}, 기준 {expected}일 / 오류율 {args.error_rate:.0%}, "
+          f"느린 응답 {args.slow_rate:.0%} (+{args.slow_latency:g}s), 동시 요청 최대 {args.workers}개\n")
+
+    runs = (
+        ("재시도 없음", dict(scheduler=timefolio.FetchScheduler(max_concurrency=args.workers, max_retries=0))),
+        ("재시도+AIMD", dict(scheduler=timefolio.FetchScheduler(max_concurrency=args.workers), use_store=True)),
+        ("재확인(304)", dict(scheduler=timefolio.FetchScheduler(max_concurrency=args.workers), use_store=True,
+                           revalidate=True)),
+    )
+    for label, options in runs:
+        server, url_template = start_server(pages, args.latency, args.error_rate, args.slow_rate, args.slow_latency)
+        try:
+            df, elapsed = run_fetch(url_template, start, end, args.workers, **options)
+        finally:
+            server.shutdown()
+        days = df["날짜"].nunique() if not df.empty else 0
+        same = df.equals(baseline) if days == expected else False
+        statuses = ", ".join(f"{code}: {n}" for code, n in sorted(server.status_counts.items()))
+        print(f"  {label:<10} {elapsed:6.2f}s  수집 {days:>3}/{expected}일 (누락 {expected - days}일, "
+              f"기준 결과와 {'일치' if same else '불일치'})  서버 응답 [{statuses}]")
+        print(f"  {'':<10} {options['scheduler'].summary()}")
+
+
+# --- 수집 파이프라인 벤치마크 모음 (suite) ---
+
+class TimedSession(requests.Session):
+    """요청마다 걸린 시간(초)을 latencies에 기록하는 세션. (timefolio.create_session과 같은 설정)"""
+
+    def __init__(self, max_workers):
+        super().__init__()
+        self.headers.update(timefolio.HEADERS)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+        self.latencies = []
+
+    def request(self, *args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return super().request(*args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - t0)  # list.append는 스레드 간에 안전
+
+
+@contextlib.contextmanager
+def timed_parser(parse_times):
+    """timefolio가 쓰는 parse_holdings_table을 페이지당 파싱 시간을 기록하는 함수로 잠시 바꿉니다."""
+    original = timefolio.parse_holdings_table
+
+    def parse(html):
+        t0 = time.perf_counter()
+        try:
+            return original(html)
+        finally:
+            parse_times.append(time.perf_counter() - t0)
+
+    timefolio.parse_holdings_table = parse
+    try:
+        yield
+    finally:
+        timefolio.parse_holdings_table = original
+
+
+def peak_rss_mb():
+    """이 프로세스의 지금까지 최대 RSS (MB). resource 모듈이 없으면 None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024  # macOS는 바이트, Linux는 KB
+
+
+class FrameDigest:
+    """수집 결과 비교용 요약 (날짜 수, 행 수, 평가금액 합). 하루치씩 더해 가므로 스트리밍에도 사용합니다."""
+
+    def __init__(self):
+        self.days = set()
+        self.rows = 0
+        self.value = 0
+
+    def add(self, df):
+        if not df.empty:
+            self.days.update(df["날짜"].unique())
+            self.rows += len(df)
+            self.value += int(df["평가금액(원)"].sum())
+
+    def key(self):
+        return len(self.days), self.rows, self.value
+
+
+def _fetch_all(url_template, start, end, workers, session, **options):
+    digest = FrameDigest()
+    digest.add(timefolio.fetch_data_from_web(url_template, start, end, max_workers=workers, session=session,
+                                             **options))
+    return digest
+
+
+def _stream_all(url_template, start, end, workers, session, **options):
+    digest = FrameDigest()
+    for _, day_df in timefolio.iter_holdings(url_template, start, end, max_workers=workers, session=session,
+                                             **options):
+        digest.add(day_df)
+    return digest
+
+
+# 이름 -> (설명, 준비 실행 옵션 또는 None, 측정 실행 함수, 측정 실행 옵션)
+# 준비 실행은 같은 프로세스에서 측정 전에 한 번 돌려 저장소를 채웁니다. 새 수집 방식은 여기에 추가합니다.
+FETCH_MODES = {
+    "sequential": ("순차 (동시 1개)", None, _fetch_all, dict(use_store=False, workers=1)),
+    "concurrent": ("동시 요청", None, _fetch_all, dict(use_store=False)),
+    "stream": ("스트리밍 (iter_holdings)", None, _stream_all, dict(use_store=False)),
+    "warm": ("저장소 재실행", dict(use_store=True), _fetch_all, dict(use_store=True)),
+    "revalidate": ("저장소 재확인 (304)", dict(use_store=True), _fetch_all, dict(use_store=True, revalidate=True)),
+}
+
+
+def run_suite_mode(mode, url_template, start, end, workers):
+    """수집 방식 하나를 이 프로세스에서 실행하고 측정값 dict를 반환합니다. (suite가 모드마다 새 프로세스에서 호출)"""
+    _, prepare, run, options = FETCH_MODES[mode]
+    options = dict(options)
+    workers = options.pop("workers", workers)
+    with contextlib.redirect_stdout(io.StringIO()):
+        if prepare is not None:
+            with TimedSession(workers) as session:
+                _fetch_all(url_template, start, end, workers, session, **prepare)
+
+        rss_before = peak_rss_mb()
+        parse_times = []
+        with TimedSession(workers) as session, timed_parser(parse_times):
+            scheduler = timefolio.FetchScheduler(max_concurrency=workers)
+            t0 = time.perf_counter()
+            digest = run(url_template, start, end, workers, session, scheduler=scheduler, **options)
+            elapsed = time.perf_counter() - t0
+            latencies = session.latencies
+    rss_after = peak_rss_mb()
+
+    ms = np.array(latencies) * 1000
+    return {
+        "mode": mode,
+        "workers": workers,
+        "elapsed": elapsed,
+        "requests": len(latencies),
+        "p50_ms": float(np.percentile(ms, 50)) if len(ms) else float("nan"),
+        "p95_ms": float(np.percentile(ms, 95)) if len(ms) else float("nan"),
+        "parse_ms": sum(parse_times) * 1000,
+        "parse_pages": len(parse_times),
+        "peak_rss_mb": rss_after if rss_after is not None else float("nan"),
+        "rss_growth_mb": rss_after - rss_before if rss_after is not None else float("nan"),
+        "digest": digest.key(),
+        "scheduler": scheduler.summary(),
+    }
+
+
+def bench_suite(args):
+    end = datetime.strptime(args.end, "%Y-%m-%d")
+    start = (end - timedelta(days=args.days - 1)).strftime("%Y-%m-%d")
+    end = end.strftime("%Y-%m-%d")
+    unknown = [m for m in args.modes if m not in FETCH_MODES]
+    if unknown:
+        raise SystemExit(f"알 수 없는 수집 방식: {', '.join(unknown)} (가능: {', '.join(FETCH_MODES)})")
+
+    pages = PageStore(args.pages)
+    print(f"기간: {start} ~ {end} ({args.days}일), 페이지 {'저장본 ' + args.pages if args.pages else '가짜 페이지'}")
+    print(f"요청당 지연 {args.latency:.3f}s, 오류율 {args.error_rate:.0%}, PDF 없는 날 {args.missing_rate:.0%}, "
+          f"동시 요청 {args.workers}개\n")
+
+    # 모드마다 새 프로세스(spawn)와 빈 캐시 폴더를 써서 최대 RSS와 저장소/캐시 상태가 서로 섞이지 않게 합니다.
+    context = multiprocessing.get_context("spawn")
+    results = []
+    baseline_digest = None
+    for mode in args.modes:
+        server, url_template = start_server(pages, args.latency, args.error_rate, args.slow_rate, args.slow_latency,
+                                            missing_rate=args.missing_rate)
+        os.environ["TIMEFOLIO_CACHE_DIR"] = tempfile.mkdtemp(prefix=f"timefolio_bench_{mode}_")
+        try:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(run_suite_mode, mode, url_template, start, end, args.workers).result()
+        finally:
+            server.shutdown()
+        if baseline_digest is None:
+            baseline_digest = result["digest"]
+        days, rows, _ = result["digest"]
+        result.update(label=FETCH_MODES[mode][0], days_per_sec=args.days / result["elapsed"], trading_days=days,
+                      rows=rows, same=result["digest"] == baseline_digest)
+        results.append(result)
+        parse_per_page = result["parse_ms"] / result["parse_pages"] if result["parse_pages"] else float("nan")
+        print(f"  {mode:<11} {result['elapsed']:7.2f}s  {result['days_per_sec']:7.1f} days/s  "
+              f"요청 {result['requests']:>4}회 p50 {_fmt(result['p50_ms'], 'ms')} p95 {_fmt(result['p95_ms'], 'ms')}  "
+              f"파싱 {_fmt(parse_per_page, 'ms/page', 2)}  최대 RSS {_fmt(result['peak_rss_mb'], 'MB')} "
+              f"(+{result['rss_growth_mb']:.1f})  {days}일/{rows}행 {'일치' if result['same'] else '불일치!'}")
+        print(f"  {'':<11} {result['label']}: {result['scheduler']}")
+
+    table = pd.DataFrame(results).drop(columns=["digest", "scheduler"])
+    if args.baseline:
+        compare_with_baseline(table, pd.read_csv(args.baseline))
+    if args.output:
+        table.to_csv(args.output, index=False, encoding="utf-8-sig")
+        print(f"\n💾 결과를 '{args.output}'에 저장했습니다. (다음 실행에서 --baseline으로 비교)")
+
+
+def _fmt(value, unit, digits=1):
+    return f"{value:{5 + digits}.{digits}f}{unit}" if pd.notna(value) else f"{'-':>{5 + digits}}{unit}"
+
+
+def compare_with_baseline(table, baseline):
+    """같은 수집 방식끼리 이전 결과와 비교해 변화율을 출력합니다. (days/s는 높을수록, 나머지는 낮을수록 좋음)"""
+    merged = table.merge(baseline, on="mode", suffixes=("", "_base"))
+    if merged.empty:
+        print("\n기준 결과에 같은 수집 방식이 없습니다.")
+        return
+    print("\n기준 결과 대비 변화:")
+    for _, row in merged.iterrows():
+        changes = []
+        for col, label in (("days_per_sec", "days/s"), ("p95_ms", "p95"), ("parse_ms", "파싱"),
+                           ("peak_rss_mb", "최대 RSS")):
+            base = row[f"{col}_base"]
+            if pd.notna(base) and base:
+                changes.append(f"{label} {(row[col] - base) / base:+.1%}")
+        print(f"  {row['mode']:<11} " + ", ".join(changes))
+
+
+def record_pages(args):
+    """실제 사이트에서 거래일별 m11_view.php 페이지를 받아 --pages 폴더 형식(YYYY-MM-DD.html)으로 저장합니다."""
+    etf_name, url_template = timefolio.ETF_LIST[args.key]
+    days = trading_days(datetime.strptime(args.start, "%Y-%m-%d"), datetime.strptime(args.end, "%Y-%m-%d"))
+    date_strs = [d.strftime("%Y-%m-%d") for d in days]
+    os.makedirs(args.out, exist_ok=True)
+    print(f"{etf_name}: {args.start} ~ {args.end} 거래일 {len(date_strs)}일을 '{args.out}'에 저장합니다.")
+
+    def record(date_str):
+        response = session.get(url_template.format(date_str), timeout=10)
+        response.raise_for_status()
+        with open(os.path.join(args.out, f"{date_str}.html"), "w", encoding="utf-8") as f:
+            f.write(response.text)
+
+    failed = []
+    with timefolio.create_session(args.workers) as session, ThreadPoolExecutor(args.workers) as executor:
+        for date_str, future in zip(date_strs, [executor.submit(record, d) for d in date_strs]):
+            try:
+                future.result()
+            except requests.exceptions.RequestException as e:
+                failed.append(date_str)
+                print(f"   - {date_str} 실패: {e}")
+    print(f"✅ {len(date_strs) - len(failed)}일 저장 완료" + (f", {len(failed)}일 실패" if failed else ""))
+
+
+# --- 시작 시간 (startup) ---
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 이름 -> (스크립트 경로, 종류, 표시). prompt: 첫 입력 프롬프트 문자열이 출력될 때까지, window: 앱 창을 만들 때까지
+STARTUP_TARGETS = {
+    "timefolio": ("timefolio.py", "prompt", ">> 선택"),
+    "timefolio-gui": ("timefolio_gui.py", "window", "TimefolioApp"),
+    "tradingview": (os.path.join("tradingview_auto_backtest", "tradingview.py"), "window", "TradingViewApp"),
+    "tvbeta": (os.path.join("tradingview_auto_backtest", "tvbeta.py"), "prompt", "수집할 심볼 개수"),
+}
+
+# 창 종류: 모듈을 불러오고 Tk 창과 앱을 만든 뒤 화면 배치까지 마치면 READY를 출력합니다. (화면이 없으면 import까지만)
+WINDOW_SNIPPET = """
+import sys
+sys.path.insert(0, {dir!r})
+import {module} as app_module
+import tkinter as tk
+try:
+    root = tk.Tk()
+except tk.TclError:
+    print("READY no-display", flush=True)
+else:
+    app_module.{app}(root)
+    root.update_idletasks()
+    print("READY window", flush=True)
+"""
+
+
+def time_until_output(cmd, marker, cwd, timeout=60):
+    """cmd를 새 프로세스로 실행해 stdout에 marker가 나올 때까지의 시간(초)과 그때까지의 출력을 반환합니다."""
+    env = dict(os.environ, PYTHONUNBUFFERED="1", PYTHONIOENCODING="utf-8")
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=cwd, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL)
+    output = b""
+    marker_bytes = marker.encode("utf-8")
+    try:
+        while marker_bytes not in output:
+            if time.perf_counter() - t0 > timeout:
+                raise TimeoutError(f"{timeout}초 안에 '{marker}' 출력이 없습니다.")
+            chunk = os.read(proc.stdout.fileno(), 4096)
+            if not chunk:
+                raise RuntimeError(f"'{marker}' 출력 전에 프로세스가 끝났습니다.")
+            output += chunk
+        return time.perf_counter() - t0, output.decode("utf-8", "replace")
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def import_profile(script, top):
+    """python -X importtime으로 스크립트 모듈을 불러올 때 (누적 ms, 모듈명) 목록을 큰 순서로 top개 반환합니다.
+
+    스크립트 모듈 자체(전체)와 스크립트가 직접 import한 모듈만 셉니다.
+    """
+    directory, name = os.path.split(os.path.join(APP_DIR, script))
+    module = os.path.splitext(name)[0]
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=directory,
+                            capture_output=True, text=True, encoding="utf-8", errors="replace")
+    # 하위 모듈이 상위 모듈보다 먼저 출력되므로, 스크립트 모듈 줄 직전까지 모은 깊이 1 줄이 직접 import한 모듈입니다.
+    children = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if not line.startswith("import time:") or len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        cumulative, package = int(parts[1]) / 1000, parts[2]
+        depth = (len(package) - len(package.lstrip(" ")) - 1) // 2
+        if depth == 0:
+            if package.strip() == module:
+                return sorted(children + [(cumulative, f"{module} (전체)")], reverse=True)[:top]
+            children = []
+        elif depth == 1:
+            children.append((cumulative, package.strip()))
+    return []
+
+
+def bench_startup(args):
+    unknown = [t for t in args.targets if t not in STARTUP_TARGETS]
+    if unknown:
+        raise SystemExit(f"알 수 없는 대상: {', '.join(unknown)} (가능: {', '.join(STARTUP_TARGETS)})")
+    print(f"대상마다 새 프로세스로 {args.repeat}회 실행 (첫 프롬프트/창까지의 시간)\n")
+
+    for target in args.targets:
+        script, kind, marker = STARTUP_TARGETS[target]
+        path = os.path.join(APP_DIR, script)
+        directory = os.path.dirname(path)
+        if kind == "prompt":
+            cmd = [sys.executable, path]
+        else:
+            module = os.path.splitext(os.path.basename(path))[0]
+            cmd = [sys.executable, "-c", WINDOW_SNIPPET.format(dir=directory, module=module, app=marker)]
+            marker = "READY"
+        times, note = [], ""
+        try:
+            for _ in range(args.repeat):
+                elapsed, output = time_until_output(cmd, marker, directory)
+                times.append(elapsed)
+            if "no-display" in output:
+                note = "  (화면 없음: 모듈 import까지만 측정)"
+        except (TimeoutError, RuntimeError) as e:
+            print(f"  {target:<14} 실패: {e}")
+            continue
+        print(f"  {target:<14} 최소 {min(times):6.3f}s  중앙값 {np.median(times):6.3f}s  "
+              f"({'첫 프롬프트' if kind == 'prompt' else '창'}){note}")
+        if args.profile:
+            for cumulative, package in import_profile(script, args.profile):
+                print(f"  {'':<14}   {cumulative:8.1f}ms  {package}")
+
+
+def make_synthetic_holdings(years, n_stocks, seed=0):
+    """years년치 거래일 x n_stocks 종목의 가짜 보유종목 long-format 프레임 (비중은 종목별 랜덤워크)."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2024-06-28", periods=int(years * 250))
+    walk = np.abs(rng.normal(0, 0.1, (len(dates), n_stocks)).cumsum(axis=0) + rng.uniform(0.5, 5, n_stocks))
+    weights = walk / walk.sum(axis=1, keepdims=True) * 100
+    return pd.DataFrame({
+        "날짜": np.repeat(dates, n_stocks),
+        "종목명": pd.Categorical(np.tile([f"STOCK{i:03d}" for i in range(n_stocks)], len(dates))),
+        "평가금액(원)": (weights.ravel() * 1e9).astype(np.int64),
+        "비중(%)": weights.ravel().astype(np.float32),
+    })
+
+
+def legacy_top_n_plot(df, top_n):
+    """기존 방식: pivot_table 후 모든 점을 마커와 함께 그립니다."""
+    last_day = df["날짜"].max()
+    top = df[df["날짜"] == last_day].nlargest(top_n, "비중(%)")["종목명"].tolist()
+    pivot_df = df[df["종목명"].isin(top)].pivot_table(index="날짜", columns="종목명", values="비중(%)", observed=True)
+    timefolio.plt.figure(figsize=(12, 7))
+    ax = timefolio.plt.gca()
+    for column in pivot_df.columns:
+        pivot_df[column].plot(kind="line", marker=".", ax=ax, grid=True, label=column)
+    ax.legend(title="종목명", bbox_to_anchor=(1.02, 1), loc="upper left")
+    timefolio.plt.tight_layout()
+    return ax
+
+
+def bench_render(args):
+    timefolio.plt.switch_backend("Agg")
+    df = make_synthetic_holdings(args.years, args.stocks)
+    print(f"{args.years:g}년 x {args.stocks}종목 = {len(df):,}행, 상위 {args.top_n}개 종목 그래프\n")
+
+    for label, draw in (("pivot_table+마커", lambda: legacy_top_n_plot(df, args.top_n)),
+                        ("다운샘플링", lambda: timefolio.plot_top_n_weight_change(df, args.top_n).ax)):
+        t0 = time.perf_counter()
+        ax = draw()
+        fig = ax.figure
+        fig.canvas.draw()
+        first = time.perf_counter() - t0
+
+        # 이동/확대: 최근 1년만 보이게 했다가 전체로 되돌리기를 반복
+        xmin, xmax = ax.get_xlim()
+        t0 = time.perf_counter()
+        for i in range(args.pans):
+            ax.set_xlim((xmax - 365, xmax) if i % 2 == 0 else (xmin, xmax))
+            fig.canvas.draw()
+        pan = (time.perf_counter() - t0) / args.pans
+        points = sum(len(line.get_xdata()) for line in ax.get_lines())
+        print(f"  {label:<16} 첫 그리기 {first:6.3f}s  이동/확대 1회 {pan * 1000:7.1f}ms  그린 점 {points:,}개")
+        timefolio.plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="timefolio 수집/파싱 벤치마크 (로컬 스탠드인 서버)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_suite = sub.add_parser("suite", help="수집 방식별 days/s, 지연 p50/p95, 파싱 시간, 최대 RSS 비교")
+    p_suite.add_argument("--modes", nargs="+", default=list(FETCH_MODES),
+                         help=f"비교할 수집 방식 ({', '.join(FETCH_MODES)})")
+    p_suite.add_argument("--days", type=int, default=90, help="수집 기간 (일)")
+    p_suite.add_argument("--end", default="2024-06-28", help="종료일 (YYYY-MM-DD)")
+    p_suite.add_argument("--latency", type=float, default=0.05, help="요청당 지연 시간 (초)")
+    p_suite.add_argument("--error-rate", type=float, default=0.0, help="503으로 답할 요청 비율")
+    p_suite.add_argument("--slow-rate", type=float, default=0.0, help="느리게 답할 요청 비율")
+    p_suite.add_argument("--slow-latency", type=float, default=1.0, help="느린 응답의 추가 지연 (초)")
+    p_suite.add_argument("--missing-rate", type=float, default=0.0, help="PDF 없는 페이지로 답할 거래일 비율")
+    p_suite.add_argument("--workers", type=int, default=timefolio.DEFAULT_MAX_WORKERS, help="최대 동시 요청 수")
+    p_suite.add_argument("--pages", default=None, help="저장된 m11_view.php 페이지 폴더 (YYYY-MM-DD.html)")
+    p_suite.add_argument("--output", default=None, help="결과를 저장할 CSV 경로")
+    p_suite.add_argument("--baseline", default=None, help="비교할 이전 결과 CSV (--output으로 저장한 파일)")
+    p_suite.set_defaults(func=bench_suite)
+
+    p_record = sub.add_parser("record", help="실제 m11_view.php 페이지를 --pages용 폴더에 저장")
+    p_record.add_argument("--key", default="1", choices=list(timefolio.ETF_LIST), help="ETF_LIST 키")
+    p_record.add_argument("--start", required=True, help="시작일 (YYYY-MM-DD)")
+    p_record.add_argument("--end", required=True, help="종료일 (YYYY-MM-DD)")
+    p_record.add_argument("--out", default="saved_pages", help="저장할 폴더")
+    p_record.add_argument("--workers", type=int, default=4, help="동시 요청 수")
+    p_record.set_defaults(func=record_pages)
+
+    p_startup = sub.add_parser("startup", help="timefolio/tradingview/tvbeta 시작 시간 (첫 프롬프트/창까지)")
+    p_startup.add_argument("--targets", nargs="+", default=list(STARTUP_TARGETS),
+                           help=f"측정할 대상 ({', '.join(STARTUP_TARGETS)})")
+    p_startup.add_argument("--repeat", type=int, default=5, help="반복 횟수")
+    p_startup.add_argument("--profile", type=int, default=0, metavar="N",
+                           help="-X importtime으로 누적 시간이 큰 import N개도 표시")
+    p_startup.set_defaults(func=bench_startup)
+
+    p_fetch = sub.add_parser("fetch", help="fetch_data_from_web 동시 요청 수별 소요 시간 비교")
+    p_fetch.add_argument("--days", type=int, default=60, help="수집 기간 (일)")
+    p_fetch.add_argument("--end", default="2024-06-28", help="종료일 (YYYY-MM-DD)")
+    p_fetch.add_argument("--latency", type=float, default=0.2, help="요청당 지연 시간 (초)")
+    p_fetch.add_argument("--workers", type=int, nargs="+", default=[1, 8, 16], help="비교할 동시 요청 수")
+    p_fetch.add_argument("--pages", default=None, help="저장된 m11_view.php 페이지 폴더 (YYYY-MM-DD.html)")
+    p_fetch.set_defaults(func=bench_fetch)
+
+    p_parse = sub.add_parser("parse", help="페이지당 파싱 시간 비교 (read_html vs parse_holdings_table)")
+    p_parse.add_argument("--pages", default=None, help="저장된 m11_view.php 페이지 폴더 (*.html)")
+    p_parse.add_argument("--count", type=int, default=100, help="저장된 페이지가 없을 때 만들 가짜 페이지 수")
+    p_parse.add_argument("--repeat", type=int, default=3, help="반복 횟수 (가장 빠른 결과 사용)")
+    p_parse.set_defaults(func=bench_parse)
+
+    p_res = sub.add_parser("resilience", help="5xx/느린 응답을 섞은 서버에서 재시도·동시 요청 조절·조건부 요청 확인")
+    p_res.add_argument("--days", type=int, default=60, help="수집 기간 (일)")
+    p_res.add_argument("--end", default="2024-06-28", help="종료일 (YYYY-MM-DD)")
+    p_res.add_argument("--latency", type=float, default=0.05, help="요청당 기본 지연 시간 (초)")
+    p_res.add_argument("--error-rate", type=float, default=0.2, help="503으로 답할 요청 비율")
+    p_res.add_argument("--slow-rate", type=float, default=0.05, help="느리게 답할 요청 비율")
+    p_res.add_argument("--slow-latency", type=float, default=1.5, help="느린 응답의 추가 지연 (초)")
+    p_res.add_argument("--workers", type=int, default=8, help="최대 동시 요청 수")
+    p_res.add_argument("--pages", default=None, help="저장된 m11_view.php 페이지 폴더 (YYYY-MM-DD.html)")
+    p_res.set_defaults(func=bench_resilience)
+
+    p_render = sub.add_parser("render", help="비중 변화 그래프 그리기/이동 시간 비교 (pivot_table+마커 vs 다운샘플링)")
+    p_render.add_argument("--years", type=float, default=5, help="기간 (년)")
+    p_render.add_argument("--stocks", type=int, default=200, help="종목 수")
+    p_render.add_argument("--top-n", type=int, default=50, help="그릴 상위 종목 수")
+    p_render.add_argument("--pans", type=int, default=10, help="이동/확대 반복 횟수")
+    p_render.set_defaults(func=bench_render)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Timefolio 수집용 거래일 달력과 'PDF 없음' 캐시
+
+- trading_days: 주말과 KRX 휴장일을 뺀 거래일 목록
+- NegativeCache: (ETF idx, 날짜) 중 PDF가 없다고 확인된 날을 파일에 기록해 다음 실행 때 건너뜀
+  (점검/오류 페이지를 한 번 받은 것으로 영구히 건너뛰지 않도록, 시간을 두고 두 번 비어 있어야 확정)
+- find_first_pdf_date: 긴 기간에서 ETF의 첫 PDF 날짜를 이분 탐색으로 찾음
+"""
+import json
+import os
+import re
+import threading
+import warnings
+from datetime import datetime, timedelta
+
+# 캐시 폴더는 TIMEFOLIO_CACHE_DIR 환경변수로 바꿀 수 있습니다. (벤치마크 등에서 실제 캐시를 건드리지 않도록)
+CACHE_DIR = os.environ.get(
+    'TIMEFOLIO_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.timefolio_cache'))
+NEGATIVE_CACHE_PATH = os.path.join(CACHE_DIR, 'no_pdf.json')
+
+# 'PDF 없음'은 처음 본 뒤 이 시간 이상 지나 다시 비어 있을 때 확정합니다. (일시적인 점검/오류 페이지 제외)
+NEGATIVE_CONFIRM_AFTER = timedelta(hours=12)
+
+# KRX 휴장일 (주말 제외). 목록에 없는 임시 휴장일은 NegativeCache가 한 번 확인한 뒤 기억합니다.
+KRX_HOLIDAYS = {
+    # 2023
+    '2023-01-23', '2023-01-24', '2023-03-01', '2023-05-01', '2023-05-05', '2023-05-29',
+    '2023-06-06', '2023-08-15', '2023-09-28', '2023-09-29', '2023-10-02', '2023-10-03',
+    '2023-10-09', '2023-12-25', '2023-12-29',
+    # 2024
+    '2024-01-01', '2024-02-09', '2024-02-12', '2024-03-01', '2024-04-10', '2024-05-01',
+    '2024-05-06', '2024-05-15', '2024-06-06', '2024-08-15', '2024-09-16', '2024-09-17',
+    '2024-09-18', '2024-10-01', '2024-10-03', '2024-10-09', '2024-12-25', '2024-12-31',
+    # 2025
+    '2025-01-01', '2025-01-27', '2025-01-28', '2025-01-29', '2025-01-30', '2025-03-03',
+    '2025-05-01', '2025-05-05', '2025-05-06', '2025-06-03', '2025-06-06', '2025-08-15',
+    '2025-10-03', '2025-10-06', '2025-10-07', '2025-10-08', '2025-10-09', '2025-12-25',
+    '2025-12-31',
+    # 2026
+    '2026-01-01', '2026-02-16', '2026-02-17', '2026-02-18', '2026-03-02', '2026-05-01',
+    '2026-05-05', '2026-05-25', '2026-06-03', '2026-08-17', '2026-09-24', '2026-09-25',
+    '2026-10-05', '2026-10-09', '2026-12-25', '2026-12-31',
+}
+HOLIDAY_YEARS = {int(d[:4]) for d in KRX_HOLIDAYS}
+
+# 첫 PDF 날짜 이분 탐색에서 탐색 지점마다 확인할 날 수. 휴장일 목록이 없는 해는 설/추석 연휴(최대 5거래일)를
+# 넘도록 넓게 확인합니다.
+PROBE_WINDOW = 3
+UNCOVERED_PROBE_WINDOW = 7
+
+
+def is_trading_day(day):
+    """주말과 KRX 휴장일이 아니면 True."""
+    return day.weekday() < 5 and day.strftime('%Y-%m-%d') not in KRX_HOLIDAYS
+
+
+def uncovered_years(start_date, end_date):
+    """기간 중 KRX_HOLIDAYS에 휴장일이 없는 연도 목록. (그 해는 주말만 거릅니다)"""
+    return [y for y in range(start_date.year, end_date.year + 1) if y not in HOLIDAY_YEARS]
+
+
+def trading_days(start_date, end_date):
+    """start_date ~ end_date(포함) 사이의 거래일 datetime 목록을 반환합니다.
+
+    휴장일 목록이 없는 연도가 있으면 경고합니다. (그 해의 휴장일은 NegativeCache가 확인하며 배움)
+    """
+    missing = uncovered_years(start_date, end_date)
+    if missing:
+        warnings.warn(f"KRX 휴장일 목록에 {', '.join(map(str, missing))}년이 없어 주말만 제외합니다. "
+                      "(timefolio_calendar.KRX_HOLIDAYS에 추가하세요)", stacklevel=2)
+    days = (start_date + timedelta(days=x) for x in range((end_date - start_date).days + 1))
+    return [d for d in days if is_trading_day(d)]
+
+
+def etf_idx(url_template):
+    """ETF_LIST URL의 idx 값을 꺼냅니다. (예: '...m11_view.php?idx=2&...' -> '2')"""
+    match = re.search(r'[?&]idx=(\d+)', url_template)
+    return match.group(1) if match else url_template
+
+
+_SAVE_LOCK = threading.Lock()
+
+
+class NegativeCache:
+    """PDF가 없다고 확인된 (ETF idx, 날짜) 쌍과 ETF별 첫 PDF 날짜를 JSON 파일로 보관합니다.
+
+    테이블 없는 페이지를 처음 받은 날은 '확인 중'(처음 본 시각)으로만 두고, NEGATIVE_CONFIRM_AFTER 이상 지나
+    다시 비어 있으면 'PDF 없음'으로 확정합니다. 건너뛰는 것(contains)은 확정된 날뿐입니다.
+    """
+
+    def __init__(self, path=NEGATIVE_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._discarded = set()
+        try:
+            with open(path, encoding='utf-8') as f:
+                payload = json.load(f)
+            no_pdf = {idx: set(dates) for idx, dates in payload.get('no_pdf', {}).items()}
+            self._first_pdf = dict(payload.get('first_pdf', {}))
+            if 'pending' in payload:
+                self._data = no_pdf
+                self._pending = {idx: dict(dates) for idx, dates in payload['pending'].items()}
+            else:
+                # 이전 버전은 한 번만 보고 기록했으므로 '확인 중'으로 옮깁니다. (다음에 다시 비어 있으면 바로 확정)
+                self._data = {}
+                self._pending = {idx: dict.fromkeys(dates, '') for idx, dates in no_pdf.items()}
+        except (OSError, ValueError, AttributeError, TypeError):
+            self._data = {}
+            self._pending = {}
+            self._first_pdf = {}
+
+    def contains(self, idx, date_str):
+        return date_str in self._data.get(idx, ())
+
+    def add(self, idx, date_str):
+        """테이블 없는 페이지를 받은 날을 기록합니다. 처음이면 '확인 중', 충분히 지나 다시 보면 확정."""
+        # 오늘 이후 날짜는 아직 PDF가 올라오지 않았을 수 있으므로 기록하지 않습니다.
+        now = datetime.now()
+        if date_str >= now.strftime('%Y-%m-%d'):
+            return
+        with self._lock:
+            pending = self._pending.setdefault(idx, {})
+            first_seen = pending.get(date_str)
+            if first_seen is None:
+                pending[date_str] = now.isoformat(timespec='seconds')
+            elif not first_seen or now - datetime.fromisoformat(first_seen) >= NEGATIVE_CONFIRM_AFTER:
+                del pending[date_str]
+                self._data.setdefault(idx, set()).add(date_str)
+            else:
+                return
+            self._dirty = True
+
+    def discard(self, idx, date_str):
+        """PDF를 받은 날은 '확인 중' 기록을 지웁니다. (그 사이 받은 빈 페이지는 일시적이었음)"""
+        with self._lock:
+            if self._pending.get(idx, {}).pop(date_str, None) is not None:
+                self._discarded.add((idx, date_str))
+                self._dirty = True
+
+    def first_pdf_date(self, idx):
+        """이전에 찾은 ETF의 첫 PDF 날짜 (없으면 None). 이 날짜 이전은 요청할 필요가 없습니다."""
+        return self._first_pdf.get(idx)
+
+    def set_first_pdf_date(self, idx, date_str):
+        with self._lock:
+            if self._first_pdf.get(idx) != date_str:
+                self._first_pdf[idx] = date_str
+                self._dirty = True
+
+    def save(self):
+        """파일에 저장합니다. 여러 ETF를 동시에 받는 경우를 위해 파일의 기존 내용과 합쳐서 씁니다."""
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with _SAVE_LOCK:
+            on_disk = NegativeCache(self.path)
+            with self._lock:
+                for idx, dates in on_disk._data.items():
+                    self._data.setdefault(idx, set()).update(dates)
+                for idx, dates in on_disk._pending.items():
+                    pending = self._pending.setdefault(idx, {})
+                    for date_str, first_seen in dates.items():
+                        if (idx, date_str) in self._discarded:
+                            continue
+                        pending[date_str] = min(pending.get(date_str, first_seen), first_seen)
+                for idx, pending in self._pending.items():
+                    for date_str in self._data.get(idx, set()) & set(pending):
+                        del pending[date_str]
+                for idx, date_str in on_disk._first_pdf.items():
+                    self._first_pdf.setdefault(idx, date_str)
+                payload = {
+                    'no_pdf': {idx: sorted(dates) for idx, dates in self._data.items()},
+                    'pending': {idx: dict(sorted(dates.items())) for idx, dates in self._pending.items() if dates},
+                    'first_pdf': dict(self._first_pdf),
+                }
+                self._dirty = False
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+
+def find_first_pdf_date(has_pdf, days, probe_window=PROBE_WINDOW):
+    """거래일 목록 days에서 PDF가 처음 나오는 날짜를 이분 탐색으로 찾습니다.
+
+    has_pdf(day) -> bool. 상장 이전에는 PDF가 없고 이후에는 있다고 가정하며,
+    목록에 없는 휴장일에 걸려 잘못 판단하지 않도록 각 탐색 지점에서 최대 probe_window일을 확인합니다.
+    PDF가 한 번도 없으면 None을 반환합니다. 확인할 수 없는 날(요청 실패)은 has_pdf가 예외를 내야 하며, 예외는 그대로 전달됩니다.
+    """
+    def available_from(i):
+        return any(has_pdf(days[j]) for j in range(i, min(i + probe_window, len(days))))
+
+    lo, hi = 0, len(days)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if available_from(mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    if lo >= len(days):
+        return None
+    # available_from은 앞쪽 몇 일을 함께 보므로 실제 첫 PDF 날짜로 보정합니다.
+    for j in range(lo, min(lo + probe_window, len(days))):
+        if has_pdf(days[j]):
+            return days[j]
+    return None
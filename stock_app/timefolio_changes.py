@@ -0,0 +1,116 @@
+"""Timefolio 종목 변동 계산 (편입/편출/비중 변경)
+
+보유종목 long-format 프레임(날짜, [ETF], 종목명, 비중(%))을 날짜 x 종목 비중 행렬로 바꿔
+인접한 날끼리의 일별 이벤트와 기간 시작일 대비 종료일 요약을 벡터 연산으로 계산합니다.
+종목 변동 창(display_table_in_new_window), 헤드리스 리포트, 기준일 조회(timefolio_asof)가 같은 계산을 씁니다.
+"""
+from timefolio_lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# 일별 이벤트 로그에서 '비중 변경'으로 기록할 최소 비중 변화 (%p)
+REBALANCE_THRESHOLD = 0.5
+
+
+def to_datetime_index(index):
+    """압축 프레임의 날짜 category 인덱스를 그래프용 DatetimeIndex로 바꿉니다. (일반 날짜 인덱스는 그대로)"""
+    if isinstance(index.dtype, pd.CategoricalDtype):
+        return pd.DatetimeIndex(index.astype(index.categories.dtype))
+    return index
+
+
+def compute_rebalance_events(df, threshold=REBALANCE_THRESHOLD):
+    """일별 편입/편출/비중 변경 이벤트와 종목별 요약을 한 번에(벡터 연산으로) 계산합니다.
+
+    날짜 x 종목 비중 행렬을 만든 뒤 인접한 날끼리 비교합니다. 비중 변경은 변화폭이 threshold(%p) 이상일 때만 기록합니다.
+    ETF 열이 있으면 (ETF, 종목명) 단위로 계산합니다.
+
+    반환값: (events, summary)
+      events: 날짜, [ETF], 종목명, 구분(편입/편출/비중 변경), 이전 비중, 비중, 비중 변화
+      summary: [ETF], 종목명, 첫 편입일, 마지막 보유일, 시작일 비중, 종료일 비중, 비중 변화, 상태
+    """
+    if isinstance(df['날짜'].dtype, pd.CategoricalDtype):
+        date_codes = df['날짜'].cat.codes.to_numpy()
+        dates = to_datetime_index(pd.CategoricalIndex(df['날짜'].cat.categories))
+        observed = np.unique(date_codes)
+        if len(observed) != len(dates):  # 필터링으로 빠진 날짜는 행렬에서 제외
+            date_codes = np.searchsorted(observed, date_codes)
+            dates = dates[observed]
+    else:
+        date_codes, dates = pd.factorize(df['날짜'], sort=True)
+        dates = pd.DatetimeIndex(dates)
+
+    key_cols = ['ETF', '종목명'] if 'ETF' in df.columns else ['종목명']
+    key_codes, keys = pd.MultiIndex.from_frame(df[key_cols].astype(str)).factorize()
+    n_dates, n_keys = len(dates), len(keys)
+
+    weights = np.zeros((n_dates, n_keys), dtype=np.float32)
+    np.add.at(weights, (date_codes, key_codes), df['비중(%)'].to_numpy(dtype=np.float32))
+    held = np.zeros((n_dates, n_keys), dtype=bool)
+    held[date_codes, key_codes] = True
+
+    # --- 일별 이벤트 (전날 대비) ---
+    prev_w, cur_w = weights[:-1], weights[1:]
+    prev_h, cur_h = held[:-1], held[1:]
+    kinds = (
+        ('편입', cur_h & ~prev_h),
+        ('편출', prev_h & ~cur_h),
+        ('비중 변경', cur_h & prev_h & (np.abs(cur_w - prev_w) >= threshold)),
+    )
+    parts = []
+    for kind, mask in kinds:
+        d, k = np.nonzero(mask)
+        parts.append((d + 1, k, np.full(len(d), kind, dtype=object)))
+    d_idx = np.concatenate([p[0] for p in parts])
+    k_idx = np.concatenate([p[1] for p in parts])
+    kind_arr = np.concatenate([p[2] for p in parts])
+    order = np.lexsort((k_idx, d_idx))
+    d_idx, k_idx, kind_arr = d_idx[order], k_idx[order], kind_arr[order]
+
+    events = pd.DataFrame({'날짜': dates[d_idx]})
+    for level, col in enumerate(key_cols):
+        events[col] = pd.Categorical(keys.get_level_values(level)[k_idx])
+    events['구분'] = pd.Categorical(kind_arr, categories=[kind for kind, _ in kinds])
+    events['이전 비중'] = weights[d_idx - 1, k_idx]
+    events['비중'] = weights[d_idx, k_idx]
+    events['비중 변화'] = events['비중'] - events['이전 비중']
+
+    # --- 종목별 요약 (첫/마지막 보유일, 시작일 대비 종료일) ---
+    first_idx = held.argmax(axis=0)
+    last_idx = n_dates - 1 - held[::-1].argmax(axis=0)
+    start_h, end_h = held[0], held[-1]
+    status = np.where(~start_h & end_h, '신규 편입',
+             np.where(start_h & ~end_h, '편출',
+             np.where(start_h & end_h, '비중 변경', '기간 중 편출입')))
+
+    summary = pd.DataFrame({col: keys.get_level_values(level) for level, col in enumerate(key_cols)})
+    summary['첫 편입일'] = dates[first_idx]
+    summary['마지막 보유일'] = dates[last_idx]
+    summary['시작일 비중'] = weights[0]
+    summary['종료일 비중'] = weights[-1]
+    summary['비중 변화'] = summary['종료일 비중'] - summary['시작일 비중']
+    summary['상태'] = status
+    return events, summary
+
+
+def status_labels(summary):
+    """요약 테이블의 상태 문구. 신규 편입/편출/기간 중 편출입은 날짜를 함께 표시합니다."""
+    first = summary['첫 편입일'].dt.strftime('%Y-%m-%d')
+    last = summary['마지막 보유일'].dt.strftime('%Y-%m-%d')
+    status = summary['상태']
+    return np.select(
+        [status == '신규 편입', status == '편출', status == '기간 중 편출입'],
+        ['신규 편입 (' + first + ')', '편출 (' + last + ')', '기간 중 편출입 (' + first + ' ~ ' + last + ')'],
+        default=status,
+    )
+
+
+def change_table(summary):
+    """compute_rebalance_events의 요약을 파일 저장용 종목 변동 테이블로 바꿉니다. (비중은 숫자 그대로)"""
+    name_cols = ['ETF', '종목명'] if 'ETF' in summary.columns else ['종목명']
+    table = summary[name_cols + ['시작일 비중', '종료일 비중', '비중 변화']].copy()
+    table['상태'] = status_labels(summary)
+    table['첫 편입일'] = summary['첫 편입일'].dt.strftime('%Y-%m-%d')
+    table['마지막 보유일'] = summary['마지막 보유일'].dt.strftime('%Y-%m-%d')
+    return table.sort_values('비중 변화', key=abs, ascending=False, ignore_index=True)
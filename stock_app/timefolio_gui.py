@@ -0,0 +1,390 @@
+"""Timefolio ETF 포트폴리오 분석기 GUI
+
+ETF/기간 선택, 수집 진행률(저장소/수집/PDF 없음...), 취소를 한 창에서 처리합니다.
+수집(iter_holdings)은 작업 스레드에서 돌고, 하루치 결과와 진행 상황은 큐로 넘겨
+Tk 메인 스레드가 POLL_INTERVAL_MS마다 꺼내 그래프와 보유종목 표에 반영합니다. (Tk 위젯은 메인 스레드에서만 다룸)
+긴 기간을 받는 중에도 창이 멈추지 않고, 받은 만큼의 결과를 바로 볼 수 있습니다.
+matplotlib/pandas는 창을 먼저 띄운 뒤 불러옵니다. (그동안 [수집 시작]은 비활성)
+
+실행: python timefolio_gui.py  (또는 python timefolio.py --gui)
+"""
+import queue
+import threading
+import time
+import tkinter as tk
+import traceback
+from datetime import datetime, timedelta
+from tkinter import messagebox, scrolledtext, ttk
+
+import timefolio
+from timefolio_lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+# 작업 스레드가 보낸 결과를 확인하는 간격 (ms)
+POLL_INTERVAL_MS = 100
+
+# 한 번 확인할 때 큐를 비우는 데 쓸 최대 시간 (초). 넘으면 나머지는 다음 확인 때 처리해 창이 멈추지 않게 합니다.
+POLL_BUDGET = 0.05
+
+# 창을 띄운 뒤 그래프/표 영역을 만들기까지 기다리는 시간 (ms). 창이 먼저 그려지도록 잠깐 양보합니다.
+DEFERRED_SETUP_MS = 50
+
+# 진행 상황에 표시할 결과 종류 (iter_holdings의 progress counts 키)
+PROGRESS_KINDS = ['저장소', '수집', '변경 없음', 'PDF 없음', '실패']
+
+HOLDING_COLUMNS = ['종목명', '비중']
+
+
+class TimefolioApp:
+    def __init__(self, master):
+        self.master = master
+        master.title("Timefolio ETF 포트폴리오 분석기")
+        master.geometry("1400x900")
+        master.protocol("WM_DELETE_WINDOW", self.exit_program)
+
+        self.is_running = False
+        self.start_time = None
+        self.worker = None
+        self.closing = False
+        self.cancel_event = threading.Event()
+        self.results = queue.Queue()
+        self.aggregates = None
+        self.charts = None
+        self._last_table_refresh = 0.0
+        self._etf_keys = list(timefolio.ETF_LIST)
+
+        self.default_font = ('Helvetica', 10)
+        self.bold_font = ('Helvetica', 10, 'bold')
+        self.title_font = ('Helvetica', 11, 'bold')
+
+        self._create_widgets()
+        self.update_button_states("loading")
+        self.log_system("그래프 모듈을 불러오는 중...")
+        master.after(DEFERRED_SETUP_MS, self._create_result_widgets)
+
+    def _create_widgets(self):
+        frame_left = tk.Frame(self.master, width=420)
+        frame_left.pack(side="left", fill="y")
+        frame_left.pack_propagate(False)
+
+        # 1. 설정 섹션
+        frame_settings = tk.LabelFrame(frame_left, text="🛠️ 기본 설정", padx=10, pady=10)
+        frame_settings.pack(side="top", padx=10, pady=5, fill="x")
+
+        tk.Label(frame_settings, text="ETF:", font=self.bold_font).grid(row=0, column=0, sticky="w", pady=5)
+        self.etf_combo = ttk.Combobox(frame_settings, state="readonly", width=32,
+                                      values=[f"{k}. {name}" for k, (name, _) in timefolio.ETF_LIST.items()])
+        self.etf_combo.grid(row=0, column=1, sticky="w", padx=5, pady=5)
+        self.etf_combo.current(0)
+
+        today = datetime.now()
+        tk.Label(frame_settings, text="시작일:", font=self.bold_font).grid(row=1, column=0, sticky="w", pady=5)
+        self.start_entry = tk.Entry(frame_settings, width=15)
+        self.start_entry.grid(row=1, column=1, sticky="w", padx=5, pady=5)
+        self.start_entry.insert(0, (today - timedelta(days=30)).strftime('%Y-%m-%d'))
+
+        tk.Label(frame_settings, text="종료일:", font=self.bold_font).grid(row=2, column=0, sticky="w", pady=5)
+        self.end_entry = tk.Entry(frame_settings, width=15)
+        self.end_entry.grid(row=2, column=1, sticky="w", padx=5, pady=5)
+        self.end_entry.insert(0, today.strftime('%Y-%m-%d'))
+
+        tk.Label(frame_settings, text="상위 종목 수:", font=self.bold_font).grid(row=3, column=0, sticky="w", pady=5)
+        self.top_n_entry = tk.Entry(frame_settings, width=10)
+        self.top_n_entry.grid(row=3, column=1, sticky="w", padx=5, pady=5)
+        self.top_n_entry.insert(0, "5")
+
+        tk.Label(frame_settings, text="동시 요청 수:", font=self.bold_font).grid(row=4, column=0, sticky="w", pady=5)
+        self.workers_entry = tk.Entry(frame_settings, width=10)
+        self.workers_entry.grid(row=4, column=1, sticky="w", padx=5, pady=5)
+        self.workers_entry.insert(0, str(timefolio.DEFAULT_MAX_WORKERS))
+
+        self.revalidate_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(frame_settings, text="저장된 날도 변경 여부 다시 확인 (조건부 요청)",
+                       variable=self.revalidate_var).grid(row=5, column=0, columnspan=2, sticky="w", pady=5)
+
+        # 2. 정보 표시 섹션
+        frame_info = tk.LabelFrame(frame_left, text="📊 수집 현황", padx=10, pady=10)
+        frame_info.pack(side="top", padx=10, pady=5, fill="x")
+
+        tk.Label(frame_info, text="상태:", font=self.bold_font, fg="gray").grid(row=0, column=0, sticky="w", pady=2)
+        self.lbl_status = tk.Label(frame_info, text="대기 중...", font=self.bold_font, fg="blue")
+        self.lbl_status.grid(row=0, column=1, columnspan=2, sticky="w", padx=5)
+
+        tk.Label(frame_info, text="최근 날짜:", font=self.bold_font, fg="gray").grid(row=1, column=0, sticky="w", pady=2)
+        self.lbl_last_day = tk.Label(frame_info, text="-", font=self.default_font)
+        self.lbl_last_day.grid(row=1, column=1, columnspan=2, sticky="w", padx=5)
+
+        tk.Label(frame_info, text="경과 시간:", font=self.bold_font, fg="gray").grid(row=2, column=0, sticky="w", pady=2)
+        self.lbl_timer = tk.Label(frame_info, text="00:00:00", font=self.default_font, fg="#e74c3c")
+        self.lbl_timer.grid(row=2, column=1, columnspan=2, sticky="w", padx=5)
+
+        tk.Label(frame_info, text="진행률:", font=self.bold_font, fg="gray").grid(row=3, column=0, sticky="w", pady=10)
+        self.progress = ttk.Progressbar(frame_info, orient="horizontal", length=220, mode="determinate")
+        self.progress.grid(row=3, column=1, sticky="w", padx=5, pady=10)
+        self.lbl_progress_pct = tk.Label(frame_info, text="0%", font=self.bold_font, fg="blue")
+        self.lbl_progress_pct.grid(row=3, column=2, sticky="w", padx=5)
+
+        tk.Label(frame_info, text="처리 내역:", font=self.bold_font, fg="gray").grid(row=4, column=0, sticky="nw", pady=2)
+        self.lbl_counts = tk.Label(frame_info, text=self._counts_text({}, 0), font=self.default_font, justify="left")
+        self.lbl_counts.grid(row=4, column=1, columnspan=2, sticky="w", padx=5)
+
+        # 3. 제어 버튼 섹션
+        frame_ctrl = tk.LabelFrame(frame_left, text="🎮 제어 패널", padx=10, pady=10)
+        frame_ctrl.pack(side="bottom", padx=10, pady=5, fill="x")
+
+        frame_top = tk.Frame(frame_ctrl)
+        frame_top.pack(fill="x", pady=(0, 5))
+        self.btn_start = tk.Button(frame_top, text="▶ 수집 시작", command=self.start_fetch, bg="#2ecc71", fg="white", font=self.title_font, height=2)
+        self.btn_start.pack(side="left", fill="x", expand=True, padx=2)
+        self.btn_cancel = tk.Button(frame_top, text="⏹ 취소", command=self.cancel_fetch, bg="#95a5a6", fg="white", font=self.title_font, height=2)
+        self.btn_cancel.pack(side="right", fill="x", expand=True, padx=2)
+
+        frame_bot = tk.Frame(frame_ctrl)
+        frame_bot.pack(fill="x")
+        self.btn_changes = tk.Button(frame_bot, text="📜 변동 내역", command=self.show_changes, bg="#3498db", fg="white", font=self.title_font, height=2)
+        self.btn_changes.pack(side="left", fill="x", expand=True, padx=2)
+        self.btn_exit = tk.Button(frame_bot, text="❌ 프로그램 종료", command=self.exit_program, bg="#c0392b", fg="white", font=self.title_font, height=2)
+        self.btn_exit.pack(side="right", fill="x", expand=True, padx=2)
+
+        # 4. 로그 섹션
+        frame_logs = tk.Frame(frame_left)
+        frame_logs.pack(side="top", padx=10, pady=5, fill="both", expand=True)
+        tk.Label(frame_logs, text="📜 시스템 로그", font=self.bold_font).pack(anchor="w")
+        self.sys_log_text = scrolledtext.ScrolledText(frame_logs, height=8, state='disabled', font=('Consolas', 9))
+        self.sys_log_text.pack(fill="both", expand=True)
+
+        # 5. 결과 섹션 (그래프 / 보유종목 표) - 내용은 _create_result_widgets에서 채움
+        self.notebook = ttk.Notebook(self.master)
+        self.notebook.pack(side="right", padx=10, pady=10, fill="both", expand=True)
+
+    def _create_result_widgets(self):
+        """matplotlib/pandas를 불러와 그래프와 보유종목 표를 만듭니다. (창이 뜬 뒤 한 번 실행)"""
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        from matplotlib.figure import Figure
+        from timefolio_table import VirtualTreeview
+
+        timefolio.set_korean_font()
+        notebook = self.notebook
+        frame_chart = tk.Frame(notebook)
+        self.figure = Figure(figsize=(10, 8))
+        self.canvas = FigureCanvasTkAgg(self.figure, master=frame_chart)
+        NavigationToolbar2Tk(self.canvas, frame_chart).update()
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        notebook.add(frame_chart, text="📈 그래프")
+
+        frame_table = tk.Frame(notebook)
+        self.lbl_table = tk.Label(frame_table, text="보유종목 (최근 날짜 기준)", font=self.bold_font)
+        self.lbl_table.pack(anchor="w", padx=10, pady=(10, 0))
+        self.table = VirtualTreeview(frame_table, pd.DataFrame(columns=HOLDING_COLUMNS), timefolio.PERCENT_FORMATS,
+                                     column_width=250)
+        self.table.pack(fill="both", expand=True)
+        notebook.add(frame_table, text="📋 보유종목")
+
+        self.update_button_states("ready")
+        self.log_system("시스템 준비 완료. ETF와 기간을 고른 뒤 [수집 시작]을 누르세요.")
+
+    # --- UI 기능 함수 ---
+    def log_system(self, message):
+        self.sys_log_text.config(state='normal')
+        self.sys_log_text.insert(tk.END, datetime.now().strftime("[%H:%M:%S] ") + message + "\n")
+        self.sys_log_text.see(tk.END)
+        self.sys_log_text.config(state='disabled')
+
+    def update_timer(self):
+        if self.is_running:
+            elapsed = time.time() - self.start_time
+            self.lbl_timer.config(text=time.strftime("%H:%M:%S", time.gmtime(elapsed)))
+            self.master.after(1000, self.update_timer)
+
+    def update_button_states(self, state):
+        if state == "loading":
+            self.btn_start.config(state="disabled", bg="gray")
+            self.btn_cancel.config(state="disabled", bg="#95a5a6")
+            self.btn_changes.config(state="disabled")
+        elif state == "ready":
+            self.btn_start.config(state="normal", bg="#2ecc71")
+            self.btn_cancel.config(state="disabled", bg="#95a5a6")
+            has_changes = self.aggregates is not None and self.aggregates.days >= 2
+            self.btn_changes.config(state="normal" if has_changes else "disabled")
+        elif state == "running":
+            self.btn_start.config(state="disabled", bg="gray")
+            self.btn_cancel.config(state="normal", bg="#e67e22")
+            self.btn_changes.config(state="disabled")
+        elif state == "cancelling":
+            self.btn_cancel.config(state="disabled", bg="#95a5a6")
+
+    @staticmethod
+    def _counts_text(counts, total):
+        done = sum(counts.values())
+        parts = [f"{kind} {counts.get(kind, 0)}" for kind in PROGRESS_KINDS]
+        return f"{done}/{total}일 처리\n" + " · ".join(parts)
+
+    def _read_settings(self):
+        """입력값을 확인해 (ETF 키, 시작일, 종료일, 상위 종목 수, 동시 요청 수)를 반환합니다. 잘못되면 None."""
+        try:
+            start = datetime.strptime(self.start_entry.get().strip(), '%Y-%m-%d')
+            end = datetime.strptime(self.end_entry.get().strip(), '%Y-%m-%d')
+        except ValueError:
+            messagebox.showerror("오류", "날짜는 YYYY-MM-DD 형식으로 입력하세요."); return None
+        if start > end:
+            messagebox.showerror("오류", "시작일이 종료일보다 늦습니다."); return None
+        try:
+            top_n = int(self.top_n_entry.get())
+            workers = int(self.workers_entry.get())
+            if top_n <= 0 or workers <= 0: raise ValueError
+        except ValueError:
+            messagebox.showerror("오류", "상위 종목 수와 동시 요청 수는 1 이상의 정수로 입력하세요."); return None
+        key = self._etf_keys[self.etf_combo.current()]
+        return key, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'), top_n, workers
+
+    def start_fetch(self):
+        if self.closing: return
+        settings = self._read_settings()
+        if settings is None: return
+        key, start, end, top_n, workers = settings
+        etf_name, url_template = timefolio.ETF_LIST[key]
+        from timefolio_stream import StreamingAggregates, LiveCharts
+
+        self.aggregates = StreamingAggregates()
+        self.figure.clear()
+        self.charts = LiveCharts(self.aggregates, top_n, etf_name, figure=self.figure)
+        self.canvas.draw_idle()
+        self.table.set_frame(pd.DataFrame(columns=HOLDING_COLUMNS))
+        self.lbl_table.config(text="보유종목 (최근 날짜 기준)")
+        self.lbl_last_day.config(text="-")
+        self.progress['value'] = 0
+        self.lbl_progress_pct.config(text="0%")
+        self.lbl_counts.config(text=self._counts_text({}, 0))
+
+        self.is_running = True
+        self.start_time = time.time()
+        self.cancel_event = threading.Event()
+        self.results = queue.Queue()
+        self.update_button_states("running")
+        self.lbl_status.config(text=f"{etf_name} 수집 중...", fg="blue")
+        self.log_system(f"=== '{etf_name}' 수집 시작 ({start} ~ {end}, 동시 요청 {workers}개) ===")
+        self.update_timer()
+
+        self.worker = threading.Thread(target=self.run_fetch_logic, daemon=True,
+                                       args=(url_template, start, end, workers, self.revalidate_var.get(),
+                                             self.cancel_event, self.results))
+        self.worker.start()
+        self.master.after(POLL_INTERVAL_MS, self.poll_results)
+
+    def cancel_fetch(self):
+        if not self.is_running: return
+        self.cancel_event.set()
+        self.update_button_states("cancelling")
+        self.lbl_status.config(text="취소 중... (진행 중인 요청만 마칩니다)", fg="#e67e22")
+        self.log_system("🛑 취소 요청됨... 진행 중인 요청을 마치고 멈춥니다.")
+
+    def show_changes(self):
+        if self.aggregates is None or self.aggregates.days < 2:
+            messagebox.showinfo("알림", "종목 변동을 보려면 이틀 이상의 데이터가 필요합니다."); return
+        timefolio.display_table_in_new_window(self.aggregates.to_frame(), parent=self.master)
+
+    def exit_program(self):
+        if self.closing:
+            return
+        if self.is_running and not messagebox.askokcancel("종료", "수집 중입니다. 취소하고 종료하시겠습니까?\n(받은 날은 저장소에 저장됩니다)"):
+            return
+        self.closing = True
+        self.cancel_event.set()
+        self.btn_exit.config(state="disabled")
+        if self.is_running:
+            self.update_button_states("cancelling")
+            self.lbl_status.config(text="종료 중... (진행 중인 요청과 저장을 마칩니다)", fg="#e67e22")
+        self._destroy_when_idle()
+
+    def _destroy_when_idle(self):
+        # 작업 스레드가 저장소에 쓰는 도중에 창(과 프로세스)을 닫지 않도록, 스레드가 끝난 뒤에 닫습니다.
+        if self.worker is not None and self.worker.is_alive():
+            self.master.after(POLL_INTERVAL_MS, self._destroy_when_idle)
+            return
+        self.master.destroy()
+
+    # --- 작업 스레드 (Tk 위젯을 직접 건드리지 않고 큐로만 결과를 넘김) ---
+    def run_fetch_logic(self, url_template, start, end, workers, revalidate, cancel_event, results):
+        try:
+            scheduler = timefolio.FetchScheduler(timefolio.DEFAULT_RATE_LIMIT, max_concurrency=workers)
+            for _, day_df in timefolio.iter_holdings(
+                    url_template, start, end, max_workers=workers, scheduler=scheduler, verbose=False,
+                    revalidate=revalidate, cancel=cancel_event,
+                    progress=lambda counts, total: results.put(('progress', dict(counts), total))):
+                results.put(('day', day_df))
+            results.put(('done', scheduler.summary()))
+        except Exception as e:
+            print(traceback.format_exc())
+            results.put(('error', str(e)))
+
+    # --- 메인 스레드: 큐 처리와 화면 갱신 ---
+    def poll_results(self):
+        finished = None
+        deadline = time.perf_counter() + POLL_BUDGET
+        while time.perf_counter() < deadline:
+            try:
+                item = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if item[0] == 'day':
+                day_df = item[1]
+                self.aggregates.update(day_df['날짜'].iloc[0], day_df)
+            elif item[0] == 'progress':
+                self.update_progress(item[1], item[2])
+            else:
+                finished = item
+
+        self.refresh_views(force=finished is not None)
+        if finished is not None:
+            self.finish_fetch(*finished)
+        else:
+            self.master.after(POLL_INTERVAL_MS, self.poll_results)
+
+    def update_progress(self, counts, total):
+        done = sum(counts.values())
+        self.progress['maximum'] = max(total, 1)
+        self.progress['value'] = done
+        self.lbl_progress_pct.config(text=f"{done / total * 100:.1f}%" if total else "0%")
+        self.lbl_counts.config(text=self._counts_text(counts, total))
+
+    def refresh_views(self, force=False):
+        from timefolio_stream import REFRESH_INTERVAL
+        agg = self.aggregates
+        if agg.days == 0:
+            return
+        self.charts.refresh(force=force)
+        now = time.monotonic()
+        if not force and now - self._last_table_refresh < REFRESH_INTERVAL:
+            return
+        self._last_table_refresh = now
+        holdings = pd.DataFrame(list(agg.last_holdings.items()), columns=HOLDING_COLUMNS)
+        self.table.set_frame(holdings.sort_values('비중', ascending=False, ignore_index=True))
+        self.lbl_table.config(text=f"보유종목 ({agg.last_day:%Y-%m-%d} 기준, {len(holdings)}종목)")
+        self.lbl_last_day.config(text=f"{agg.last_day:%Y-%m-%d} (누적 {agg.days}일)")
+
+    def finish_fetch(self, kind, message):
+        self.is_running = False
+        cancelled = self.cancel_event.is_set()
+        if kind == 'error':
+            self.lbl_status.config(text="오류로 중단됨", fg="#c0392b")
+            self.log_system(f"치명적 오류 발생: {message}")
+        elif cancelled:
+            self.lbl_status.config(text="취소됨 (받은 날은 저장소에 저장됨)", fg="#e67e22")
+            self.log_system(f"⏹ 수집 취소: {self.aggregates.days}일치 표시 중 ({message})")
+        else:
+            self.lbl_status.config(text="완료", fg="#27ae60")
+            self.log_system(f"✅ 수집 완료: {self.aggregates.days}일치 ({message})")
+        if self.aggregates.days == 0 and kind != 'error':
+            self.log_system("❌ 분석할 데이터를 찾지 못했습니다. 기간 내에 PDF 자료가 없는 날이 많을 수 있습니다.")
+        self.update_button_states("ready")
+
+
+def main():
+    root = tk.Tk()
+    TimefolioApp(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
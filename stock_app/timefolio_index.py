@@ -0,0 +1,234 @@
+"""Timefolio ETF 간 역색인 (종목 -> 보유 ETF, 보유 기간, 비중)
+
+"지난달 NVIDIA를 보유한 Timefolio ETF와 비중은?" 같은 질문에 매번 모든 ETF의 전체 이력을 훑지 않도록
+종목명 -> {ETF: (날짜 목록, 비중 목록)} 형태의 역색인을 유지합니다.
+새로 받은 날짜만 추가(add_frame / sync_from_store)하면 되고, 색인은 파일로 저장해 다음 실행 때 재사용합니다.
+확정되지 않은 날(장중에 받은 오늘 페이지)은 저장소에서 다시 받아 덮어쓰면 sync_from_store가 다시 읽습니다.
+"""
+import os
+import pickle
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+
+from timefolio_calendar import CACHE_DIR
+from timefolio_lazy import lazy_import
+from timefolio_store import is_final
+
+pd = lazy_import('pandas')
+
+INDEX_PATH = os.path.join(CACHE_DIR, 'holdings_index.pkl')
+
+
+def _ordinal(value):
+    """'YYYY-MM-DD' 문자열, datetime, Timestamp를 날짜 서수(int)로 바꿉니다."""
+    if isinstance(value, str):
+        value = datetime.strptime(value[:10], '%Y-%m-%d')
+    return value.toordinal()
+
+
+def _to_date(ordinal):
+    return pd.Timestamp(date.fromordinal(ordinal))
+
+
+class HoldingsIndex:
+    """종목명 기준 ETF 보유 역색인."""
+
+    def __init__(self):
+        # 종목명 -> {ETF: ([날짜 서수...], [비중...])}  (날짜 오름차순)
+        self._postings = {}
+        # ETF -> {날짜 서수: {종목명: 비중}}  (하루치 교체, 중복 비교용 정방향 색인)
+        self._fund_days = {}
+        # ETF -> [날짜 서수...]  (오름차순)
+        self._fund_dates = {}
+        # ETF -> {날짜 서수: 저장소 fetched_at}  확정되지 않은 날. 저장본의 fetched_at이 달라지면 다시 읽습니다.
+        self._provisional = {}
+
+    # --- 저장/불러오기 ---
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        """저장된 색인을 읽습니다. 없거나 읽을 수 없으면 빈 색인을 반환합니다."""
+        try:
+            with open(path, 'rb') as f:
+                index = pickle.load(f)
+            if isinstance(index, cls):
+                index.__dict__.setdefault('_provisional', {})  # 이전 버전에서 저장한 색인
+                return index
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            pass
+        return cls()
+
+    def save(self, path=INDEX_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    # --- 갱신 ---
+    def has_day(self, fund, day):
+        return _ordinal(day) in self._fund_days.get(fund, {})
+
+    def add_day(self, fund, day, holdings, fetched_at=None):
+        """ETF 하나의 하루치 보유종목 {종목명: 비중}을 추가합니다. 같은 날이 이미 있으면 교체합니다.
+
+        fetched_at: 저장소에 기록된 받은 시각. 확정되지 않은 날이면 기억해 두고 저장본이 바뀌면 다시 읽습니다.
+        """
+        d = _ordinal(day)
+        days = self._fund_days.setdefault(fund, {})
+        if d in days:
+            for name in days[d]:
+                postings = self._postings[name]
+                dates, weights = postings[fund]
+                i = bisect_left(dates, d)
+                del dates[i], weights[i]
+                if not dates:  # 교체한 날에서 빠진 종목은 다른 날 보유 기록이 없으면 색인에서도 지웁니다.
+                    del postings[fund]
+                    if not postings:
+                        del self._postings[name]
+        else:
+            insort(self._fund_dates.setdefault(fund, []), d)
+        days[d] = dict(holdings)
+        provisional = self._provisional.setdefault(fund, {})
+        if is_final(date.fromordinal(d).isoformat(), fetched_at):
+            provisional.pop(d, None)
+        else:
+            provisional[d] = fetched_at
+
+        for name, weight in days[d].items():
+            dates, weights = self._postings.setdefault(name, {}).setdefault(fund, ([], []))
+            if not dates or dates[-1] < d:  # 대부분 날짜 순으로 들어오므로 append
+                dates.append(d)
+                weights.append(weight)
+            else:
+                i = bisect_left(dates, d)
+                dates.insert(i, d)
+                weights.insert(i, weight)
+
+    def add_frame(self, df, fund=None, fetch_times=None):
+        """fetch_data_from_web/fetch_batch 결과를 색인에 추가합니다.
+
+        ETF 열이 있으면 그 값을, 없으면 fund 인자를 ETF 이름으로 사용합니다.
+        fetch_times: 저장소에서 읽은 경우 {날짜: 받은 시각} (HoldingsStore.fetch_times)
+        """
+        if df.empty:
+            return
+        fetch_times = fetch_times or {}
+        frame = df if 'ETF' in df.columns else df.assign(ETF=fund)
+        frame = frame[['ETF', '날짜', '종목명', '비중(%)']].astype({'ETF': str, '종목명': str})
+        for (etf, day), group in frame.groupby(['ETF', '날짜'], observed=True, sort=True):
+            self.add_day(etf, day, zip(group['종목명'], group['비중(%)'].astype(float)),
+                         fetched_at=fetch_times.get(day.strftime('%Y-%m-%d')))
+
+    def sync_from_store(self, store, idx_names):
+        """로컬 저장소(HoldingsStore)에서 아직 색인되지 않은 날짜와, 확정 전에 색인한 뒤 저장본이 바뀐 날짜를 읽어 반영합니다.
+
+        idx_names: {ETF idx: ETF 이름}. 추가/갱신한 날짜 수를 반환합니다.
+        """
+        updated = 0
+        for idx, name in idx_names.items():
+            fetch_times = store.fetch_times(idx)
+            provisional = self._provisional.get(name, {})
+            stale = [d for d, fetched_at in fetch_times.items()
+                     if not self.has_day(name, d) or provisional.get(_ordinal(d), fetched_at) != fetched_at]
+            if stale:
+                self.add_frame(store.load(idx, stale), fund=name, fetch_times=fetch_times)
+                updated += len(stale)
+        return updated
+
+    # --- 조회 ---
+    def __contains__(self, name):
+        return name in self._postings
+
+    def stocks(self):
+        return sorted(self._postings)
+
+    def funds(self):
+        return sorted(self._fund_dates)
+
+    def search(self, text):
+        """종목명에 text가 포함된 종목 목록 (대소문자 무시)."""
+        text = text.lower()
+        return sorted(name for name in self._postings if text in name.lower())
+
+    def holding_periods(self, name, fund, start=None, end=None):
+        """ETF가 종목을 연속으로 보유한 구간 [(시작일, 종료일), ...]. ETF의 PDF가 있는 날 기준으로 끊김을 판단합니다."""
+        dates, _ = self._postings.get(name, {}).get(fund, ([], []))
+        lo, hi = self._range(dates, start, end)
+        fund_dates = self._fund_dates[fund] if dates else []
+        periods = []
+        prev_pos = None
+        for d in dates[lo:hi]:
+            pos = bisect_left(fund_dates, d)
+            if prev_pos is not None and pos == prev_pos + 1:
+                periods[-1][1] = d
+            else:
+                periods.append([d, d])
+            prev_pos = pos
+        return [(_to_date(a), _to_date(b)) for a, b in periods]
+
+    def funds_holding(self, name, start=None, end=None):
+        """기간 내 종목을 보유한 ETF와 보유 구간/비중 요약 DataFrame."""
+        rows = []
+        for fund, (dates, weights) in self._postings.get(name, {}).items():
+            lo, hi = self._range(dates, start, end)
+            if lo >= hi:
+                continue
+            window = weights[lo:hi]
+            periods = self.holding_periods(name, fund, start, end)
+            rows.append({
+                'ETF': fund,
+                '첫 보유일': _to_date(dates[lo]),
+                '마지막 보유일': _to_date(dates[hi - 1]),
+                '보유일수': hi - lo,
+                '보유 구간': ', '.join(f"{a:%Y-%m-%d}~{b:%Y-%m-%d}" for a, b in periods),
+                '최근 비중': window[-1],
+                '평균 비중': sum(window) / len(window),
+                '최대 비중': max(window),
+            })
+        columns = ['ETF', '첫 보유일', '마지막 보유일', '보유일수', '보유 구간', '최근 비중', '평균 비중', '최대 비중']
+        return pd.DataFrame(rows, columns=columns).sort_values('최근 비중', ascending=False, ignore_index=True)
+
+    def weight_series(self, name, start=None, end=None):
+        """종목의 ETF별 일별 비중 (행: 날짜, 열: ETF)."""
+        series = {}
+        for fund, (dates, weights) in self._postings.get(name, {}).items():
+            lo, hi = self._range(dates, start, end)
+            if lo < hi:
+                series[fund] = pd.Series(weights[lo:hi], index=[_to_date(d) for d in dates[lo:hi]])
+        return pd.DataFrame(series).sort_index()
+
+    def holdings_as_of(self, fund, day=None):
+        """day(기본값: 마지막 날) 이전 가장 최근 PDF의 (날짜, {종목명: 비중}). 없으면 (None, {})."""
+        fund_dates = self._fund_dates.get(fund, [])
+        pos = len(fund_dates) if day is None else bisect_right(fund_dates, _ordinal(day))
+        if pos == 0:
+            return None, {}
+        d = fund_dates[pos - 1]
+        return _to_date(d), self._fund_days[fund][d]
+
+    def exposure(self, name, day=None):
+        """day 기준 각 ETF의 종목 비중 (ETF별 가장 최근 PDF 기준)."""
+        rows = []
+        for fund in self._postings.get(name, {}):
+            as_of, holdings = self.holdings_as_of(fund, day)
+            if name in holdings:
+                rows.append({'ETF': fund, '기준일': as_of, '비중': holdings[name]})
+        return pd.DataFrame(rows, columns=['ETF', '기준일', '비중']).sort_values('비중', ascending=False, ignore_index=True)
+
+    def overlap(self, fund_a, fund_b, day=None):
+        """두 ETF가 day 기준으로 함께 보유한 종목과 각 비중. 겹치는 비중 합은 min(비중) 합으로 계산합니다."""
+        _, a = self.holdings_as_of(fund_a, day)
+        _, b = self.holdings_as_of(fund_b, day)
+        common = sorted(set(a) & set(b), key=lambda n: -min(a[n], b[n]))
+        return pd.DataFrame({
+            '종목명': common,
+            fund_a: [a[n] for n in common],
+            fund_b: [b[n] for n in common],
+            '겹치는 비중': [min(a[n], b[n]) for n in common],
+        })
+
+    @staticmethod
+    def _range(dates, start, end):
+        lo = 0 if start is None else bisect_left(dates, _ordinal(start))
+        hi = len(dates) if end is None else bisect_right(dates, _ordinal(end))
+        return lo, hi
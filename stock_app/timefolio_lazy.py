@@ -0,0 +1,40 @@
+"""무거운 모듈의 지연 import
+
+pandas/numpy/matplotlib/requests는 불러오는 데만 수백 ms가 걸려, 모듈 맨 위에서 import하면
+--help나 첫 입력 프롬프트가 뜨기 전에 1초 가까이 기다려야 합니다.
+lazy_import('pandas')가 돌려주는 LazyModule은 속성에 처음 접근할 때 실제 모듈을 불러오므로
+`pd = lazy_import('pandas')`로 바꾸기만 하면 나머지 코드(pd.DataFrame 등)는 그대로 쓸 수 있습니다.
+"""
+import importlib
+import sys
+
+
+class LazyModule:
+    """처음 속성에 접근할 때 importlib.import_module로 불러오는 모듈 대리 객체. (여러 스레드에서 써도 안전)"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)  # import 잠금이 동시 로딩을 막음
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+def lazy_import(name):
+    """name 모듈의 LazyModule을 반환합니다. 이미 불러온 모듈이면 대리 객체 없이 그 모듈을 그대로 반환합니다."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
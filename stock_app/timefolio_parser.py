@@ -0,0 +1,87 @@
+"""Timefolio PDF 보유종목 테이블 전용 파서
+
+pd.read_html은 페이지 전체를 DOM으로 만들고 모든 테이블을 DataFrame으로 바꾼 뒤 첫 번째만 사용합니다.
+여기서는 페이지 문자열에서 '종목명' 헤더가 있는 첫 테이블 구간만 잘라내 행/셀을 읽고,
+나머지 페이지는 건드리지 않습니다. 열 타입은 바로 정해서 돌려줍니다.
+  - 종목명: category
+  - 평가금액(원): int64
+  - 비중(%): float32
+  - 그 외 열(종목코드, 수량 등): 문자열
+"""
+import html as html_lib
+import re
+
+from timefolio_lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+_ROW_RE = re.compile(r'<tr\b[^>]*>(.*?)</tr\s*>', re.S | re.I)
+_CELL_RE = re.compile(r'<t[hd]\b[^>]*>(.*?)</t[hd]\s*>', re.S | re.I)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _cell_text(raw):
+    if '<' in raw:
+        raw = _TAG_RE.sub('', raw)
+    if '&' in raw:
+        raw = html_lib.unescape(raw)
+    return ' '.join(raw.split())
+
+
+def _find_holdings_table(page):
+    """'종목명' 헤더가 들어 있는 첫 <table> ... </table> 구간을 반환합니다. 없으면 None."""
+    lower = page.lower()
+    pos = page.find('종목명')
+    while pos != -1:
+        start = lower.rfind('<table', 0, pos)
+        if start != -1 and lower.rfind('</table', start, pos) == -1:
+            end = lower.find('</table', pos)
+            return page[start:end if end != -1 else len(page)]
+        pos = page.find('종목명', pos + 3)
+    return None
+
+
+def _to_number(text):
+    try:
+        return float(text.replace(',', '').replace('%', ''))
+    except ValueError:
+        return np.nan
+
+
+def parse_holdings_table(page):
+    """페이지에서 첫 번째 보유종목 테이블('종목명' 헤더)을 타입이 지정된 DataFrame으로 반환합니다.
+
+    보유종목 테이블이 없으면 None. 종목명/평가금액/비중이 비어 있거나 숫자가 아닌 행은 제외합니다.
+    """
+    table = _find_holdings_table(page)
+    if table is None:
+        return None
+    rows = [[_cell_text(c) for c in _CELL_RE.findall(r)] for r in _ROW_RE.findall(table)]
+    rows = [r for r in rows if r]
+    if not rows or '종목명' not in rows[0]:
+        return None
+
+    header, body = rows[0], rows[1:]
+    width = len(header)
+    body = [r[:width] + [''] * (width - len(r)) for r in body]
+    columns = dict(zip(header, zip(*body))) if body else {name: () for name in header}
+
+    mask = np.array([bool(name) for name in columns['종목명']], dtype=bool)
+    numeric = {}
+    for col in ('평가금액(원)', '비중(%)'):
+        if col in columns:
+            numeric[col] = np.array([_to_number(v) for v in columns[col]], dtype=np.float64)
+            mask &= ~np.isnan(numeric[col])
+
+    data = {}
+    for col, values in columns.items():
+        if col == '종목명':
+            data[col] = pd.Categorical(np.array(values, dtype=object)[mask])
+        elif col == '평가금액(원)':
+            data[col] = np.round(numeric[col][mask]).astype(np.int64)
+        elif col == '비중(%)':
+            data[col] = numeric[col][mask].astype(np.float32)
+        else:
+            data[col] = pd.Series(np.array(values, dtype=object)[mask], dtype=object).astype(str)
+    return pd.DataFrame(data)
@@ -0,0 +1,133 @@
+"""Timefolio 시계열 그래프 렌더링 (다운샘플링 + 선 재사용)
+
+여러 해/여러 ETF 데이터를 모든 점과 마커로 그리면 그리기와 이동/확대가 느려집니다.
+DecimatedChart는 원본 시계열을 들고 있다가, 화면에 보이는 구간만 가로 픽셀 수만큼의 구간(bucket)으로 나눠
+구간마다 첫/최소/최대/마지막 점만 그립니다. (min/max decimation: 봉우리와 골짜기는 그대로 보임)
+보이는 범위가 바뀌거나 데이터가 갱신되면 만들어 둔 Line2D의 데이터만 바꿔 끼웁니다.
+"""
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+
+# 화면에 보이는 점이 이보다 적을 때만 마커를 그립니다.
+MARKER_MAX_POINTS = 150
+
+# 축 너비를 알 수 없을 때 사용할 최소 구간 수
+MIN_BUCKETS = 200
+
+# 범례에 표시할 최대 항목 수 (범례는 매번 다시 그려지므로 항목이 많으면 이동/확대가 느려지고 그림 밖으로 넘침)
+LEGEND_MAX_ENTRIES = 20
+
+
+def minmax_decimate(x, y, n_buckets):
+    """x 순으로 정렬된 (x, y)를 n_buckets개 구간으로 나눠 구간마다 첫/최소/최대/마지막 점만 남깁니다.
+
+    남긴 점은 원래 x 순서를 유지합니다. y의 NaN(보유하지 않은 날)은 최소/최대 계산에서 빼지만,
+    구간 전체가 NaN이면 그 점을 남겨 선이 끊기도록 합니다.
+    """
+    n = len(x)
+    if n <= 4 * n_buckets:
+        return x, y
+    span = x[-1] - x[0]
+    buckets = np.minimum(((x - x[0]) / span * n_buckets).astype(np.int64), n_buckets - 1)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    nan = np.isnan(y)
+    argmin = np.lexsort((np.where(nan, np.inf, y), buckets))[starts]
+    argmax = np.lexsort((np.where(nan, np.inf, -y), buckets))[starts]
+    keep = np.unique(np.concatenate([starts, argmin, argmax, ends]))
+    return x[keep], y[keep]
+
+
+def to_date_numbers(dates):
+    """날짜(DatetimeIndex, datetime64 배열 등)를 matplotlib 날짜 숫자로 바꿉니다."""
+    return mdates.date2num(pd.DatetimeIndex(dates).to_numpy())
+
+
+class DecimatedLine:
+    """원본 시계열 하나와 그것을 그리는 Line2D 하나."""
+
+    def __init__(self, ax, x, y, marker=None, **style):
+        self.marker = marker
+        self.line, = ax.plot([], [], **style)
+        self.set_data(x, y)
+
+    def set_data(self, x, y):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+
+    def render(self, xmin, xmax, n_buckets):
+        # 보이는 구간 양옆의 한 점까지 포함해 선이 축 끝까지 이어지게 합니다.
+        lo = max(np.searchsorted(self.x, xmin, side='left') - 1, 0)
+        hi = np.searchsorted(self.x, xmax, side='right') + 1
+        xs, ys = minmax_decimate(self.x[lo:hi], self.y[lo:hi], n_buckets)
+        self.line.set_data(xs, ys)
+        self.line.set_marker(self.marker if self.marker and len(xs) <= MARKER_MAX_POINTS else '')
+
+    def remove(self):
+        self.line.remove()
+
+
+class DecimatedChart:
+    """축 하나에 그리는 다운샘플링 시계열 모음. 키(종목명 등)별로 선을 재사용합니다."""
+
+    def __init__(self, ax):
+        self.ax = ax
+        self.lines = {}
+        self._rendering = False
+        ax.xaxis_date()
+        # 이동/확대로 x 범위가 바뀌면 보이는 구간을 다시 다운샘플링합니다. (lambda로 연결해 약한 참조로 사라지지 않게 함)
+        ax.callbacks.connect('xlim_changed', lambda _ax: self.render())
+
+    def set_series(self, key, dates, values, **style):
+        """key의 선을 (dates, values)로 갱신합니다. 처음 보는 key면 선을 새로 만듭니다."""
+        x = to_date_numbers(dates)
+        line = self.lines.get(key)
+        if line is None:
+            self.lines[key] = DecimatedLine(self.ax, x, values, **style)
+        else:
+            line.set_data(x, values)
+            if 'marker' in style:
+                line.marker = style.pop('marker')
+            if style:
+                line.line.set(**style)
+
+    def retain(self, keys):
+        """keys에 없는 선을 지웁니다."""
+        for key in [k for k in self.lines if k not in keys]:
+            self.lines.pop(key).remove()
+
+    def legend(self, keys, title):
+        """keys 순서대로 최대 LEGEND_MAX_ENTRIES개 선의 범례를 그림 오른쪽 밖에 표시합니다."""
+        shown = [k for k in keys if k in self.lines][:LEGEND_MAX_ENTRIES]
+        if len(shown) < len(keys):
+            title = f"{title} (상위 {len(shown)}개만 표시)"
+        return self.ax.legend([self.lines[k].line for k in shown], shown, title=title,
+                              bbox_to_anchor=(1.02, 1), loc='upper left')
+
+    def autoscale(self, margin=0.03):
+        """원본 데이터 전체 범위로 축 범위를 맞추고 다시 그릴 점을 계산합니다."""
+        xs = [line.x for line in self.lines.values() if len(line.x)]
+        ys = [line.y[~np.isnan(line.y)] for line in self.lines.values()]
+        ys = [y for y in ys if len(y)]
+        if not xs or not ys:
+            return
+        xmin, xmax = min(x[0] for x in xs), max(x[-1] for x in xs)
+        ymin, ymax = min(y.min() for y in ys), max(y.max() for y in ys)
+        xpad = (xmax - xmin) * margin or 1.0
+        ypad = (ymax - ymin) * margin or max(abs(ymax) * margin, 1.0)
+        self.ax.set_ylim(ymin - ypad, ymax + ypad)
+        self.ax.set_xlim(xmin - xpad, xmax + xpad)  # xlim_changed -> render
+        self.render()
+
+    def render(self):
+        if self._rendering:
+            return
+        self._rendering = True
+        try:
+            xmin, xmax = self.ax.get_xlim()
+            n_buckets = max(int(self.ax.get_window_extent().width), MIN_BUCKETS)
+            for line in self.lines.values():
+                line.render(xmin, xmax, n_buckets)
+        finally:
+            self._rendering = False
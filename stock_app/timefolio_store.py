@@ -0,0 +1,207 @@
+"""Timefolio 보유종목 로컬 저장소 (SQLite)
+
+ETF idx(ETF_LIST URL의 idx 값)와 pdfDate 단위로 하루치 보유종목을 저장합니다.
+fetch_data_from_web은 저장된 날짜를 바로 읽고, 비어 있는 날짜만 웹에서 받아옵니다.
+응답의 ETag/Last-Modified도 함께 저장해 두었다가 다시 확인할 때 조건부 요청(304)에 사용합니다.
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from timefolio_calendar import CACHE_DIR
+from timefolio_lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+STORE_PATH = os.path.join(CACHE_DIR, 'holdings.sqlite')
+
+# PDF 테이블에서 저장하는 열 (페이지 열 이름 -> DB 열 이름)
+HOLDING_COLUMNS = {
+    '종목명': 'name',
+    '종목코드': 'code',
+    '수량': 'quantity',
+    '평가금액(원)': 'value',
+    '비중(%)': 'weight',
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    idx        TEXT NOT NULL,
+    pdf_date   TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    etag       TEXT,
+    last_modified TEXT,
+    PRIMARY KEY (idx, pdf_date)
+);
+CREATE TABLE IF NOT EXISTS holdings (
+    idx      TEXT NOT NULL,
+    pdf_date TEXT NOT NULL,
+    row_no   INTEGER NOT NULL,
+    name     TEXT,
+    code     TEXT,
+    quantity TEXT,
+    value    INTEGER,
+    weight   REAL,
+    PRIMARY KEY (idx, pdf_date, row_no)
+);
+"""
+
+
+def select_holding_columns(df):
+    """PDF 테이블에서 저장 대상 열과 '날짜' 열만 남깁니다. (저장본과 새로 받은 날의 열 구성을 맞춤)
+
+    종목코드/수량은 저장본과 같도록 문자열로 맞춥니다.
+    """
+    columns = [c for c in HOLDING_COLUMNS if c in df.columns]
+    if '날짜' in df.columns:
+        columns.append('날짜')
+    df = df[columns].copy()
+    for col in ('종목코드', '수량'):
+        if col in df.columns:
+            df[col] = df[col].astype(str)
+    return df
+
+
+def is_final(date_str, fetched_at=None):
+    """오늘 이전 날짜의 PDF는 더 이상 바뀌지 않는 것으로 봅니다. (오늘 페이지는 장중에 바뀔 수 있음)
+
+    fetched_at을 주면 그날이 지난 뒤에 받은 경우에만 확정으로 봅니다. (장중에 받은 페이지는 다시 확인)
+    """
+    if fetched_at is not None and fetched_at[:10] <= date_str:
+        return False
+    return date_str < datetime.now().strftime('%Y-%m-%d')
+
+
+class HoldingsStore:
+    """(ETF idx, pdfDate) 단위 보유종목 저장소."""
+
+    def __init__(self, path=STORE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        # 여러 ETF를 동시에 저장할 때 읽기/쓰기가 서로 막지 않도록 WAL 모드를 사용합니다.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # 이전 버전에서 만든 DB에는 검증자(ETag/Last-Modified) 열이 없으므로 추가합니다.
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(days)")}
+        for col in ('etag', 'last_modified'):
+            if col not in existing:
+                self._conn.execute(f"ALTER TABLE days ADD COLUMN {col} TEXT")
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def cached_dates(self, idx, date_strs):
+        """date_strs 중 저장소에 있고 더 이상 바뀌지 않는 날짜의 집합을 반환합니다."""
+        if not date_strs:
+            return set()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT pdf_date, fetched_at FROM days WHERE idx = ? AND pdf_date BETWEEN ? AND ?",
+                (idx, min(date_strs), max(date_strs)),
+            ).fetchall()
+        wanted = set(date_strs)
+        return {d for d, fetched_at in rows if d in wanted and is_final(d, fetched_at)}
+
+    def validators(self, idx, date_strs):
+        """date_strs 중 저장된 날짜의 {날짜: (ETag, Last-Modified)}. 조건부 요청 헤더로 사용합니다."""
+        if not date_strs:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT pdf_date, etag, last_modified FROM days WHERE idx = ? AND pdf_date BETWEEN ? AND ?",
+                (idx, min(date_strs), max(date_strs)),
+            ).fetchall()
+        wanted = set(date_strs)
+        return {d: (etag, last_modified) for d, etag, last_modified in rows if d in wanted}
+
+    def touch_days(self, idx, date_strs):
+        """조건부 요청으로 바뀌지 않았음을 확인한 날짜의 확인 시각만 갱신합니다."""
+        fetched_at = datetime.now().isoformat(timespec='seconds')
+        with self._lock, self._conn:
+            self._conn.executemany("UPDATE days SET fetched_at = ? WHERE idx = ? AND pdf_date = ?",
+                                   [(fetched_at, idx, d) for d in date_strs])
+
+    def stored_days(self, idx=None):
+        """저장된 (idx, pdf_date) 목록을 날짜 순으로 반환합니다. idx를 주면 해당 ETF만."""
+        query = "SELECT idx, pdf_date FROM days"
+        params = ()
+        if idx is not None:
+            query += " WHERE idx = ?"
+            params = (idx,)
+        with self._lock:
+            return self._conn.execute(query + " ORDER BY pdf_date, idx", params).fetchall()
+
+    def fetch_times(self, idx):
+        """ETF의 저장된 날짜별 받은(확인한) 시각 {pdf_date: fetched_at}. 저장본이 바뀌었는지 비교할 때 씁니다."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT pdf_date, fetched_at FROM days WHERE idx = ?", (idx,)).fetchall())
+
+    def load(self, idx, date_strs):
+        """저장된 날짜들의 보유종목을 날짜/원래 행 순서대로 하나의 DataFrame으로 읽습니다."""
+        date_strs = sorted(date_strs)
+        if not date_strs:
+            return pd.DataFrame()
+        with self._lock:
+            df = pd.read_sql_query(
+                "SELECT pdf_date, name, code, quantity, value, weight FROM holdings "
+                "WHERE idx = ? AND pdf_date BETWEEN ? AND ? ORDER BY pdf_date, row_no",
+                self._conn, params=(idx, date_strs[0], date_strs[-1]),
+            )
+        df = df[df['pdf_date'].isin(set(date_strs))]
+        df = df.rename(columns={v: k for k, v in HOLDING_COLUMNS.items()})
+        df['날짜'] = pd.to_datetime(df.pop('pdf_date'))
+        return df.dropna(axis=1, how='all').reset_index(drop=True)
+
+    def save_day(self, idx, date_str, df):
+        """하루치 보유종목을 저장합니다. 같은 날짜가 있으면 덮어씁니다."""
+        self.save_days(idx, {date_str: df})
+
+    def save_days(self, idx, frames):
+        """{날짜: 보유종목 DataFrame}을 한 트랜잭션으로 저장합니다. 같은 날짜가 있으면 덮어씁니다.
+
+        DataFrame.attrs의 'etag', 'last_modified'(fetch_day가 응답 헤더에서 채움)도 함께 저장합니다.
+        """
+        rows = []
+        for date_str, df in frames.items():
+            rows.extend(self._to_rows(idx, date_str, df))
+        fetched_at = datetime.now().isoformat(timespec='seconds')
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM holdings WHERE idx = ? AND pdf_date = ?", [(idx, d) for d in frames])
+            self._conn.executemany("INSERT INTO holdings VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO days VALUES (?, ?, ?, ?, ?)",
+                [(idx, d, fetched_at, df.attrs.get('etag'), df.attrs.get('last_modified')) for d, df in frames.items()])
+
+    @staticmethod
+    def _to_rows(idx, date_str, df):
+        n = len(df)
+
+        def text(col):
+            if col not in df.columns:
+                return [None] * n
+            return [None if v != v else str(v) for v in df[col].tolist()]
+
+        def number(col, cast):
+            if col not in df.columns:
+                return [None] * n
+            values = df[col]
+            if not pd.api.types.is_numeric_dtype(values):
+                values = pd.to_numeric(values.astype(str).str.replace(',', ''), errors='coerce')
+            return [None if v != v else cast(v) for v in values.tolist()]
+
+        return list(zip(
+            [idx] * n, [date_str] * n, range(n),
+            text('종목명'), text('종목코드'), text('수량'),
+            number('평가금액(원)', lambda v: int(round(v))), number('비중(%)', float),
+        ))
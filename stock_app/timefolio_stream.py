@@ -0,0 +1,161 @@
+"""Timefolio 스트리밍 집계와 실시간 그래프
+
+iter_holdings가 하루치씩 내보내는 보유종목으로 그래프에 필요한 집계만 갱신합니다.
+원본 페이지/행(종목코드, 수량 등)은 보관하지 않고 날짜별 총 평가금액과 종목별 비중만 남깁니다.
+비중은 끝난 뒤 종목 변동 테이블(모든 날의 비중이 필요)을 만들기 위해 날마다 보관하지만, 종목 번호(int32)와
+비중(float32) 배열로 두어 보유 행 하나에 8바이트만 씁니다. (날짜 수 x 보유 종목 수에 비례)
+LiveCharts는 수집 중에 선 데이터만 바꿔 그래프를 다시 그립니다. (DecimatedChart로 화면 해상도만큼만 그림)
+"""
+import time
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from timefolio_plot import DecimatedChart
+
+# 실시간 그래프를 다시 그리는 최소 간격 (초)
+REFRESH_INTERVAL = 0.5
+
+
+class StreamingAggregates:
+    """하루치씩 들어오는 보유종목으로 갱신하는 그래프용 집계.
+
+    - total_value: 날짜 -> 총 평가금액(원)
+    - 날짜 -> (종목 번호 배열, 비중 배열)  종목명은 번호로 한 번만 보관 (_codes / _names)
+    - last_day / last_holdings: 지금까지 받은 가장 최근 날짜와 그날의 {종목명: 비중}
+    날짜는 순서 없이 들어와도 됩니다. (저장소에 있는 날 먼저, 새로 받는 날은 도착 순)
+    그래프에 그리는 종목의 일별 비중은 처음 요청할 때 만들고 이후 들어오는 날만 더합니다.
+    """
+
+    def __init__(self):
+        self.total_value = {}
+        self.last_day = None
+        self.last_holdings = {}
+        self.rows = 0
+        self._codes = {}
+        self._names = []
+        self._day_weights = {}
+        self._series = {}  # 종목명 -> {날짜: 비중}  (weight_series로 요청한 종목만)
+
+    @property
+    def days(self):
+        return len(self.total_value)
+
+    def update(self, day, df):
+        day = pd.Timestamp(day)
+        holdings = dict(zip(df['종목명'].astype(str).tolist(), df['비중(%)'].astype(float).tolist()))
+        self.total_value[day] = int(df['평가금액(원)'].sum())
+        codes = np.fromiter((self._code(name) for name in holdings), dtype=np.int32, count=len(holdings))
+        self._day_weights[day] = (codes, np.fromiter(holdings.values(), dtype=np.float32, count=len(holdings)))
+        for name, series in self._series.items():
+            if name in holdings:
+                series[day] = holdings[name]
+            else:
+                series.pop(day, None)
+        if self.last_day is None or day >= self.last_day:
+            self.last_day = day
+            self.last_holdings = holdings
+        self.rows += len(df)
+
+    def _code(self, name):
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self._names)
+            self._names.append(name)
+        return code
+
+    def total_series(self):
+        """날짜 순 총 평가금액 (십억원)."""
+        return pd.Series(self.total_value, dtype=float).sort_index() / 1_000_000_000
+
+    def top_names(self, n):
+        """가장 최근 날짜 기준 비중 상위 n개 종목명."""
+        return sorted(self.last_holdings, key=self.last_holdings.get, reverse=True)[:n]
+
+    def weight_series(self, name):
+        if name not in self._series:
+            code = self._codes.get(name)
+            series = {}
+            if code is not None:
+                for day, (codes, weights) in self._day_weights.items():
+                    hit = np.flatnonzero(codes == code)
+                    if hit.size:
+                        series[day] = float(weights[hit[0]])
+            self._series[name] = series
+        return pd.Series(self._series[name], dtype=float).sort_index()
+
+    def to_frame(self):
+        """날짜/종목명/비중(%) long-format 프레임. (종목 변동 테이블, 파이 그래프용)"""
+        days = sorted(self._day_weights)
+        if not days:
+            return pd.DataFrame({'날짜': pd.Series(dtype='datetime64[ns]'),
+                                 '종목명': pd.Categorical([], categories=self._names),
+                                 '비중(%)': pd.Series(dtype='float32')})
+        codes = np.concatenate([self._day_weights[d][0] for d in days])
+        weights = np.concatenate([self._day_weights[d][1] for d in days])
+        counts = [len(self._day_weights[d][0]) for d in days]
+        return pd.DataFrame({
+            '날짜': pd.DatetimeIndex(days).repeat(counts),
+            '종목명': pd.Categorical.from_codes(codes, categories=self._names),
+            '비중(%)': weights,
+        })
+
+
+class LiveCharts:
+    """수집 중에 갱신되는 총 평가금액/상위 종목 비중 그래프. 선(Line2D)은 만들어 둔 것을 재사용합니다.
+
+    figure를 주면 (Tk 창에 넣은 FigureCanvasTkAgg 등) 그 Figure에 그리고, 없으면 pyplot 창을 새로 만듭니다.
+    """
+
+    def __init__(self, aggregates, top_n, title, refresh_interval=REFRESH_INTERVAL, figure=None):
+        self.aggregates = aggregates
+        self.top_n = top_n
+        self.title = title
+        self.refresh_interval = refresh_interval
+        self._last_refresh = 0.0
+        # 다른 GUI 이벤트 루프에 넣은 Figure는 그 루프가 그리므로 여기서 이벤트를 처리하지 않습니다.
+        self._own_window = figure is None
+        if figure is None:
+            self.fig, (ax_total, ax_top) = plt.subplots(2, 1, figsize=(12, 10))
+        else:
+            self.fig = figure
+            ax_total, ax_top = figure.subplots(2, 1)
+        for ax in (ax_total, ax_top):
+            ax.grid(True)
+        ax_total.set_title('총 평가금액 변화 추이', fontsize=14)
+        ax_total.set_ylabel('평가금액 (십억원)', fontsize=12)
+        ax_top.set_title(f'보유 비중 상위 {top_n}개 종목 비중 변화', fontsize=14)
+        ax_top.set_ylabel('비중 (%)', fontsize=12)
+        self.total_chart = DecimatedChart(ax_total)
+        self.top_chart = DecimatedChart(ax_top)
+        self._colors = plt.get_cmap('tab20').colors
+        self.fig.tight_layout(rect=(0, 0, 0.85, 0.96))
+
+    def refresh(self, force=False):
+        """마지막으로 그린 뒤 refresh_interval초가 지났으면(또는 force) 선 데이터를 바꾸고 다시 그립니다."""
+        now = time.monotonic()
+        if not force and now - self._last_refresh < self.refresh_interval:
+            return
+        self._last_refresh = now
+        agg = self.aggregates
+
+        total = agg.total_series()
+        self.total_chart.set_series('총 평가금액', total.index, total.to_numpy(), marker='.')
+
+        top = agg.top_names(self.top_n)
+        self.top_chart.retain(top)
+        for rank, name in enumerate(top):
+            series = agg.weight_series(name)
+            self.top_chart.set_series(name, series.index, series.to_numpy(), marker='.', label=name,
+                                      color=self._colors[rank % len(self._colors)], zorder=len(top) - rank)
+
+        self.total_chart.autoscale()
+        self.top_chart.autoscale()
+        if top:
+            self.top_chart.legend(top, title='종목명')
+        last = f", 최근 {agg.last_day:%Y-%m-%d}" if agg.last_day is not None else ""
+        self.fig.suptitle(f"{self.title} — {agg.days}일 수집{last}", fontsize=16)
+        self.fig.canvas.draw_idle()
+        if self._own_window:
+            self.fig.canvas.flush_events()
@@ -0,0 +1,153 @@
+"""DataFrame 기반 가상화 Treeview
+
+ttk.Treeview에 모든 행을 넣고 헤더를 누를 때마다 셀 문자열을 다시 읽어 정렬하면
+행이 수천 개(여러 ETF 이벤트 로그 등)일 때 창이 멈춥니다.
+VirtualTreeview는 타입이 있는 DataFrame을 그대로 데이터로 들고, 화면에 보이는 행 수만큼의
+Treeview 항목만 만들어 스크롤 위치에 맞춰 값만 바꿔 끼웁니다.
+정렬은 원래 타입(숫자/날짜/문자열) 기준으로 pandas에서 한 번에 하고, 행 순서(인덱스 배열)만 바꿉니다.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_ROW_HEIGHT = 20
+HEADER_HEIGHT = 24
+
+
+def sort_order(series, reverse=False):
+    """series의 정렬 순서(행 위치 배열)를 반환합니다. 숫자/날짜는 값으로, 카테고리는 이름(문자열)으로 정렬합니다.
+
+    같은 값끼리는 원래 순서를 유지하고(stable), 빈 값은 항상 맨 뒤로 보냅니다.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # 카테고리 이름 순위를 코드에 매겨 정수로 정렬 (행마다 문자열로 바꾸지 않음)
+        names = series.cat.categories.astype(str).to_numpy()
+        rank = np.empty(len(names), dtype=np.float64)
+        rank[np.argsort(names, kind='stable')] = np.arange(len(names))
+        codes = series.cat.codes.to_numpy()
+        series = pd.Series(np.where(codes >= 0, rank[codes], np.nan))
+    elif series.dtype == object:
+        series = series.astype(str).where(series.notna())
+    series = series.reset_index(drop=True)
+    return series.sort_values(ascending=not reverse, kind='stable', na_position='last').index.to_numpy()
+
+
+def format_cell(value, fmt):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ''
+    return fmt.format(value) if fmt else str(value)
+
+
+class VirtualTreeview(ttk.Frame):
+    """보이는 행만 그리는 정렬 가능한 표.
+
+    df: 표시할 DataFrame (열 순서대로 표시). formats: {열 이름: 표시 형식 문자열} (예: '{:.2f}%').
+    """
+
+    def __init__(self, parent, df, formats=None, column_width=150):
+        super().__init__(parent, padding="10")
+        self._columns = list(df.columns)
+        self._formats = [(formats or {}).get(c) for c in self._columns]
+        self._sorted_by = None  # (열 이름, 내림차순 여부)
+        self._load(df)
+        self._offset = 0
+        self._items = []
+
+        self._row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or DEFAULT_ROW_HEIGHT)
+        self.tree = ttk.Treeview(self, columns=self._columns, show='headings', selectmode='browse')
+        for col in self._columns:
+            self.tree.heading(col, text=col, command=lambda _col=col: self.sort_by(_col))
+            self.tree.column(col, width=column_width, anchor='center')
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        self.scrollbar.grid(row=0, column=1, sticky='ns')
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll(-1 if e.delta > 0 else 1, 'units', step=3))
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-1, 'units', step=3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(1, 'units', step=3))
+        self.tree.bind('<Prior>', lambda e: self.scroll(-1, 'pages'))
+        self.tree.bind('<Next>', lambda e: self.scroll(1, 'pages'))
+        self.tree.bind('<Home>', lambda e: self.scroll_to(0))
+        self.tree.bind('<End>', lambda e: self.scroll_to(len(self._order)))
+        self._resize_items(10)
+
+    # --- 데이터 ---
+    def __len__(self):
+        return len(self._order)
+
+    def _load(self, df):
+        self._df = df.reset_index(drop=True)
+        self._values = [self._df[c].tolist() for c in self._columns]  # 날짜는 Timestamp로 꺼내 형식 지정
+        if self._sorted_by is not None:
+            self._order = sort_order(self._df[self._sorted_by[0]], self._sorted_by[1])
+        else:
+            self._order = np.arange(len(self._df))
+
+    def set_frame(self, df):
+        """같은 열 구성의 새 데이터로 바꿉니다. 정렬 기준과 스크롤 위치는 유지합니다. (수집 중 갱신용)"""
+        self._load(df[self._columns])
+        self.scroll_to(self._offset)
+
+    def row(self, position):
+        """현재 정렬 순서 기준 position번째 행의 원래 값(Series)."""
+        return self._df.iloc[self._order[position]]
+
+    def sort_by(self, col, reverse=None):
+        """col 기준으로 정렬합니다. reverse를 생략하면 같은 열을 다시 누를 때마다 오름/내림차순을 바꿉니다."""
+        if reverse is None:
+            reverse = self._sorted_by == (col, False)
+        self._order = sort_order(self._df[col], reverse)
+        if self._sorted_by is not None:
+            self.tree.heading(self._sorted_by[0], text=self._sorted_by[0])
+        self.tree.heading(col, text=f"{col} {'▼' if reverse else '▲'}")
+        self._sorted_by = (col, reverse)
+        self.scroll_to(0)
+
+    # --- 스크롤/그리기 ---
+    def scroll(self, amount, what='units', step=1):
+        page = max(len(self._items) - 1, 1)
+        self.scroll_to(self._offset + int(amount) * (page if what == 'pages' else step))
+
+    def scroll_to(self, offset):
+        last = max(len(self._order) - len(self._items), 0)
+        self._offset = min(max(int(offset), 0), last)
+        self._refresh()
+
+    def _on_scrollbar(self, action, amount, what=None):
+        if action == 'moveto':
+            self.scroll_to(round(float(amount) * len(self._order)))
+        else:
+            self.scroll(amount, what)
+
+    def _on_resize(self, event):
+        visible = max((event.height - HEADER_HEIGHT) // self._row_height, 1)
+        if visible != len(self._items):
+            self._resize_items(visible)
+
+    def _resize_items(self, count):
+        while len(self._items) < count:
+            self._items.append(self.tree.insert('', 'end'))
+        if len(self._items) > count:
+            self.tree.delete(*self._items[count:])
+            del self._items[count:]
+        self.scroll_to(self._offset)
+
+    def _refresh(self):
+        total = len(self._order)
+        for i, item in enumerate(self._items):
+            pos = self._offset + i
+            if pos < total:
+                r = self._order[pos]
+                values = [format_cell(v[r], f) for v, f in zip(self._values, self._formats)]
+            else:
+                values = [''] * len(self._columns)
+            self.tree.item(item, values=values)
+        if total:
+            self.scrollbar.set(self._offset / total, min((self._offset + len(self._items)) / total, 1.0))
+        else:
+            self.scrollbar.set(0.0, 1.0)
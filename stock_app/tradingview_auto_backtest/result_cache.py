@@ -0,0 +1,97 @@
+"""심볼별 백테스트 결과 캐시 (SQLite)
+
+같은 전략/같은 입력값/같은 속성으로 같은 마지막 봉까지 다시 돌리면 결과가 같으므로,
+(심볼, 전략 지문, 마지막 봉 날짜) 단위로 수집 결과를 저장해 두고 다음 실행에서 그대로 씁니다.
+관심목록 일부만 바뀐 경우 바뀐 심볼만 탭을 돌며 수집하면 됩니다.
+
+전략 지문은 차트 범례의 전략 이름/입력값 텍스트, 전략 리포트 '속성' 탭의 텍스트(입력값, 초기 자본/수수료 등 속성, 거래 범위),
+수집 설정(수익률 기간)을 합쳐 만든 해시입니다. 마지막 봉 날짜는 '속성' 탭의 거래 범위에서 읽습니다.
+(strategy_fingerprint, last_bar_date 참고. 둘 중 하나라도 읽지 못하면 캐시를 쓰지 않음)
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+# 캐시 폴더는 TV_CACHE_DIR 환경변수로 바꿀 수 있습니다.
+CACHE_DIR = os.environ.get('TV_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.tv_cache'))
+CACHE_PATH = os.path.join(CACHE_DIR, 'results.sqlite')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    symbol      TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    last_bar_date TEXT NOT NULL,
+    saved_at    TEXT NOT NULL,
+    data        TEXT NOT NULL,
+    PRIMARY KEY (symbol, fingerprint, last_bar_date)
+);
+"""
+
+# 리포트에 표시되는 날짜 (예: 2024년 6월 28일)
+_DATE_RE = re.compile(r'(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일')
+
+
+def strategy_fingerprint(strategy_text, properties_text, target_periods):
+    """전략 이름/입력값 텍스트, '속성' 탭 텍스트, 수익률 기간으로 만든 지문. 텍스트가 비어 있으면 None (캐시 사용 안 함)."""
+    if not strategy_text or not strategy_text.strip() or not properties_text or not properties_text.strip():
+        return None
+    source = json.dumps([strategy_text.strip(), properties_text.strip(), list(target_periods)], ensure_ascii=False)
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+
+
+def last_bar_date(properties_text):
+    """'속성' 탭의 거래 범위에 나온 날짜 중 가장 늦은 날짜 ('YYYY-MM-DD'). 날짜가 없으면 None."""
+    dates = [f"{y}-{int(m):02d}-{int(d):02d}" for y, m, d in _DATE_RE.findall(properties_text or '')]
+    return max(dates) if dates else None
+
+
+class ResultCache:
+    """(심볼, 전략 지문, 마지막 봉 날짜) -> 수집 결과. 여러 브라우저 세션이 동시에 써도 됩니다."""
+
+    def __init__(self, path=CACHE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # 이전 버전 캐시는 기준일(입력한 날짜)로 저장해 키가 다르므로 지우고 새로 만듭니다.
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(results)")}
+        if 'ref_date' in columns:
+            self._conn.execute("DROP TABLE results")
+        self._conn.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, symbol, fingerprint, last_bar_date):
+        """저장된 결과를 반환합니다. 없거나 지문/날짜가 None이면 None. (적중/미스 횟수를 셈)"""
+        row = None
+        if fingerprint is not None and last_bar_date is not None:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT data FROM results WHERE symbol = ? AND fingerprint = ? AND last_bar_date = ?",
+                    (symbol, fingerprint, last_bar_date)).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return json.loads(row[0]) if row else None
+
+    def put(self, symbol, fingerprint, last_bar_date, data):
+        if fingerprint is None or last_bar_date is None:
+            return
+        saved_at = datetime.now().isoformat(timespec='seconds')
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                               (symbol, fingerprint, last_bar_date, saved_at, json.dumps(data, ensure_ascii=False)))
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,86 @@
+"""수집 결과 저널 (브라우저가 죽거나 프로그램이 꺼져도 끝낸 심볼은 잃지 않도록)
+
+심볼 하나를 끝낼 때마다 JSONL 파일에 한 줄을 덧붙이고 바로 fsync합니다. (엑셀은 마지막에 한 번만 저장되므로)
+저널 파일은 엑셀 파일 옆에 관심목록/기준일별로 만들어지고, 같은 관심목록/기준일로 다시 실행하면
+저널에 있는 심볼은 다시 수집하지 않고 최종 엑셀은 저널 내용으로 다시 만듭니다.
+
+한 줄 형식: {"position": 관심목록 위치, "symbol": 심볼, "saved_at": 저장 시각, "data": 수집 결과}
+"""
+import json
+import os
+import threading
+from datetime import datetime
+
+
+def journal_path(output_path):
+    """엑셀 파일 경로 옆의 저널 경로. (예: 관심목록_2024-01-01.xlsx -> 관심목록_2024-01-01.journal.jsonl)"""
+    return os.path.splitext(output_path)[0] + '.journal.jsonl'
+
+
+class ScrapeJournal:
+    """심볼별 수집 결과를 덧붙여 쓰는 저널. 여러 브라우저 세션이 동시에 기록해도 됩니다."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.records = {}  # 심볼 -> 마지막 기록
+        if os.path.exists(path):
+            self._load()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def _load(self):
+        with open(self.path, 'rb') as f:
+            content = f.read()
+        for line in content.decode('utf-8', errors='replace').splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # 기록 도중 꺼져서 잘린 마지막 줄
+            self.records[record['symbol']] = record
+        if content and not content.endswith(b'\n'):  # 잘린 줄 뒤에 이어 쓰지 않도록 줄을 끝냄
+            with open(self.path, 'ab') as f:
+                f.write(b'\n')
+
+    def __contains__(self, symbol):
+        return symbol in self.records
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, symbol):
+        return self.records[symbol]['data']
+
+    def append(self, position, symbol, data):
+        """심볼 하나의 결과를 기록하고 디스크에 내려쓸 때까지 기다립니다."""
+        record = {'position': position, 'symbol': symbol,
+                  'saved_at': datetime.now().isoformat(timespec='seconds'), 'data': data}
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.records[symbol] = record
+
+    def move(self, symbol, position):
+        """관심목록 순서가 바뀐 경우 이번 실행에서 본 위치로 정렬하도록 위치만 갱신합니다. (파일은 그대로)"""
+        with self._lock:
+            self.records[symbol] = dict(self.records[symbol], position=position)
+
+    def ordered_data(self):
+        """저널의 모든 결과를 관심목록 위치 순으로 반환합니다. (최종 엑셀 저장용)"""
+        with self._lock:
+            records = sorted(self.records.values(), key=lambda r: r['position'])
+        return [r['data'] for r in records]
+
+    def reset(self):
+        """이전 기록을 쓰지 않고 처음부터 수집할 때: 기존 저널은 시각을 붙여 보관하고 빈 저널로 시작합니다."""
+        with self._lock:
+            self._file.close()
+            if os.path.exists(self.path) and os.path.getsize(self.path):
+                os.replace(self.path, f"{self.path}.{datetime.now():%Y%m%d_%H%M%S}.bak")
+            self.records = {}
+            self._file = open(self.path, 'a', encoding='utf-8')
+
+    def close(self):
+        with self._lock:
+            self._file.close()
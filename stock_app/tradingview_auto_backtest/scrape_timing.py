@@ -0,0 +1,137 @@
+"""심볼별 단계 시간 측정 (어느 단계에서 시간이 가는지 보기 위한 계측)
+
+심볼 하나를 수집하는 동안 단계(관심목록 이동, 리포트 렌더 대기, 탭 클릭/읽기, 종목 정보 등)마다 걸린 시간을 재고,
+실행이 끝나면 엑셀 파일 옆에 CSV로 내보냅니다. (한 줄 = 심볼 하나, 단계마다 열 하나, 단위 초)
+실행 중에는 최근 처리 속도(심볼/분), 남은 시간, 단계별 p50/p95를 분석 현황 창에 보여 줄 수 있도록 요약합니다.
+
+사용 예:
+    timing = telemetry.start(session_id, position)
+    with timing.step('관심목록 이동'):
+        ...
+    telemetry.finish(timing, '수집')
+"""
+import csv
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+# 처리 속도(심볼/분)를 계산할 최근 완료 심볼 수
+RATE_WINDOW = 20
+
+
+def timing_path(output_path):
+    """엑셀 파일 경로 옆의 시간 측정 CSV 경로. (예: 관심목록_2024-01-01.xlsx -> 관심목록_2024-01-01.timing.csv)"""
+    return os.path.splitext(output_path)[0] + '.timing.csv'
+
+
+def no_timing(name):
+    """시간을 재지 않을 때 step 자리에 넘기는 기본값."""
+    return nullcontext()
+
+
+def percentile(values, q):
+    """정렬된 values의 q 백분위수 (nearest-rank). 값이 없으면 None."""
+    if not values:
+        return None
+    rank = max(1, math.ceil(len(values) * q / 100))
+    return values[rank - 1]
+
+
+class SymbolTiming:
+    """심볼 하나의 단계별 소요 시간. 같은 단계를 여러 번 지나면 시간을 더합니다."""
+
+    def __init__(self, session_id, position):
+        self.session_id = session_id
+        self.position = position
+        self.symbol = ''
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self.steps = {}
+        self.total = None
+        self.outcome = None
+
+    @contextmanager
+    def step(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps[name] = self.steps.get(name, 0.0) + time.perf_counter() - start
+
+
+class ScrapeTelemetry:
+    """한 번의 실행 동안 모든 브라우저 세션의 SymbolTiming을 모읍니다. 여러 세션이 동시에 기록해도 됩니다."""
+
+    def __init__(self, total):
+        self.total = total
+        self.records = []
+        self.step_names = []  # 처음 나온 순서 (CSV 열 순서)
+        self._finished_at = deque(maxlen=RATE_WINDOW)
+        self._lock = threading.Lock()
+
+    def start(self, session_id, position):
+        return SymbolTiming(session_id, position)
+
+    def finish(self, timing, outcome):
+        """심볼 하나를 끝냈을 때 호출합니다. outcome: 수집/실패/캐시/저널/오류"""
+        timing.total = time.perf_counter() - timing._start
+        timing.outcome = outcome
+        with self._lock:
+            self.records.append(timing)
+            self._finished_at.append(time.perf_counter())
+            for name in timing.steps:
+                if name not in self.step_names:
+                    self.step_names.append(name)
+
+    def rate_per_minute(self):
+        """최근 RATE_WINDOW개 심볼 기준 처리 속도 (심볼/분). 두 개 이상 끝나기 전에는 None."""
+        with self._lock:
+            if len(self._finished_at) < 2:
+                return None
+            span = self._finished_at[-1] - self._finished_at[0]
+            count = len(self._finished_at) - 1
+        return count / span * 60 if span > 0 else None
+
+    def eta_seconds(self):
+        """남은 심볼을 최근 처리 속도로 끝낼 때까지의 예상 시간 (초)."""
+        rate = self.rate_per_minute()
+        with self._lock:
+            remaining = self.total - len(self.records)
+        if rate is None or remaining < 0:
+            return None
+        return remaining / rate * 60
+
+    def step_summary(self):
+        """[(단계 이름, 횟수, p50, p95)] — 실제로 수집한 심볼만 대상, p95가 큰 순."""
+        with self._lock:
+            samples = {}
+            for timing in self.records:
+                if timing.outcome != '수집':
+                    continue
+                for name, seconds in timing.steps.items():
+                    samples.setdefault(name, []).append(seconds)
+        summary = []
+        for name, values in samples.items():
+            values.sort()
+            summary.append((name, len(values), percentile(values, 50), percentile(values, 95)))
+        return sorted(summary, key=lambda s: s[3], reverse=True)
+
+    def export_csv(self, path):
+        """심볼별 단계 시간을 CSV로 저장합니다. (엑셀에서 바로 열리도록 utf-8-sig) 기록이 없으면 False."""
+        with self._lock:
+            records = sorted(self.records, key=lambda t: t.position)
+            step_names = list(self.step_names)
+        if not records:
+            return False
+        with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(['위치', '심볼', '브라우저', '결과', '시작 시각', '합계(초)'] + step_names)
+            for t in records:
+                writer.writerow([t.position + 1, t.symbol, t.session_id, t.outcome,
+                                 t.started_at.isoformat(timespec='seconds'), f"{t.total:.3f}"]
+                                + [f"{t.steps[name]:.3f}" if name in t.steps else '' for name in step_names])
+        return True
@@ -1,19 +1,35 @@
 import tkinter as tk
 from tkinter import messagebox, scrolledtext, ttk
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import os
 import threading
 import time
-import pandas as pd
 import traceback
 
+from scrape_journal import ScrapeJournal, journal_path
+from result_cache import ResultCache, last_bar_date, strategy_fingerprint
+from scrape_timing import ScrapeTelemetry, no_timing, timing_path
+
 # --- Selenium 관련 라이브러리 ---
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
+# Selenium/webdriver_manager/pandas는 불러오는 데 0.5초 이상 걸리므로 창을 먼저 띄우고 분석을 시작할 때 불러옵니다.
+# (load_selenium 참고. 아래 이름들은 load_selenium()이 채움)
+webdriver = By = Keys = WebDriverWait = EC = ChromeDriverManager = None
+TimeoutException = NoSuchElementException = StaleElementReferenceException = WebDriverException = None
+
+def load_selenium():
+    """Selenium 관련 모듈을 처음 한 번 불러와 모듈 전역 이름에 채웁니다."""
+    global webdriver, By, Keys, WebDriverWait, EC, ChromeDriverManager
+    global TimeoutException, NoSuchElementException, StaleElementReferenceException, WebDriverException
+    if webdriver is not None: return
+    from selenium import webdriver as _webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException, WebDriverException
+    from webdriver_manager.chrome import ChromeDriverManager
+    webdriver = _webdriver  # 다른 이름이 모두 채워진 뒤 마지막에 설정 (불러온 여부 표시)
 
 # ==================================================================================
 # [SECTION 1] 핵심 시스템 (Core System)
@@ -109,6 +125,142 @@ def get_strategy_data(driver, wait, previous_profit_pct):
 # ==================================================================================
 # [SECTION 2] 확장 기능 (Extensions)
 # ==================================================================================
+# --- ⬇️ JS 일괄 추출 (탭마다 execute_script 한 번) ⬇️ ---
+# 위 함수들은 지표마다 wait.until + XPath 검색으로 WebDriver 왕복을 한 번씩 합니다. (심볼당 15회 이상)
+# 아래 함수들은 같은 XPath들을 브라우저 안에서 한꺼번에 평가해 탭(패널)마다 왕복 한 번으로 모든 값을 읽습니다.
+# (탭 클릭도 스크립트 한 번으로 처리해 탭당 왕복은 클릭 1회 + 읽기 1회)
+# fields: [(data 키, XPath, 조건)]  조건 'visible'/'present'는 모두 만족해야 결과를 돌려주고, 'optional'은 있으면 읽음
+EXTRACT_TEXTS_JS = """
+const result = {};
+for (const [key, xpath, mode] of arguments[0]) {
+    const el = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    const visible = el !== null && el.getClientRects().length > 0;
+    if (mode === 'visible' && !visible) return null;
+    if (mode === 'present' && el === null) return null;
+    if (el !== null) result[key] = visible ? el.innerText.trim() : '';
+}
+return result;
+"""
+
+# 탭 버튼이 보이고 눌릴 수 있으면 클릭하고 true를 돌려줍니다. (element_to_be_clickable + click의 왕복 4회를 1회로)
+CLICK_JS = """
+const el = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (el === null || el.getClientRects().length === 0 || el.disabled) return false;
+el.click();
+return true;
+"""
+
+# 일괄 추출 시 값이 그려졌는지 다시 확인하는 간격 (초). 왕복이 한 번뿐이라 기본값(0.5초)보다 자주 확인합니다.
+EXTRACT_POLL_INTERVAL = 0.1
+
+STRATEGY_PANELS = [
+    ('성과', PERFORMANCE_TAB_XPATH, [('buy_hold_return', BUY_HOLD_RETURN_ANCHOR_XPATH), ('net_profit', NET_PROFIT_ANCHOR_XPATH)]),
+    ('거래 분석', TRADE_ANALYSIS_TAB_XPATH, [('win_rate_pct', WIN_RATE_ANCHOR_XPATH), ('max_loss_trade', MAX_LOSS_ANCHOR_XPATH)]),
+    ('위험/성과 비율', RISK_RATIOS_TAB_XPATH, [('profit_factor', PROFIT_FACTOR_ANCHOR_XPATH),
+                                         ('sharpe_ratio', SHARPE_RATIO_ANCHOR_XPATH), ('sortino_ratio', SORTINO_RATIO_ANCHOR_XPATH)]),
+]
+
+def extract_texts(driver, wait, fields, accept=None):
+    """fields의 값을 execute_script 한 번으로 읽습니다. 조건(과 accept)을 만족할 때까지 wait 간격으로 다시 읽습니다."""
+    def extract(d):
+        texts = d.execute_script(EXTRACT_TEXTS_JS, fields)
+        if texts is None or (accept is not None and not accept(texts)): return False
+        return texts
+    return wait.until(extract)
+
+def click_tab(driver, wait, tab_xpath):
+    wait.until(lambda d: d.execute_script(CLICK_JS, tab_xpath))
+
+def get_strategy_data_js(driver, wait, previous_profit_pct, step=no_timing):
+    """get_strategy_data와 같은 data 키를 탭마다 execute_script 한 번으로 채웁니다.
+
+    previous_profit_pct가 None이면 (리포트가 새로 그려진 것을 이미 확인한 경우) 총손익률을 이전 값과 비교하지 않습니다.
+    """
+    data = {}
+    try:
+        with step('오버뷰'):
+            click_tab(driver, wait, OVERVIEW_TAB_XPATH)
+            data.update(extract_texts(driver, wait, [('profit_pct', PROFIT_PCT_XPATH, 'visible')],
+                                      accept=lambda t: t['profit_pct'] != previous_profit_pct))
+
+        for name, tab_xpath, metrics in STRATEGY_PANELS:
+            with step(name):
+                try:
+                    click_tab(driver, wait, tab_xpath)
+                    data.update(extract_texts(driver, wait, [(key, xpath, 'visible') for key, xpath in metrics]))
+                except TimeoutException:
+                    data.update({key: 'Scrape Fail' for key, _ in metrics})
+
+        with step('거래목록'):
+            click_tab(driver, wait, TRADE_LIST_TAB_XPATH)
+            data.update(extract_texts(driver, wait, [('trade_1_entry', TRADE_1_ENTRY_XPATH, 'visible')]))
+
+        with step('오버뷰 복귀'):
+            click_tab(driver, wait, OVERVIEW_TAB_XPATH)
+        return data
+    except:
+        return None
+# --- ⬆️ JS 일괄 추출 ⬆️ ---
+
+# --- ⬇️ 렌더링 감지 (MutationObserver) ⬇️ ---
+# text_to_be_different_from은 XPath를 계속 다시 찾고, 이전 심볼과 값이 같으면(N/A, 거래 없음 등) 시간 초과까지 기다립니다.
+# 대신 심볼 헤더와 전략 리포트에 DOM 관찰자를 설치해 바뀔 때마다 세대 번호를 올리고,
+# 이동 전 번호보다 커졌는지만 확인합니다. (표시된 값과 상관없이 다시 그려지면 바로 감지)
+SYMBOL_ROOT_SELECTOR = "#header-toolbar-symbol-search"
+REPORT_ROOT_SELECTOR = "[class^='reportContainerOld-'], [class*=' reportContainerOld-']"
+
+# 설치(처음 한 번)와 현재 상태 읽기를 함께 합니다. 반환값: {symbol: 세대, report: 세대, quietMs: 리포트가 마지막으로 바뀐 뒤 경과 ms}
+# 페이지 전체가 아니라 심볼 버튼과 리포트 컨테이너만 관찰합니다. 심볼이 바뀔 때 컨테이너가 새로 만들어지면
+# 읽을 때마다 새 요소로 관찰자를 옮기고, 바뀐 것도 한 번 다시 그려진 것으로 셉니다.
+RENDER_OBSERVER_JS = """
+const st = window.__tvRender || (window.__tvRender = {symbol: 0, report: 0, reportAt: 0, nodes: {}, observers: {}});
+const bump = key => { st[key]++; if (key === 'report') st.reportAt = performance.now(); };
+const watch = (key, selector) => {
+    const el = document.querySelector(selector);
+    if (key in st.nodes && el === st.nodes[key]) return;
+    if (st.observers[key]) st.observers[key].disconnect();
+    if (key in st.nodes) bump(key);
+    st.nodes[key] = el;
+    st.observers[key] = null;
+    if (el === null) return;
+    st.observers[key] = new MutationObserver(() => bump(key));
+    st.observers[key].observe(el, {subtree: true, childList: true, characterData: true});
+};
+watch('symbol', arguments[0]);
+watch('report', arguments[1]);
+return {symbol: st.symbol, report: st.report, quietMs: st.reportAt ? performance.now() - st.reportAt : 0};
+"""
+
+# 리포트가 이 시간(ms) 동안 더 바뀌지 않으면 다 그려진 것으로 봅니다.
+REPORT_SETTLE_MS = 300
+# 심볼이 바뀐 뒤 리포트가 다시 그려지기를 기다리는 최대 시간 (초). 넘으면 값 비교 방식으로 넘어갑니다.
+REPORT_RENDER_TIMEOUT = 5
+
+def render_marks(driver):
+    """관찰자를 (없으면) 설치하고 현재 세대 번호를 읽습니다. 스크립트를 실행할 수 없으면 None."""
+    try:
+        return driver.execute_script(RENDER_OBSERVER_JS, SYMBOL_ROOT_SELECTOR, REPORT_ROOT_SELECTOR)
+    except WebDriverException:
+        return None
+
+def symbol_rendered_since(marks):
+    def check(driver):
+        current = render_marks(driver)
+        return current is not None and current['symbol'] > marks['symbol']
+    return check
+
+def wait_report_render(driver, marks, poll=0.1):
+    """marks 이후 리포트가 다시 그려지고 REPORT_SETTLE_MS 동안 조용해지면 True, REPORT_RENDER_TIMEOUT이 지나면 False."""
+    def check(d):
+        current = render_marks(d)
+        return current is not None and current['report'] > marks['report'] and current['quietMs'] >= REPORT_SETTLE_MS
+    try:
+        WebDriverWait(driver, REPORT_RENDER_TIMEOUT, poll_frequency=poll).until(check)
+        return True
+    except TimeoutException:
+        return False
+# --- ⬆️ 렌더링 감지 ⬆️ ---
+
 WATCHLIST_TITLE_XPATH = "//div[contains(@class, 'widgetbar-widget-watchlist')]//span[contains(@class, 'titleRow-')]"
 DETAILS_FULL_NAME_XPATH = "//a[@data-qa-id='details-element description']"
 DETAILS_EXCHANGE_XPATH = "//span[@data-qa-id='details-element exchange']"
@@ -133,12 +285,176 @@ def scrape_symbol_details(driver, wait, target_periods):
     try:
         wait.until(EC.presence_of_element_located((By.XPATH, DETAILS_PERF_CONTAINER_XPATH)))
         for period in target_periods:
-            xpath = f"//div[@data-qa-id='details-element performance']//span[text()='{period}']/preceding-sibling::span"
-            try: details[f'return_{period}'] = driver.find_element(By.XPATH, xpath).text
+            try: details[f'return_{period}'] = driver.find_element(By.XPATH, period_return_xpath(period)).text
             except: pass
     except: pass
     return details
 
+def period_return_xpath(period):
+    return f"//div[@data-qa-id='details-element performance']//span[text()='{period}']/preceding-sibling::span"
+
+def scrape_symbol_details_js(driver, wait, target_periods):
+    """scrape_symbol_details와 같은 값을 execute_script 한 번으로 읽습니다. (시간 초과 시 그때까지 보이는 값만)"""
+    details = {'full_name': 'N/A', 'exchange': 'N/A', 'sector': 'N/A', 'industry': 'N/A'}
+    for p in target_periods: details[f'return_{p}'] = 'N/A'
+
+    fields = [('full_name', DETAILS_FULL_NAME_XPATH, 'visible'), ('exchange', DETAILS_EXCHANGE_XPATH, 'visible'),
+              ('sector', DETAILS_SECTOR_XPATH, 'optional'), ('industry', DETAILS_INDUSTRY_XPATH, 'optional'),
+              ('performance', DETAILS_PERF_CONTAINER_XPATH, 'present')]
+    fields += [(f'return_{p}', period_return_xpath(p), 'optional') for p in target_periods]
+    try:
+        texts = extract_texts(driver, wait, fields)
+    except TimeoutException:
+        texts = driver.execute_script(EXTRACT_TEXTS_JS, [(key, xpath, 'optional') for key, xpath, _ in fields]) or {}
+    texts.pop('performance', None)
+    details.update(texts)
+    return details
+
+# --- ⬇️ 결과 캐시 키 (전략 지문 + 마지막 봉 날짜) ⬇️ ---
+# 차트 범례의 지표/전략 제목 (전략 이름과 입력값이 함께 표시됨). 세션마다 한 번 읽어 전략 지문에 넣습니다.
+STRATEGY_SOURCE_SELECTOR = "[data-name='legend-source-title']"
+# 전략 리포트 '속성' 탭 (거래 범위, 입력값, 초기 자본/수수료 등 속성). 심볼마다 읽어 지문과 마지막 봉 날짜를 만듭니다.
+PROPERTIES_TAB_XPATH = "//button[@data-overflow-tooltip-text='속성']"
+REPORT_CONTAINER_XPATH = "//div[starts-with(@class, 'reportContainerOld-')]"
+
+def read_strategy_text(driver):
+    """차트에 적용된 지표/전략의 이름과 입력값 텍스트. 읽지 못하면 빈 문자열."""
+    try:
+        return driver.execute_script(
+            "return [...document.querySelectorAll(arguments[0])].map(el => el.innerText.trim()).join('\\n');",
+            STRATEGY_SOURCE_SELECTOR) or ""
+    except WebDriverException:
+        return ""
+
+def read_cache_key(driver, wait, strategy_text, target_periods):
+    """'속성' 탭을 열어 (전략 지문, 마지막 봉 날짜)를 만듭니다. 읽지 못하면 None (그 심볼은 캐시를 쓰지 않음).
+
+    리포트가 현재 심볼로 다시 그려진 것을 확인한 뒤에만 호출합니다. (이전 심볼의 속성을 읽지 않도록)
+    """
+    try:
+        click_tab(driver, wait, PROPERTIES_TAB_XPATH)
+        texts = extract_texts(driver, wait, [('properties', REPORT_CONTAINER_XPATH, 'visible')],
+                              accept=lambda t: last_bar_date(t['properties']) is not None)
+    except (TimeoutException, WebDriverException):
+        return None
+    fingerprint = strategy_fingerprint(strategy_text, texts['properties'], target_periods)
+    if fingerprint is None:
+        return None
+    return fingerprint, last_bar_date(texts['properties'])
+
+# 기준일(사용자 입력)로 계산하는 값. 캐시에는 넣지 않고 적중할 때마다 이번 기준일로 다시 계산합니다.
+DERIVED_KEYS = ('trading_duration_years', 'simple_avg_return_pct', 'cagr_pct', 'alpha_beta_status')
+
+def cacheable_data(data):
+    """수집 결과에서 기준일로 계산하는 값(DERIVED_KEYS)을 뺀 캐시 저장용 사본."""
+    return {key: value for key, value in data.items() if key not in DERIVED_KEYS}
+# --- ⬆️ 결과 캐시 키 ⬆️ ---
+
+# ==================================================================================
+# [SECTION 3] 병렬 수집 (Parallel Browser Sessions)
+# ==================================================================================
+# 동시에 띄울 브라우저 수의 권장 상한 (Chrome 창 하나가 CPU 1코어와 메모리 수백 MB를 씀)
+MAX_BROWSERS = max(1, os.cpu_count() or 1)
+
+# 분석 현황에 보여 줄 단계 수 (p95가 큰 단계부터)
+STEP_SUMMARY_ROWS = 5
+
+class BrowserSession:
+    """독립된 Chrome 창 하나와 그 창 전용 WebDriverWait.
+
+    세션마다 관심목록의 서로 다른 위치를 맡아 따로 수집하므로 세션끼리 상태를 공유하지 않습니다.
+    """
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.driver = webdriver.Chrome(service=webdriver.chrome.service.Service(ChromeDriverManager().install()))
+        self.wait = WebDriverWait(self.driver, 15)
+        self.extract_wait = WebDriverWait(self.driver, 15, poll_frequency=EXTRACT_POLL_INTERVAL)
+        self.current_symbol = ""
+        self.position = 0  # 관심목록에서 현재 선택된 위치 (수집 시작 시 선택된 심볼이 0)
+        self.last_profit_pct = ""
+        self.report_rendered = False
+        self.strategy_text = ""  # 결과 캐시 지문용 범례 텍스트 (분석 시작 시 읽음)
+
+    def open_chart(self):
+        self.driver.maximize_window()
+        self.driver.get("https://www.tradingview.com/chart/")
+
+    def is_alive(self):
+        try:
+            _ = self.driver.title
+            return True
+        except WebDriverException:
+            return False
+
+    def quit(self):
+        try: self.driver.quit()
+        except: pass
+
+    def read_symbol(self):
+        self.current_symbol = self.wait.until(EC.visibility_of_element_located((By.XPATH, SYMBOL_NAME_XPATH))).text
+        return self.current_symbol
+
+    def advance(self, steps, step=no_timing):
+        """관심목록에서 steps칸 아래 심볼로 이동하고, 새 심볼의 전략 리포트가 다시 그려질 때까지 기다립니다.
+
+        report_rendered가 True면 리포트가 새로 그려진 것을 확인했으므로 수집 시 이전 값과 비교하지 않아도 됩니다.
+        키를 보낸 뒤에는 기다리다 실패해도 관심목록은 이미 이동했으므로 position을 먼저 옮겨 둡니다.
+        """
+        with step('관심목록 이동'):
+            marks = render_marks(self.driver)
+            self.driver.find_element(By.TAG_NAME, 'body').send_keys(*[Keys.ARROW_DOWN] * steps)
+            self.position += steps
+        if marks is None:  # 관찰자를 설치하지 못하면 예전처럼 심볼 텍스트가 바뀔 때까지 폴링
+            with step('고정 대기'):
+                time.sleep(0.5)
+            with step('심볼 변경 대기'):
+                self.wait.until(text_to_be_different_from((By.XPATH, SYMBOL_NAME_XPATH), self.current_symbol))
+            self.report_rendered = False
+            return
+        with step('심볼 변경 대기'):
+            self.extract_wait.until(symbol_rendered_since(marks))
+        with step('리포트 렌더 대기'):
+            self.report_rendered = wait_report_render(self.driver, marks, EXTRACT_POLL_INTERVAL)
+
+def shard_positions(total, n_sessions, k):
+    """k번째 세션이 맡을 관심목록 위치. 세션 수 간격으로 나눠 맡아 세션마다 한 번에 n_sessions칸씩 이동합니다."""
+    return range(k, total, n_sessions)
+
+# ==================================================================================
+# [SECTION 4] 엑셀 저장 (Export)
+# ==================================================================================
+COLUMN_TITLES = {
+    'symbol': '종목코드', 'full_name': '종목명(Full)', 'exchange': '거래소',
+    'alpha_beta_status': '수익기준(Alpha/Beta)', 'profit_pct': '총손익률(%)',
+    'trade_1_entry': '1번거래진입시점', 'trading_duration_years': '총거래기간(년)',
+    'simple_avg_return_pct': '연평균단순수익률(%)', 'cagr_pct': '연복리수익률(CAGR,%)',
+    'win_rate_pct': '승률(%)', 'max_loss_trade': '최대손실거래(%)',
+    'profit_factor': '수익지수', 'sharpe_ratio': '샤프레이쇼', 'sortino_ratio': '소티노레이쇼',
+    'buy_hold_return': '매수후보유수익(참고)', 'net_profit': '순이익(참고)',
+    'sector': '섹터', 'industry': '상세(산업)', 'No.': 'No.'
+}
+
+# 알파 전략 강조 서식 (수익기준 열에서 값이 '알파(α)'인 셀)
+ALPHA_HIGHLIGHT = ('alpha_beta_status', '알파(α)', {'bg_color': '#FFF2CC', 'font_color': '#B45F04', 'bold': True})
+
+def report_sheets(target_periods):
+    """전체_데이터 / 요약_테이블 시트의 [(data 키, 열 제목)] 목록."""
+    titles = dict(COLUMN_TITLES, **{f'return_{p}': f'{p}(%)' for p in target_periods})
+    full_keys = ['symbol', 'full_name', 'exchange']
+    full_keys += [f'return_{p}' for p in target_periods]
+    full_keys += ['alpha_beta_status', 'profit_pct', 'trade_1_entry', 'trading_duration_years',
+                  'simple_avg_return_pct', 'cagr_pct', 'win_rate_pct', 'max_loss_trade',
+                  'profit_factor', 'sharpe_ratio', 'sortino_ratio', 'buy_hold_return', 'net_profit',
+                  'sector', 'industry', 'No.']
+    compact_keys = ['symbol', 'full_name', 'exchange']
+    compact_keys += [f'return_{p}' for p in target_periods]
+    compact_keys += ['alpha_beta_status', 'trading_duration_years', 'cagr_pct', 'max_loss_trade',
+                     'sector', 'industry', 'No.']
+    return {
+        '전체_데이터': [(key, titles[key]) for key in full_keys],
+        '요약_테이블': [(key, titles[key]) for key in compact_keys],
+    }
+
 # ==================================================================================
 # [GUI Class]
 # ==================================================================================
@@ -147,17 +463,27 @@ class TradingViewApp:
     def __init__(self, master):
         self.master = master
         master.title("TradingView Backtest Auto (Stable Engine)")
-        master.geometry("550x920") 
+        master.geometry("550x1020") 
         
         self.is_running = False
         self.is_paused = False
         self.stop_requested = False
         self.start_time = None
-        self.driver = None
-        self.wait = None
+        self.sessions = []
+        self.session_labels = []
+        self.results = {}
+        self.done_count = 0
+        self.result_lock = threading.Lock()
         
         self.login_event = threading.Event()
         self.asset_type_var = tk.IntVar(value=1)
+        self.fast_extract_var = tk.BooleanVar(value=True)
+        self.resume_var = tk.BooleanVar(value=True)
+        self.use_cache_var = tk.BooleanVar(value=True)
+        self.result_cache = None
+        self.journal = None
+        self.workbook_stream = None
+        self.telemetry = None
         
         self.default_font = ('Helvetica', 10)
         self.bold_font = ('Helvetica', 10, 'bold')
@@ -188,6 +514,24 @@ class TradingViewApp:
         self.date_entry.grid(row=2, column=1, sticky="w", padx=5, pady=5)
         self.date_entry.insert(0, datetime.now().strftime('%Y-%m-%d'))
 
+        tk.Label(frame_settings, text="브라우저 수:", font=self.bold_font).grid(row=3, column=0, sticky="w", pady=5)
+        self.browser_entry = tk.Entry(frame_settings, width=10)
+        self.browser_entry.grid(row=3, column=1, sticky="w", padx=5, pady=5)
+        self.browser_entry.insert(0, "1")
+        tk.Label(frame_settings, text=f"(권장 최대 {MAX_BROWSERS}개)", fg="gray").grid(row=3, column=2, sticky="w")
+
+        tk.Label(frame_settings, text="추출 방식:", font=self.bold_font).grid(row=4, column=0, sticky="w", pady=5)
+        tk.Checkbutton(frame_settings, text="빠른 추출 (탭마다 JS 한 번에 읽기)",
+                       variable=self.fast_extract_var).grid(row=4, column=1, columnspan=2, sticky="w", padx=5)
+
+        tk.Label(frame_settings, text="이어하기:", font=self.bold_font).grid(row=5, column=0, sticky="w", pady=5)
+        tk.Checkbutton(frame_settings, text="같은 관심목록/기준일 저널에 있는 심볼은 건너뛰기",
+                       variable=self.resume_var).grid(row=5, column=1, columnspan=2, sticky="w", padx=5)
+
+        tk.Label(frame_settings, text="결과 캐시:", font=self.bold_font).grid(row=6, column=0, sticky="w", pady=5)
+        tk.Checkbutton(frame_settings, text="같은 전략/기준일로 수집한 심볼은 저장된 결과 사용",
+                       variable=self.use_cache_var).grid(row=6, column=1, columnspan=2, sticky="w", padx=5)
+
         # 2. 정보 표시 섹션
         frame_info = tk.LabelFrame(self.master, text="📊 분석 현황", padx=10, pady=10)
         frame_info.pack(side="top", padx=10, pady=5, fill="x")
@@ -214,6 +558,18 @@ class TradingViewApp:
         self.lbl_progress_pct = tk.Label(frame_info, text="0%", font=self.bold_font, fg="blue")
         self.lbl_progress_pct.grid(row=4, column=2, sticky="w", padx=5)
 
+        tk.Label(frame_info, text="브라우저별:", font=self.bold_font, fg="gray").grid(row=5, column=0, sticky="nw", pady=2)
+        self.frame_sessions = tk.Frame(frame_info)
+        self.frame_sessions.grid(row=5, column=1, columnspan=2, sticky="w", padx=5)
+
+        tk.Label(frame_info, text="처리 속도:", font=self.bold_font, fg="gray").grid(row=6, column=0, sticky="w", pady=2)
+        self.lbl_rate = tk.Label(frame_info, text="-", font=self.default_font)
+        self.lbl_rate.grid(row=6, column=1, columnspan=2, sticky="w", padx=5)
+
+        tk.Label(frame_info, text="단계별 시간:", font=self.bold_font, fg="gray").grid(row=7, column=0, sticky="nw", pady=2)
+        self.lbl_steps = tk.Label(frame_info, text="-", font=('Consolas', 9), justify="left")
+        self.lbl_steps.grid(row=7, column=1, columnspan=2, sticky="w", padx=5)
+
         # 3. 제어 버튼 섹션
         frame_ctrl = tk.LabelFrame(self.master, text="🎮 제어 패널", padx=10, pady=10)
         frame_ctrl.pack(side="bottom", padx=10, pady=5, fill="x")
@@ -245,26 +601,44 @@ class TradingViewApp:
         self.sys_log_text.pack(fill="both", expand=True)
 
     # --- UI 기능 함수 ---
+    # 로그는 브라우저 세션 스레드에서도 남기므로 위젯은 항상 메인 스레드(after)에서 고칩니다. (Tk는 스레드 안전하지 않음)
     def log_system(self, message):
-        self.sys_log_text.config(state='normal')
-        self.sys_log_text.insert(tk.END, datetime.now().strftime("[%H:%M:%S] ") + message + "\n")
-        self.sys_log_text.see(tk.END)
-        self.sys_log_text.config(state='disabled')
+        line = datetime.now().strftime("[%H:%M:%S] ") + message + "\n"
+        self.master.after(0, lambda: self._append_log(self.sys_log_text, line))
 
     def log_file(self, message):
-        self.file_log_text.config(state='normal')
-        self.file_log_text.insert(tk.END, datetime.now().strftime("[%H:%M] ") + message + "\n")
-        self.file_log_text.see(tk.END)
-        self.file_log_text.config(state='disabled')
+        line = datetime.now().strftime("[%H:%M] ") + message + "\n"
+        self.master.after(0, lambda: self._append_log(self.file_log_text, line))
+
+    def _append_log(self, widget, line):
+        widget.config(state='normal')
+        widget.insert(tk.END, line)
+        widget.see(tk.END)
+        widget.config(state='disabled')
 
     def update_timer(self):
         if self.is_running and not self.is_paused:
             elapsed = time.time() - self.start_time
             self.lbl_timer.config(text=time.strftime("%H:%M:%S", time.gmtime(elapsed)))
+            self.update_telemetry_view()
             self.master.after(1000, self.update_timer)
         elif self.is_paused:
             self.master.after(1000, self.update_timer)
 
+    def update_telemetry_view(self):
+        """최근 처리 속도/남은 시간과 단계별 p50/p95 (p95가 큰 단계부터 STEP_SUMMARY_ROWS개)를 표시합니다."""
+        if self.telemetry is None:
+            return
+        rate = self.telemetry.rate_per_minute()
+        if rate is not None:
+            eta = self.telemetry.eta_seconds()
+            eta_str = time.strftime("%H:%M:%S", time.gmtime(eta)) if eta is not None else "-"
+            self.lbl_rate.config(text=f"{rate:.1f} 심볼/분 · 남은 시간 약 {eta_str}")
+        summary = self.telemetry.step_summary()[:STEP_SUMMARY_ROWS]
+        if summary:
+            self.lbl_steps.config(text="\n".join(f"{name:<10} p50 {p50:5.2f}s · p95 {p95:5.2f}s"
+                                                 for name, _, p50, p95 in summary))
+
     def update_button_states(self, state):
         if state == "ready":
             self.btn_start.config(state="normal", bg="#2ecc71")
@@ -285,6 +659,13 @@ class TradingViewApp:
         except:
             messagebox.showerror("오류", "심볼 개수를 확인하세요."); return
 
+        try:
+            browsers = int(self.browser_entry.get())
+            if browsers <= 0: raise ValueError
+            self.browser_count = min(browsers, self.target_count)
+        except:
+            messagebox.showerror("오류", "브라우저 수를 확인하세요."); return
+
         self.target_date_str = self.date_entry.get().strip()
         if not self.target_date_str: messagebox.showerror("오류", "기준일을 입력하세요."); return
 
@@ -295,8 +676,15 @@ class TradingViewApp:
         self.progress['value'] = 0
         self.lbl_progress_pct.config(text="0%") 
         
+        self.fast_extract = self.fast_extract_var.get()
+        self.resume = self.resume_var.get()
+        self.use_cache = self.use_cache_var.get()
+        self._build_session_labels(self.browser_count)
+
         self.update_button_states("running")
         self.log_system("=== 분석 시작 ===")
+        if self.browser_count > MAX_BROWSERS:
+            self.log_system(f"⚠️ 브라우저 {self.browser_count}개는 CPU 수({MAX_BROWSERS})보다 많아 오히려 느려질 수 있습니다.")
         self.update_timer()
         threading.Thread(target=self.run_selenium_logic, daemon=True).start()
 
@@ -320,229 +708,319 @@ class TradingViewApp:
     def exit_program(self):
         if messagebox.askokcancel("종료", "프로그램을 종료하시겠습니까?\n(브라우저도 닫힙니다)"):
             self.stop_requested = True
-            if self.driver:
-                try: self.driver.quit()
-                except: pass
+            for session in self.sessions:
+                session.quit()
             self.master.destroy()
 
-    def is_driver_alive(self):
-        if self.driver is None: return False
-        try:
-            _ = self.driver.title 
-            return True
-        except WebDriverException:
-            return False
-
-    def show_login_popup(self):
-        messagebox.showinfo("알림", "로그인 및 차트 세팅 후 [확인]을 눌러주세요.\n(확인을 눌러야 분석이 시작됩니다)")
+    def show_login_popup(self, count=1):
+        if count > 1:
+            message = (f"브라우저 {count}개 창 각각에서 로그인 및 차트 세팅 후 [확인]을 눌러주세요.\n"
+                       "(모든 창에서 같은 관심목록의 첫 심볼을 선택해 두세요)")
+        else:
+            message = "로그인 및 차트 세팅 후 [확인]을 눌러주세요.\n(확인을 눌러야 분석이 시작됩니다)"
+        messagebox.showinfo("알림", message)
         self.login_event.set()
 
+    def _build_session_labels(self, count):
+        for label in self.session_labels:
+            label.destroy()
+        self.session_labels = []
+        for k in range(count):
+            label = tk.Label(self.frame_sessions, text=f"브라우저 {k + 1}: 대기 중", font=self.default_font)
+            label.pack(anchor="w")
+            self.session_labels.append(label)
+
+    def set_session_status(self, session, text):
+        label = self.session_labels[session.session_id - 1]
+        self.master.after(0, lambda t=f"브라우저 {session.session_id}: {text}": label.config(text=t))
+
+    def prepare_sessions(self, count):
+        """살아 있는 브라우저는 그대로 쓰고 모자란 만큼 새로 띄운 뒤, 새 창이 있으면 로그인을 기다립니다."""
+        self.sessions = [s for s in self.sessions if s.is_alive()]
+        new_sessions = []
+        while len(self.sessions) < count:
+            self.log_system(f"브라우저 {len(self.sessions) + 1} 실행 중... (New Session)")
+            session = BrowserSession(len(self.sessions) + 1)
+            session.open_chart()
+            self.sessions.append(session)
+            new_sessions.append(session)
+        for k, session in enumerate(self.sessions):
+            session.session_id = k + 1
+
+        if new_sessions:
+            self.log_system("사용자 로그인 대기 중...")
+            self.login_event.clear()
+            self.master.after(0, lambda: self.show_login_popup(count))
+            self.login_event.wait()
+            self.log_system("사용자 확인 완료. 분석을 시작합니다.")
+            time.sleep(1)
+        else:
+            self.log_system("기존 브라우저 세션을 사용합니다.")
+        return self.sessions[:count]
+
     # --- 핵심 로직 (Core + GUI Feedback) ---
-    def run_selenium_logic(self):
+    def scrape_symbol(self, session, symbol, target_periods, end_date_obj, step=no_timing):
+        """현재 차트에 떠 있는 심볼 하나의 전략 성과와 종목 정보를 수집합니다. 전략 결과가 없으면 None.
+
+        step: 단계별 시간을 잴 context manager (run_shard가 심볼마다 SymbolTiming.step을 넘김)
+        """
+        # 리포트가 새로 그려진 것을 확인했으면 이전 심볼의 총손익률과 비교하지 않습니다. (같은 값이어도 바로 수집)
+        previous_profit_pct = None if session.report_rendered else session.last_profit_pct
+        if self.fast_extract:
+            data = get_strategy_data_js(session.driver, session.extract_wait, previous_profit_pct, step)
+        else:  # 핵심 함수(SECTION 1)는 건드리지 않고 탭 전체를 한 단계로 잽니다. (탭별 시간은 빠른 추출에서만)
+            with step('전략 리포트'):
+                data = get_strategy_data(session.driver, session.wait, previous_profit_pct)
+        if not data:
+            session.last_profit_pct = "N/A"
+            return None
+
+        data['symbol'] = symbol
+        self.add_derived_metrics(data, end_date_obj)
+
+        with step('종목 정보'):
+            if self.fast_extract:
+                data.update(scrape_symbol_details_js(session.driver, session.extract_wait, target_periods))
+            else:
+                data.update(scrape_symbol_details(session.driver, session.wait, target_periods))
+        session.last_profit_pct = data['profit_pct']
+        return data
+
+    def add_derived_metrics(self, data, end_date_obj):
+        """수집한 값과 기준일로 알파/베타, 총거래기간, 연평균단순수익률, CAGR(DERIVED_KEYS)을 채웁니다."""
+        data['trading_duration_years'] = "N/A"
+        data['simple_avg_return_pct'] = "N/A"
+        data['cagr_pct'] = "N/A"
+        data['alpha_beta_status'] = "분석 불가"
+
         try:
-            driver_needs_init = False
+            net_profit_float = parse_profit_string(data.get('net_profit'))
+            buy_hold_float = parse_profit_string(data.get('buy_hold_return'))
+            if net_profit_float is not None and buy_hold_float is not None:
+                data['alpha_beta_status'] = "알파(α)" if net_profit_float > buy_hold_float else "베타(β)"
             
-            if not self.is_driver_alive():
-                self.log_system("브라우저 실행 중... (New Session)")
-                self.driver = webdriver.Chrome(service=webdriver.chrome.service.Service(ChromeDriverManager().install()))
-                self.wait = WebDriverWait(self.driver, 15)
-                self.driver.maximize_window()
-                self.driver.get("https://www.tradingview.com/chart/")
-                driver_needs_init = True
-            else:
-                self.log_system("기존 브라우저 세션을 사용합니다.")
+            start_date_obj = datetime.strptime(data['trade_1_entry'].replace(' ', ''), '%Y년%m월%d일')
+            duration = (end_date_obj - start_date_obj).days / 365.25
+            if duration > 0:
+                profit = float(data['profit_pct'].replace('%','').replace(',','').replace('+',''))
+                data['trading_duration_years'] = f"{duration:.1f}년"
+                data['simple_avg_return_pct'] = f"{(profit/duration):.2f}%"
+                ending_ratio = 1 + (profit/100)
+                if ending_ratio > 0: data['cagr_pct'] = f"{((ending_ratio**(1/duration))-1)*100:.2f}%"
+        except Exception as e:
+            self.log_system(f"계산 오류: {e}")
 
-            if driver_needs_init:
-                self.log_system("사용자 로그인 대기 중...")
-                self.login_event.clear()
-                self.master.after(0, self.show_login_popup)
-                self.login_event.wait()
-                self.log_system("사용자 확인 완료. 분석을 시작합니다.")
-                time.sleep(1)
+    def record_result(self, position, data):
+        """세션이 끝낸 관심목록 위치 하나를 기록하고 전체 진행률을 갱신합니다. (data가 None이면 실패/전략 없음)"""
+        with self.result_lock:
+            if data:
+                self.results[position] = data
+            self.done_count += 1
+            done = self.done_count
+        self.workbook_stream.add(position, data)
+        pct = (done / self.target_count) * 100
+        self.master.after(0, lambda val=done: self.progress.configure(value=val))
+        self.master.after(0, lambda p=pct: self.lbl_progress_pct.config(text=f"{p:.1f}%"))
+
+    def run_shard(self, session, positions, target_periods, end_date_obj):
+        """세션 하나가 맡은 관심목록 위치들을 차례로 수집합니다. (사용자가 고른 첫 심볼이 위치 0)"""
+        tag = f"[브라우저 {session.session_id}]"
+        session.position = 0
+        cache_key_warned = False
+        try:
+            session.read_symbol()
+        except Exception as e:
+            self.log_system(f"{tag} 시작 심볼을 찾지 못했습니다: {e}")
+            self.set_session_status(session, "시작 실패")
+            return
+
+        for n, position in enumerate(positions):
+            if self.stop_requested:
+                break
+            
+            while self.is_paused:
+                time.sleep(0.5)
+                if self.stop_requested: break
+            if self.stop_requested:
+                break
+
+            data = None
+            timing = self.telemetry.start(session.session_id, position)
+            outcome = '오류'
+            try:
+                if not session.is_alive(): raise Exception("브라우저가 닫혔습니다.")
+
+                if position > session.position:
+                    session.advance(position - session.position, timing.step)
+                with timing.step('심볼 읽기'):
+                    symbol = session.read_symbol()
+                timing.symbol = symbol
+
+                self.set_session_status(session, f"{n + 1}/{len(positions)} · {symbol}")
+                self.master.after(0, lambda s=symbol: self.lbl_current_data.config(text=s))
+                self.master.after(0, lambda: self.lbl_current_name.config(text="가져오는 중..."))
+                if symbol in self.journal:
+                    self.journal.move(symbol, position)
+                    data = self.journal.get(symbol)
+                    outcome = '저널'
+                    session.last_profit_pct = data.get('profit_pct', "N/A")
+                    self.log_system(f"{tag} [{position + 1}/{self.target_count}] {symbol} 저널에 있음 → 건너뜀")
+                    continue
+
+                # 리포트가 이 심볼로 다시 그려진 것을 확인했을 때만 (위치 0은 시작할 때 떠 있던 심볼) 캐시 키를 읽습니다.
+                cache_key = None
+                if self.use_cache and session.strategy_text and (session.report_rendered or position == 0):
+                    with timing.step('캐시 키'):
+                        cache_key = read_cache_key(session.driver, session.extract_wait, session.strategy_text, target_periods)
+                    if cache_key is None and not cache_key_warned:
+                        cache_key_warned = True
+                        self.log_system(f"⚠️ {tag} 속성 탭에서 전략 속성/마지막 봉 날짜를 읽지 못한 심볼은 캐시 없이 수집합니다.")
+                if cache_key is not None:
+                    data = self.result_cache.get(symbol, *cache_key)
+                    if data:
+                        self.add_derived_metrics(data, end_date_obj)
+                        self.journal.append(position, symbol, data)
+                        outcome = '캐시'
+                        session.last_profit_pct = data.get('profit_pct', "N/A")
+                        self.log_system(f"{tag} [{position + 1}/{self.target_count}] {symbol} 캐시 적중 → 건너뜀")
+                        continue
+
+                self.log_system(f"{tag} [{position + 1}/{self.target_count}] {symbol} 수집 진행 중...")
+
+                data = self.scrape_symbol(session, symbol, target_periods, end_date_obj, timing.step)
+                if data:
+                    outcome = '수집'
+                    with timing.step('기록'):
+                        self.journal.append(position, symbol, data)
+                        if cache_key is not None:
+                            self.result_cache.put(symbol, *cache_key, cacheable_data(data))
+                    full_name = data.get('full_name', 'N/A')
+                    self.master.after(0, lambda name=full_name: self.lbl_current_name.config(text=name))
+                    self.log_system(f"  -> 성공: {symbol} ({full_name})")
+                else:
+                    outcome = '실패'
+                    self.log_system(f"  -> 전략 없음/실패: {symbol}")
+
+            except Exception as e:
+                self.log_system(f"{tag} Error (Index {position}): {e}")
+                if "브라우저가 닫혔습니다" in str(e):
+                    self.log_system(f"⚠️ 브라우저 {session.session_id} 연결 끊김. 이 브라우저가 맡은 나머지 심볼은 건너뜁니다.")
+                    self.set_session_status(session, "연결 끊김")
+                    return
+            finally:
+                self.telemetry.finish(timing, outcome)
+                self.record_result(position, data)
+
+        self.set_session_status(session, f"완료 ({len(positions)}개 중 {sum(1 for p in positions if p in self.results)}개 수집)")
+
+    def run_selenium_logic(self):
+        try:
+            self.log_system("Selenium 모듈 불러오는 중...")
+            load_selenium()
+            sessions = self.prepare_sessions(self.browser_count)
 
             asset_mode = self.asset_type_var.get()
             if asset_mode == 2: target_periods = ['1M', '3M', 'YTD', '1Y', '3Y', '5Y']
             else: target_periods = ['1W', '1M', '3M', '6M', 'YTD', '1Y']
             
             try:
-                watchlist_title = self.wait.until(EC.visibility_of_element_located((By.XPATH, WATCHLIST_TITLE_XPATH))).text.strip()
+                watchlist_title = sessions[0].wait.until(EC.visibility_of_element_located((By.XPATH, WATCHLIST_TITLE_XPATH))).text.strip()
                 final_filename = f"{watchlist_title}_{self.target_date_str}.xlsx"
             except:
+                watchlist_title = None
                 final_filename = f"TV_Data_{self.target_date_str}.xlsx"
             
             self.master.after(0, lambda: self.lbl_filename.config(text=final_filename))
 
-            collected_data = []
-            current_symbol = ""
-            last_profit_pct = ""
-            end_date_obj = datetime.strptime(self.target_date_str, '%Y-%m-%d')
+            # 심볼을 끝낼 때마다 저널에 기록합니다. (같은 관심목록/기준일로 다시 실행하면 이어서 수집)
+            self.journal = ScrapeJournal(journal_path(final_filename))
+            if not watchlist_title and self.resume:
+                # 관심목록을 모르면 다른 관심목록의 저널일 수 있으므로 이어서 수집하지 않습니다.
+                self.log_system("⚠️ 관심목록 이름을 읽지 못해 이전 저널을 보관하고 처음부터 수집합니다.")
+                self.journal.reset()
+            elif not self.resume:
+                self.journal.reset()
+            elif len(self.journal):
+                self.log_system(f"📒 저널에 {len(self.journal)}개 심볼이 있어 이어서 수집합니다. ({self.journal.path})")
 
-            for i in range(self.target_count):
-                current_progress = i + 1
-                pct = (current_progress / self.target_count) * 100
-                self.master.after(0, lambda val=current_progress: self.progress.configure(value=val))
-                self.master.after(0, lambda p=pct: self.lbl_progress_pct.config(text=f"{p:.1f}%"))
-                
-                if self.stop_requested:
-                    self.log_system("사용자 요청에 의해 작업 중단.")
-                    break
-                
-                while self.is_paused:
-                    time.sleep(0.5)
-                    if self.stop_requested: break
+            # 결과는 수집하는 대로 관심목록 순서에 맞춰 엑셀에 바로 씁니다. (메모리에 모아 두지 않음)
+            from workbook_stream import StreamingWorkbook
+            self.workbook_stream = StreamingWorkbook(final_filename, report_sheets(target_periods), highlight=ALPHA_HIGHLIGHT)
 
-                self.log_system(f"[{i+1}/{self.target_count}] 수집 진행 중...")
-
-                try:
-                    if not self.is_driver_alive(): raise Exception("브라우저가 닫혔습니다.")
-
-                    if i > 0:
-                        self.wait.until(text_to_be_different_from((By.XPATH, SYMBOL_NAME_XPATH), current_symbol))
-                    
-                    current_symbol = self.wait.until(EC.visibility_of_element_located((By.XPATH, SYMBOL_NAME_XPATH))).text
-                    
-                    self.master.after(0, lambda s=current_symbol: self.lbl_current_data.config(text=s))
-                    self.master.after(0, lambda: self.lbl_current_name.config(text="가져오는 중..."))
+            self.results = {}
+            self.done_count = 0
+            self.telemetry = ScrapeTelemetry(self.target_count)
+            end_date_obj = datetime.strptime(self.target_date_str, '%Y-%m-%d')
 
-                    data = get_strategy_data(self.driver, self.wait, last_profit_pct)
+            # 같은 전략/입력값/속성으로 같은 마지막 봉까지 이미 수집한 심볼은 결과 캐시를 씁니다.
+            # (범례 텍스트는 세션(차트)마다 한 번, 속성과 마지막 봉 날짜는 심볼마다 읽음)
+            if self.use_cache:
+                if self.result_cache is None:
+                    self.result_cache = ResultCache()
+                self.result_cache.reset_stats()
+                for session in sessions:
+                    session.strategy_text = read_strategy_text(session.driver)
+                    if not session.strategy_text.strip():
+                        self.log_system(f"⚠️ 브라우저 {session.session_id}: 전략 정보를 읽지 못해 결과 캐시를 쓰지 않습니다.")
 
-                    if data:
-                        data['symbol'] = current_symbol
-                        
-                        data['trading_duration_years'] = "N/A"
-                        data['simple_avg_return_pct'] = "N/A"
-                        data['cagr_pct'] = "N/A"
-                        data['alpha_beta_status'] = "분석 불가"
-
-                        try:
-                            net_profit_float = parse_profit_string(data.get('net_profit'))
-                            buy_hold_float = parse_profit_string(data.get('buy_hold_return'))
-                            if net_profit_float is not None and buy_hold_float is not None:
-                                data['alpha_beta_status'] = "알파(α)" if net_profit_float > buy_hold_float else "베타(β)"
-                            
-                            start_date_obj = datetime.strptime(data['trade_1_entry'].replace(' ', ''), '%Y년%m월%d일')
-                            duration = (end_date_obj - start_date_obj).days / 365.25
-                            if duration > 0:
-                                profit = float(data['profit_pct'].replace('%','').replace(',','').replace('+',''))
-                                data['trading_duration_years'] = f"{duration:.1f}년"
-                                data['simple_avg_return_pct'] = f"{(profit/duration):.2f}%"
-                                ending_ratio = 1 + (profit/100)
-                                if ending_ratio > 0: data['cagr_pct'] = f"{((ending_ratio**(1/duration))-1)*100:.2f}%"
-                        except Exception as e:
-                            self.log_system(f"계산 오류: {e}")
-
-                        details_data = scrape_symbol_details(self.driver, self.wait, target_periods)
-                        data.update(details_data)
-                        
-                        full_name = details_data.get('full_name', 'N/A')
-                        self.master.after(0, lambda n=full_name: self.lbl_current_name.config(text=n))
-
-                        collected_data.append(data)
-                        last_profit_pct = data['profit_pct']
-                        self.log_system(f"  -> 성공: {current_symbol} ({full_name})")
-                    else:
-                        self.log_system(f"  -> 전략 없음/실패: {current_symbol}")
-                        last_profit_pct = "N/A"
-
-                    self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ARROW_DOWN)
-                    time.sleep(0.5)
-
-                except Exception as e:
-                    self.log_system(f"Error (Index {i}): {e}")
-                    if "브라우저가 닫혔습니다" in str(e):
-                        self.log_system("⚠️ 브라우저 연결 끊김. 저장 후 종료.")
-                        break
-            
+            # 세션마다 관심목록을 세션 수 간격으로 나눠 맡고, 결과는 관심목록 위치 순서로 다시 합칩니다.
+            if len(sessions) > 1:
+                self.log_system(f"브라우저 {len(sessions)}개로 나눠 수집합니다.")
+            with ThreadPoolExecutor(max_workers=len(sessions)) as executor:
+                futures = [executor.submit(self.run_shard, session,
+                                           shard_positions(self.target_count, len(sessions), k),
+                                           target_periods, end_date_obj)
+                           for k, session in enumerate(sessions)]
+                for future in futures:
+                    future.result()
+            if self.stop_requested:
+                self.log_system("사용자 요청에 의해 작업 중단.")
+            if self.use_cache:
+                self.log_system(f"🗃️ 결과 캐시: 적중 {self.result_cache.hits}개 / 미스 {self.result_cache.misses}개")
             self.master.after(0, lambda: self.progress.configure(value=self.target_count))
             self.master.after(0, lambda: self.lbl_progress_pct.config(text="100%"))
 
-            # --- 엑셀 저장 (xlsxwriter 엔진 강제 적용) ---
-            # 설명: xlsxwriter 엔진을 사용하여 XML 오류를 원천 차단합니다.
-            if collected_data:
-                self.log_system(f"총 {len(collected_data)}개 데이터 저장 시작...")
-                df = pd.DataFrame(collected_data)
-                
-                columns_order = ['symbol', 'full_name', 'exchange']
-                columns_order += [f'return_{p}' for p in target_periods]
-                columns_order += ['alpha_beta_status', 'profit_pct', 'trade_1_entry', 'trading_duration_years',
-                                  'simple_avg_return_pct', 'cagr_pct', 'win_rate_pct', 'max_loss_trade',
-                                  'profit_factor', 'sharpe_ratio', 'sortino_ratio', 'buy_hold_return', 'net_profit',
-                                  'sector', 'industry']
-                
-                final_columns = [col for col in columns_order if col in df.columns]
-                df = df[final_columns]
-                
-                rename_map = {
-                    'symbol': '종목코드', 'full_name': '종목명(Full)', 'exchange': '거래소',
-                    'alpha_beta_status': '수익기준(Alpha/Beta)', 'profit_pct': '총손익률(%)',
-                    'trade_1_entry': '1번거래진입시점', 'trading_duration_years': '총거래기간(년)',
-                    'simple_avg_return_pct': '연평균단순수익률(%)', 'cagr_pct': '연복리수익률(CAGR,%)',
-                    'win_rate_pct': '승률(%)', 'max_loss_trade': '최대손실거래(%)',
-                    'profit_factor': '수익지수', 'sharpe_ratio': '샤프레이쇼', 'sortino_ratio': '소티노레이쇼',
-                    'buy_hold_return': '매수후보유수익(참고)', 'net_profit': '순이익(참고)',
-                    'sector': '섹터', 'industry': '상세(산업)'
-                }
-                for p in target_periods:
-                    rename_map[f'return_{p}'] = f'{p}(%)'
-                
-                df = df.rename(columns=rename_map)
-                df['No.'] = range(1, len(df) + 1)
-
-                # 요약 테이블 (Compact)
-                compact_cols = ['종목코드', '종목명(Full)', '거래소']
-                compact_cols += [f'{p}(%)' for p in target_periods]
-                compact_cols += ['수익기준(Alpha/Beta)', '총거래기간(년)', '연복리수익률(CAGR,%)', '최대손실거래(%)',
-                                 '섹터', '상세(산업)', 'No.']
-                final_compact_cols = [c for c in compact_cols if c in df.columns]
-                df_compact = df[final_compact_cols]
-
-                # [중요] xlsxwriter 엔진 사용 - XML 오류 해결사
-                try:
-                    with pd.ExcelWriter(final_filename, engine='xlsxwriter') as writer:
-                        df.to_excel(writer, sheet_name='전체_데이터', index=False)
-                        df_compact.to_excel(writer, sheet_name='요약_테이블', index=False)
-                        
-                        # 스타일 적용 (xlsxwriter 방식)
-                        workbook = writer.book
-                        alpha_format = workbook.add_format({'bg_color': '#FFF2CC', 'font_color': '#B45F04', 'bold': True})
-                        
-                        # 1. 전체 데이터 시트 스타일링
-                        worksheet_full = writer.sheets['전체_데이터']
-                        if '수익기준(Alpha/Beta)' in df.columns:
-                            alpha_col_idx = df.columns.get_loc('수익기준(Alpha/Beta)')
-                            for row_num, value in enumerate(df['수익기준(Alpha/Beta)']):
-                                if value == '알파(α)':
-                                    worksheet_full.write(row_num + 1, alpha_col_idx, value, alpha_format)
-                        
-                        # 2. 요약 테이블 시트 스타일링
-                        worksheet_compact = writer.sheets['요약_테이블']
-                        if '수익기준(Alpha/Beta)' in df_compact.columns:
-                            alpha_col_idx = df_compact.columns.get_loc('수익기준(Alpha/Beta)')
-                            for row_num, value in enumerate(df_compact['수익기준(Alpha/Beta)']):
-                                if value == '알파(α)':
-                                    worksheet_compact.write(row_num + 1, alpha_col_idx, value, alpha_format)
-
-                except Exception as save_err:
-                    self.log_system(f"⚠️ 저장 오류 ({save_err}).")
-                    print(traceback.format_exc())
+            # --- 엑셀 저장 (xlsxwriter) ---
+            # 행은 수집하면서 이미 썼으므로, 이번에 방문하지 않은 저널 결과(이전 실행분)만 덧붙이고 닫습니다.
+            try:
+                self.log_system(f"총 {self.workbook_stream.rows}개 데이터 기록됨, 엑셀 마무리 중...")
+                saved = self.workbook_stream.close(remaining=self.journal.ordered_data())
+            except Exception as save_err:
+                saved = False
+                self.log_system(f"⚠️ 저장 오류 ({save_err}).")
+                print(traceback.format_exc())
 
+            if saved:
                 total_elapsed = time.time() - self.start_time
                 elapsed_str = time.strftime("%H:%M:%S", time.gmtime(total_elapsed))
                 
-                log_msg = f"{final_filename} 저장됨 (소요: {elapsed_str}, 수집: {self.target_count}개)"
-                self.master.after(0, lambda m=log_msg: self.log_file(m))
+                log_msg = f"{final_filename} 저장됨 (소요: {elapsed_str}, 수집: {self.workbook_stream.rows}개)"
+                self.log_file(log_msg)
                 
                 self.log_system("모든 작업이 완료되었습니다.")
             else:
                 self.log_system("수집된 데이터가 없어 저장하지 않았습니다.")
 
+            # 심볼별 단계 시간은 엑셀 옆 CSV로 남깁니다. (느린 단계를 찾을 때 사용)
+            try:
+                timing_file = timing_path(final_filename)
+                if self.telemetry.export_csv(timing_file):
+                    self.log_system(f"⏱️ 단계별 시간 기록: {timing_file}")
+                    for name, count, p50, p95 in self.telemetry.step_summary()[:STEP_SUMMARY_ROWS]:
+                        self.log_system(f"  {name}: p50 {p50:.2f}s / p95 {p95:.2f}s ({count}회)")
+            except Exception as timing_err:
+                self.log_system(f"⚠️ 시간 기록 저장 오류 ({timing_err}).")
+
         except Exception as e:
             self.log_system(f"치명적 오류 발생: {e}")
             print(traceback.format_exc())
 
         finally:
             self.is_running = False
+            if self.journal is not None:
+                self.journal.close()
             self.master.after(0, lambda: self.update_button_states("ready"))
+            self.master.after(0, self.update_telemetry_view)
             self.master.after(0, lambda: self.lbl_current_data.config(text="대기 (완료)"))
             self.master.after(0, lambda: self.lbl_current_name.config(text="-"))
 
@@ -1,15 +1,30 @@
 import time
 import json
-import pandas as pd
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
-from selenium.webdriver.common.action_chains import ActionChains  # 추가
-from webdriver_manager.chrome import ChromeDriverManager
+
+from scrape_journal import ScrapeJournal, journal_path
+
+# --- ⬇️ Selenium 지연 import ⬇️ ---
+# Selenium/webdriver_manager/pandas는 불러오는 데 0.5초 이상 걸리므로 입력을 먼저 받고 브라우저를 띄우기 직전에 불러옵니다.
+webdriver = By = Keys = WebDriverWait = EC = ActionChains = ChromeDriverManager = None
+TimeoutException = NoSuchElementException = StaleElementReferenceException = None
+
+def load_selenium():
+    """Selenium 관련 모듈을 처음 한 번 불러와 모듈 전역 이름에 채웁니다."""
+    global webdriver, By, Keys, WebDriverWait, EC, ActionChains, ChromeDriverManager
+    global TimeoutException, NoSuchElementException, StaleElementReferenceException
+    if webdriver is not None:
+        return
+    from selenium import webdriver as _webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+    from selenium.webdriver.common.action_chains import ActionChains
+    from webdriver_manager.chrome import ChromeDriverManager
+    webdriver = _webdriver  # 다른 이름이 모두 채워진 뒤 마지막에 설정 (불러온 여부 표시)
+# --- ⬆️ Selenium 지연 import ⬆️ ---
 
 # --- ⬇️ XPath 변수 (성과 탭 데이터 최종 수정) ⬇️ ---
 
@@ -18,6 +33,7 @@ PROFIT_PCT_XPATH = "//div[starts-with(@class, 'reportContainerOld-')]//div[start
 TRADE_LIST_TAB_XPATH = "//button[@data-overflow-tooltip-text='거래목록']"
 OVERVIEW_TAB_XPATH = "//button[@data-overflow-tooltip-text='오버뷰']"
 SYMBOL_NAME_XPATH = "//button[@id='header-toolbar-symbol-search']//div[contains(@class, 'js-button-text')]"
+WATCHLIST_TITLE_XPATH = "//div[contains(@class, 'widgetbar-widget-watchlist')]//span[contains(@class, 'titleRow-')]"
 TRADE_1_ENTRY_XPATH = "//tr[@data='1']/td[4]//div[@data-part='1']" # 거래 시작일
 
 # 2. 추가 탭 버튼 (기존)
@@ -270,8 +286,10 @@ def main():
             print("오류: YYYY-MM-DD 형식이 아닙니다. 다시 입력하세요.")
     
     print(f"기준일이 {end_date_obj.strftime('%Y-%m-%d')}로 설정되었습니다.")
-    
+
     # --- ⬇️ 무기한 대기 입력받기 ⬇️ ---
+    print("브라우저 모듈을 불러오는 중...")
+    load_selenium()
     driver = webdriver.Chrome(service=webdriver.chrome.service.Service(ChromeDriverManager().install()))
     wait = WebDriverWait(driver, 15) # 요소를 찾을 때까지 최대 15초 대기
     driver.maximize_window()
@@ -291,6 +309,27 @@ def main():
         print("잘못된 입력입니다. 'now'를 입력하여 계속하세요.")
     
     print("자동화를 시작합니다.")
+
+    # --- ⬇️ 저널 (심볼마다 바로 디스크에 기록, 같은 관심목록/기준일로 다시 실행하면 이어서 수집) ⬇️ ---
+    end_date_str = end_date_obj.strftime('%Y-%m-%d')
+    try:
+        watchlist_title = wait.until(EC.visibility_of_element_located((By.XPATH, WATCHLIST_TITLE_XPATH))).text.strip()
+    except TimeoutException:
+        watchlist_title = None
+    if watchlist_title:
+        journal = ScrapeJournal(journal_path(f"tradingview_data_{watchlist_title}_{end_date_str}.xlsx"))
+        if len(journal):
+            answer = input(f"[{watchlist_title}] 이전 저널에 {len(journal)}개 심볼 기록이 있습니다. 이어서 수집할까요? (Y/n): ")
+            if answer.strip().lower() == 'n':
+                journal.reset()
+                print("이전 저널을 보관하고 처음부터 수집합니다.")
+            else:
+                print("저널에 있는 심볼은 건너뜁니다.")
+    else:
+        # 관심목록을 모르면 다른 관심목록의 저널일 수 있으므로 이어서 수집하지 않습니다.
+        journal = ScrapeJournal(journal_path(f"tradingview_data_{end_date_str}.xlsx"))
+        journal.reset()
+        print("⚠️ 관심목록 이름을 읽지 못해 이전 저널을 보관하고 처음부터 수집합니다.")
     # --- ⬆️ 무기한 대기 입력받기 완료 ⬆️ ---
 
     collected_data = []
@@ -318,6 +357,14 @@ def main():
             current_symbol = current_symbol_element.text
             print(f"      -> 찾음: [{current_symbol}]")
 
+            if current_symbol in journal:
+                print(f"  [저널] [{current_symbol}]은(는) 이미 수집했습니다. 다음 심볼로 이동합니다.")
+                journal.move(current_symbol, i)
+                last_profit_pct = journal.get(current_symbol).get('profit_pct', 'N/A')
+                driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ARROW_DOWN)
+                time.sleep(0.5)
+                continue
+
             # (B) 데이터 수집
             print("  (B) 전략 데이터 수집 시작...")
             data = get_strategy_data(driver, wait, last_profit_pct) 
@@ -398,6 +445,7 @@ def main():
                 # --- ⬆️ 계산 로직 완료 ⬆️ ---
 
                 collected_data.append(data)
+                journal.append(i, current_symbol, data)
                 print(f"  [성공] 데이터: {data}")
                 last_profit_pct = data['profit_pct'] # 새 값을 기억
             else:
@@ -419,6 +467,9 @@ def main():
             break
 
     driver.quit()
+    journal.close()
+    # 최종 데이터는 저널로 다시 만듭니다. (이전 실행에서 수집한 심볼 포함, 관심목록 순서)
+    collected_data = journal.ordered_data()
     
     print("\n--- 🏁 최종 수집 데이터 ---")
     # 터미널에도 보기 좋게 출력 (JSON 형식)
@@ -429,6 +480,7 @@ def main():
         print("\n데이터를 엑셀 파일로 저장 중...")
         try:
             # 1. 데이터를 Pandas DataFrame으로 변환
+            import pandas as pd
             df = pd.DataFrame(collected_data)
             
             # 2. (선택) 컬럼 순서 지정
@@ -0,0 +1,95 @@
+"""수집하면서 바로 써 내려가는 엑셀 파일 (xlsxwriter constant_memory)
+
+예전에는 수집이 끝난 뒤 전체 DataFrame을 만들어 시트 두 개를 쓰고, 알파(α) 셀을 한 칸씩 다시 써서 색을 입혔습니다.
+StreamingWorkbook은 심볼 하나를 끝낼 때마다 행을 바로 쓰고(한 번 쓴 행은 메모리에서 내보냄),
+알파 강조는 열 전체에 조건부 서식 규칙 하나로 겁니다.
+
+constant_memory 모드는 위에서 아래로만 쓸 수 있으므로, 여러 브라우저가 순서 없이 끝낸 결과는
+관심목록 위치 순으로 이어지는 앞부분만 쓰고 나머지는 앞 위치가 끝날 때까지 잠시 들고 있습니다.
+파일은 임시 이름(.part)으로 쓰다가 닫을 때 제자리로 옮기므로, 쓴 행이 없으면 같은 이름의 기존 파일을 덮어쓰지 않습니다.
+"""
+import os
+import threading
+
+import xlsxwriter
+
+# 머리글 서식 (예전 pandas to_excel 저장본의 머리글과 같게: 굵게, 얇은 테두리, 가운데/위쪽 정렬)
+HEADER_FORMAT = {'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'}
+
+
+class StreamingWorkbook:
+    """sheets: {시트 이름: [(data 키, 열 제목), ...]}. 키 'No.'는 쓴 순서대로 1부터 매기는 행 번호입니다.
+
+    highlight: (data 키, 값, 서식 dict) — 그 열에서 값이 같은 셀에 서식을 입히는 조건부 서식.
+    """
+
+    def __init__(self, path, sheets, highlight=None):
+        self.path = path
+        self.highlight = highlight
+        self.rows = 0
+        self.written_symbols = set()
+        self._pending = {}
+        self._next_position = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self._part_path = path + '.part'
+        self.workbook = xlsxwriter.Workbook(self._part_path, {'constant_memory': True})
+        header_format = self.workbook.add_format(HEADER_FORMAT)
+        self._sheets = []
+        for name, columns in sheets.items():
+            worksheet = self.workbook.add_worksheet(name)
+            for col, (_, title) in enumerate(columns):
+                worksheet.write(0, col, title, header_format)
+            self._sheets.append((worksheet, columns))
+
+    def add(self, position, data):
+        """관심목록 위치 하나의 결과를 넘깁니다. data가 None이면(실패/전략 없음) 그 위치는 행 없이 건너뜁니다."""
+        with self._lock:
+            self._pending[position] = data
+            while self._next_position in self._pending:
+                ready = self._pending.pop(self._next_position)
+                self._next_position += 1
+                if ready:
+                    self._write_row(ready)
+
+    def _write_row(self, data):
+        self.rows += 1
+        self.written_symbols.add(data.get('symbol'))
+        for worksheet, columns in self._sheets:
+            for col, (key, _) in enumerate(columns):
+                value = self.rows if key == 'No.' else data.get(key)
+                if value is not None:
+                    worksheet.write(self.rows, col, value)
+
+    def close(self, remaining=()):
+        """앞 위치가 끝나지 않아 들고 있던 결과와 remaining(이번에 방문하지 않은 저널 결과 등)을 마저 쓰고 파일을 닫습니다.
+
+        쓴 행이 하나도 없으면 임시 파일을 지우고 False를 반환합니다. (같은 이름의 기존 파일은 그대로)
+        """
+        with self._lock:
+            if self._closed:
+                return self.rows > 0
+            self._closed = True
+            for position in sorted(self._pending):
+                if self._pending[position]:
+                    self._write_row(self._pending[position])
+            self._pending.clear()
+            for data in remaining:
+                if data.get('symbol') not in self.written_symbols:
+                    self._write_row(data)
+
+            if self.highlight and self.rows:
+                key, value, style = self.highlight
+                cell_format = self.workbook.add_format(style)
+                for worksheet, columns in self._sheets:
+                    keys = [k for k, _ in columns]
+                    if key in keys:
+                        col = keys.index(key)
+                        worksheet.conditional_format(1, col, self.rows, col, {
+                            'type': 'cell', 'criteria': '==', 'value': f'"{value}"', 'format': cell_format})
+            self.workbook.close()  # 행이 없어도 닫아야 constant_memory 임시 파일이 정리됨
+            if not self.rows:
+                os.remove(self._part_path)
+                return False
+            os.replace(self._part_path, self.path)
+            return True
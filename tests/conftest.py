@@ -0,0 +1,17 @@
+"""stock_app 모듈을 스크립트로 실행할 때처럼 최상위 이름으로 불러올 수 있게 경로를 잡습니다.
+
+캐시 폴더(TIMEFOLIO_CACHE_DIR, TV_CACHE_DIR)는 테스트마다 실제 캐시를 건드리지 않도록 임시 폴더로 돌립니다.
+(각 모듈이 불러올 때 경로를 정하므로 테스트 모듈을 불러오기 전에 설정)
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (os.path.join(ROOT, 'stock_app'), os.path.join(ROOT, 'stock_app', 'tradingview_auto_backtest')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+_CACHE_ROOT = tempfile.mkdtemp(prefix='stock_app_tests_')
+os.environ['TIMEFOLIO_CACHE_DIR'] = os.path.join(_CACHE_ROOT, 'timefolio')
+os.environ['TV_CACHE_DIR'] = os.path.join(_CACHE_ROOT, 'tv')
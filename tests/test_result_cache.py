@@ -0,0 +1,53 @@
+import sqlite3
+
+from result_cache import ResultCache, last_bar_date, strategy_fingerprint
+
+LEGEND = "My Strategy 14 2 close"
+PROPERTIES = "거래 범위 2019년 1월 2일 — 2024년 6월 28일\n초기 자본 1000000\n수수료 0.1%"
+
+
+def test_fingerprint_covers_legend_properties_and_periods():
+    base = strategy_fingerprint(LEGEND, PROPERTIES, ['1M', '1Y'])
+    assert base == strategy_fingerprint(f"  {LEGEND}\n", PROPERTIES, ['1M', '1Y'])
+    assert base != strategy_fingerprint(LEGEND, PROPERTIES.replace('0.1%', '0.05%'), ['1M', '1Y'])
+    assert base != strategy_fingerprint(LEGEND.replace('14', '21'), PROPERTIES, ['1M', '1Y'])
+    assert base != strategy_fingerprint(LEGEND, PROPERTIES, ['1M'])
+    assert strategy_fingerprint('', PROPERTIES, ['1M']) is None
+    assert strategy_fingerprint(LEGEND, ' ', ['1M']) is None
+
+
+def test_last_bar_date_is_latest_date_in_range():
+    assert last_bar_date(PROPERTIES) == '2024-06-28'
+    assert last_bar_date("2024년 12월 3일 ~ 2023년 1월 15일") == '2024-12-03'
+    assert last_bar_date("거래 범위 없음") is None
+    assert last_bar_date(None) is None
+
+
+def test_get_put_keyed_by_last_bar_date(tmp_path):
+    cache = ResultCache(str(tmp_path / 'results.sqlite'))
+    fp = strategy_fingerprint(LEGEND, PROPERTIES, ['1M'])
+    cache.put('AAPL', fp, '2024-06-28', {'profit_pct': '12%'})
+    cache.put('AAPL', None, '2024-06-28', {'profit_pct': 'x'})
+    cache.put('AAPL', fp, None, {'profit_pct': 'x'})
+
+    assert cache.get('AAPL', fp, '2024-06-28') == {'profit_pct': '12%'}
+    assert cache.get('AAPL', fp, '2024-07-01') is None
+    assert cache.get('MSFT', fp, '2024-06-28') is None
+    assert cache.get('AAPL', None, '2024-06-28') is None
+    assert (cache.hits, cache.misses) == (1, 3)
+    cache.close()
+
+
+def test_old_cache_keyed_by_reference_date_is_dropped(tmp_path):
+    path = str(tmp_path / 'results.sqlite')
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE results (symbol TEXT, fingerprint TEXT, ref_date TEXT, saved_at TEXT, data TEXT)")
+    conn.execute("INSERT INTO results VALUES ('AAPL', 'fp', '2024-06-28', '', '{}')")
+    conn.commit()
+    conn.close()
+
+    cache = ResultCache(path)
+    assert cache.get('AAPL', 'fp', '2024-06-28') is None
+    cache.put('AAPL', 'fp', '2024-06-28', {'profit_pct': '1%'})
+    assert cache.get('AAPL', 'fp', '2024-06-28') == {'profit_pct': '1%'}
+    cache.close()
@@ -0,0 +1,57 @@
+import json
+import os
+
+from scrape_journal import ScrapeJournal, journal_path
+
+
+def test_journal_path_sits_next_to_workbook():
+    assert journal_path(os.path.join('out', '관심목록_2024-01-01.xlsx')) == os.path.join('out', '관심목록_2024-01-01.journal.jsonl')
+
+
+def test_truncated_last_line_is_skipped_and_terminated(tmp_path):
+    path = str(tmp_path / 'list.journal.jsonl')
+    journal = ScrapeJournal(path)
+    journal.append(0, 'AAPL', {'symbol': 'AAPL', 'profit_pct': '1%'})
+    journal.append(1, 'MSFT', {'symbol': 'MSFT', 'profit_pct': '2%'})
+    journal.close()
+    with open(path, 'ab') as f:  # 기록 도중 꺼져 잘린 줄 (멀티바이트 문자 중간에서 잘림)
+        f.write('{"position": 2, "symbol": "NVDA", "data": {"name": "엔비'.encode('utf-8')[:-1])
+
+    journal = ScrapeJournal(path)
+    assert len(journal) == 2 and 'NVDA' not in journal
+    journal.append(2, 'NVDA', {'symbol': 'NVDA', 'profit_pct': '3%'})
+    journal.close()
+
+    # 잘린 줄 뒤에 이어 쓰지 않았으므로 새 기록이 온전히 다시 읽힙니다.
+    journal = ScrapeJournal(path)
+    assert journal.get('NVDA') == {'symbol': 'NVDA', 'profit_pct': '3%'}
+    assert [d['symbol'] for d in journal.ordered_data()] == ['AAPL', 'MSFT', 'NVDA']
+    journal.close()
+
+
+def test_move_reorders_without_rewriting(tmp_path):
+    path = str(tmp_path / 'list.journal.jsonl')
+    journal = ScrapeJournal(path)
+    for position, symbol in enumerate(['A', 'B', 'C']):
+        journal.append(position, symbol, {'symbol': symbol})
+    journal.move('A', 5)
+    assert [d['symbol'] for d in journal.ordered_data()] == ['B', 'C', 'A']
+    journal.close()
+    with open(path, encoding='utf-8') as f:
+        assert [json.loads(line)['position'] for line in f] == [0, 1, 2]
+
+
+def test_reset_keeps_backup_and_starts_empty(tmp_path):
+    path = str(tmp_path / 'list.journal.jsonl')
+    journal = ScrapeJournal(path)
+    journal.append(0, 'A', {'symbol': 'A'})
+    journal.reset()
+    assert len(journal) == 0
+    journal.append(0, 'B', {'symbol': 'B'})
+    journal.close()
+
+    backups = [n for n in os.listdir(tmp_path) if n.endswith('.bak')]
+    assert len(backups) == 1
+    journal = ScrapeJournal(path)
+    assert list(journal.records) == ['B']
+    journal.close()
@@ -0,0 +1,38 @@
+import csv
+
+import pytest
+
+from scrape_timing import ScrapeTelemetry, percentile
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 11))
+    assert percentile(values, 50) == 5
+    assert percentile(values, 95) == 10
+    assert percentile(values, 10) == 1
+    assert percentile(values, 0) == 1
+    assert percentile([7.5], 95) == 7.5
+    assert percentile([], 50) is None
+
+
+def test_step_summary_and_csv(tmp_path):
+    telemetry = ScrapeTelemetry(total=3)
+    for position, (outcome, seconds) in enumerate([('수집', 1.0), ('수집', 3.0), ('캐시', 100.0)]):
+        timing = telemetry.start(session_id=1, position=position)
+        timing.symbol = f"SYM{position}"
+        timing.steps = {'심볼 읽기': 0.1, '전략 리포트': seconds}
+        telemetry.finish(timing, outcome)
+
+    summary = telemetry.step_summary()
+    assert [name for name, *_ in summary] == ['전략 리포트', '심볼 읽기']
+    # 캐시로 건너뛴 심볼은 단계 통계에서 빠집니다.
+    assert summary[0][1:] == (2, 1.0, 3.0)
+
+    path = tmp_path / 'timing.csv'
+    assert telemetry.export_csv(str(path))
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0][-2:] == ['심볼 읽기', '전략 리포트']
+    assert [r[0] for r in rows[1:]] == ['1', '2', '3']
+    assert float(rows[3][-1]) == pytest.approx(100.0)
+    assert not ScrapeTelemetry(total=0).export_csv(str(tmp_path / 'empty.csv'))
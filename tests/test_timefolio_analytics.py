@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+import timefolio
+from timefolio_analytics import PortfolioAnalytics, fund_weight_matrix
+
+
+def make_holdings(n_dates=5, n_names=40, funds=('A',)):
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range('2024-01-02', periods=n_dates)
+    rows = []
+    for fund in funds:
+        for day in dates:
+            weights = rng.random(n_names)
+            weights = weights / weights.sum() * 100
+            for i, weight in enumerate(weights):
+                rows.append({'ETF': fund, '날짜': day, '종목명': f'종목{i:02d}',
+                             '평가금액(원)': int(weight * 1e6), '비중(%)': round(weight, 2)})
+    return pd.DataFrame(rows)
+
+
+def test_weight_matrix_places_each_weight():
+    df = pd.DataFrame({
+        '날짜': pd.to_datetime(['2024-01-03', '2024-01-02', '2024-01-03', '2024-01-03']),
+        '종목명': ['B', 'A', 'A', 'B'],
+        '비중(%)': [10.0, 60.0, 50.0, 5.0],
+    })
+    dates, names, weights = fund_weight_matrix(df)
+
+    assert list(dates) == list(pd.to_datetime(['2024-01-02', '2024-01-03']))
+    matrix = pd.DataFrame(weights, index=dates, columns=names)
+    assert matrix.loc['2024-01-02', 'A'] == 60.0 and matrix.loc['2024-01-02', 'B'] == 0.0
+    assert matrix.loc['2024-01-03', 'A'] == 50.0 and matrix.loc['2024-01-03', 'B'] == 15.0
+
+
+def test_compact_frame_matches_raw_frame():
+    raw = make_holdings(n_dates=6, n_names=40)
+    compact = timefolio.compact_holdings(raw, report=False)
+    assert compact['날짜'].cat.codes.dtype == np.int8
+
+    raw_dates, raw_names, raw_weights = fund_weight_matrix(raw)
+    dates, names, weights = fund_weight_matrix(compact)
+    assert list(dates) == list(raw_dates)
+    aligned = pd.DataFrame(weights, columns=names)[list(raw_names)].to_numpy()
+    np.testing.assert_allclose(aligned, raw_weights, rtol=1e-6)
+
+    expected = PortfolioAnalytics(raw, window=2).metrics('A')
+    result = PortfolioAnalytics(compact, window=2).metrics('A')
+    pd.testing.assert_frame_equal(result, expected, rtol=1e-5, check_dtype=False)
+
+
+def test_compact_frame_skips_dates_of_other_funds():
+    raw = make_holdings(n_dates=4, n_names=40, funds=('A', 'B'))
+    raw = raw[~((raw['ETF'] == 'A') & (raw['날짜'] == raw['날짜'].min()))]
+    compact = timefolio.compact_holdings(raw, report=False)
+
+    analytics = PortfolioAnalytics(compact)
+    dates, _, weights = analytics._matrix('A')
+    assert len(dates) == 3 and dates[0] == pd.Timestamp('2024-01-03')
+    np.testing.assert_allclose(weights.sum(axis=1), 100, atol=0.5)
+
+
+def test_metrics_are_cached_per_range():
+    analytics = PortfolioAnalytics(make_holdings(n_dates=5, n_names=3), window=2)
+    first = analytics.metrics('A', start='2024-01-03')
+    assert analytics.metrics('A', start='2024-01-03') is first
+    assert analytics.cache_info() == {'hits': 1, 'misses': 1, 'size': 1}
+    assert first.index[0] == pd.Timestamp('2024-01-03')
+    assert np.isnan(first['평균 회전율(%)'].iloc[0]) and not np.isnan(first['평균 회전율(%)'].iloc[-1])
@@ -0,0 +1,64 @@
+import pandas as pd
+
+from timefolio_asof import HoldingsHistory
+from timefolio_store import HoldingsStore
+
+
+def day_frame(weights):
+    return pd.DataFrame({'종목명': list(weights), '종목코드': [f'C{i}' for i in range(len(weights))],
+                         '수량': ['1'] * len(weights), '평가금액(원)': [100] * len(weights),
+                         '비중(%)': list(weights.values())})
+
+
+def make_history(tmp_path, cache_size=256):
+    store = HoldingsStore(str(tmp_path / 'holdings.sqlite'))
+    store.save_days('11', {
+        '2024-01-02': day_frame({'A': 60.0, 'B': 40.0}),
+        '2024-01-05': day_frame({'A': 50.0, 'C': 50.0}),
+        '2024-01-10': day_frame({'C': 100.0}),
+    })
+    store.save_days('22', {'2024-01-04': day_frame({'X': 100.0})})
+    return store, HoldingsHistory(store, {'가': '11', '나': '22'}, cache_size=cache_size)
+
+
+def test_resolve_bisects_to_latest_pdf_on_or_before(tmp_path):
+    store, history = make_history(tmp_path)
+    assert history.resolve('가', '2024-01-01') is None
+    assert history.resolve('가', '2024-01-02') == '2024-01-02'
+    assert history.resolve('가', pd.Timestamp('2024-01-07')) == '2024-01-05'
+    assert history.resolve('가', '2024-12-31') == '2024-01-10'
+
+    snap = history.snapshot('가', '2024-01-09')
+    assert snap['종목명'].tolist() == ['A', 'C']
+    assert (snap['날짜'] == pd.Timestamp('2024-01-05')).all()
+    assert history.snapshot('나', '2024-01-03').empty
+
+    both = history.snapshots(['가', '나'], '2024-01-04')
+    assert both.columns[0] == 'ETF' and both['ETF'].tolist() == ['가', '가', '나']
+
+    store.save_day('11', '2024-01-08', day_frame({'D': 100.0}))
+    assert history.resolve('가', '2024-01-09') == '2024-01-05'
+    history.refresh()
+    assert history.resolve('가', '2024-01-09') == '2024-01-08'
+    store.close()
+
+
+def test_snapshot_cache_is_lru(tmp_path):
+    store, history = make_history(tmp_path, cache_size=2)
+    for day in ('2024-01-02', '2024-01-05', '2024-01-02', '2024-01-10', '2024-01-05'):
+        history.snapshot('가', day)
+    assert history.cache_info() == {'hits': 1, 'misses': 4, 'size': 2}
+    store.close()
+
+
+def test_diff_between_two_dates(tmp_path):
+    store, history = make_history(tmp_path)
+    table = history.diff(['가', '나'], '2024-01-03', '2024-01-10')
+    rows = {(r.ETF, r.종목명): r for r in table.itertuples(index=False)}
+    assert rows[('가', 'B')].상태.startswith('편출')
+    assert rows[('가', 'C')].상태.startswith('신규 편입')
+    assert table.set_index(['ETF', '종목명']).loc[('가', 'A'), '비중 변화'] == -60.0
+    assert set(table['시작 기준일'][table['ETF'] == '가']) == {'2024-01-02'}
+    # 시작 기준일 이전 기록이 없으면 저장된 첫 PDF부터 비교합니다.
+    assert set(table['시작 기준일'][table['ETF'] == '나']) == {'2024-01-04'}
+    store.close()
@@ -0,0 +1,145 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import timefolio
+from timefolio_bench import EMPTY_PAGE, make_synthetic_page
+from timefolio_calendar import NegativeCache, find_first_pdf_date, trading_days
+
+URL = "http://timefolio.test/m11_view.php?idx={idx}&pdfDate={{}}"
+LISTED = '2024-03-04'
+
+
+def day_strs(start, end):
+    return [d.strftime('%Y-%m-%d') for d in trading_days(datetime.strptime(start, '%Y-%m-%d'),
+                                                          datetime.strptime(end, '%Y-%m-%d'))]
+
+
+class FakeResponse:
+    def __init__(self, status_code, text=''):
+        self.status_code = status_code
+        self.text = text
+        self.headers = {}
+
+
+class FakeSession:
+    """상장일(LISTED) 이전 날짜는 before_listing 상태 코드로, 이후는 보유종목 페이지로 답합니다."""
+
+    def __init__(self, before_listing=200):
+        self.before_listing = before_listing
+        self.requested = []
+
+    def get(self, url, headers=None, timeout=None):
+        date_str = url.rsplit('=', 1)[1]
+        self.requested.append(date_str)
+        if date_str >= LISTED:
+            return FakeResponse(200, make_synthetic_page(date_str, n_stocks=5))
+        return FakeResponse(self.before_listing, EMPTY_PAGE if self.before_listing == 200 else 'Not Found')
+
+
+@pytest.mark.parametrize('first', [0, 1, 57, 199])
+def test_find_first_pdf_date(first):
+    days = day_strs('2023-06-01', '2024-06-28')[:200]
+    probed = []
+
+    def has_pdf(day):
+        probed.append(day)
+        return days.index(day) >= first
+
+    assert find_first_pdf_date(has_pdf, days) == days[first]
+    assert len(probed) < len(days) // 4
+
+
+def test_find_first_pdf_date_none_and_gaps():
+    days = day_strs('2024-01-02', '2024-06-28')
+    assert find_first_pdf_date(lambda day: False, days) is None
+    # 목록에 없는 임시 휴장일(PDF 없음)이 섞여 있어도 probe_window 안에서 다음 날을 확인합니다.
+    gaps = {days[60], days[61]}
+    assert find_first_pdf_date(lambda day: day >= days[40] and day not in gaps, days) == days[40]
+
+
+def test_find_first_pdf_date_propagates_probe_errors():
+    def has_pdf(day):
+        raise ConnectionError(day)
+
+    with pytest.raises(ConnectionError):
+        find_first_pdf_date(has_pdf, day_strs('2024-01-02', '2024-06-28'))
+
+
+def fetch(idx, session):
+    return timefolio.fetch_data_from_web(URL.format(idx=idx), '2023-06-01', '2024-06-28', max_workers=4,
+                                         use_store=False, session=session, verbose=False)
+
+
+def test_bisection_records_first_pdf_date():
+    session = FakeSession(before_listing=200)
+    df = fetch(901, session)
+    assert df['날짜'].min() == datetime.strptime(LISTED, '%Y-%m-%d')
+    assert NegativeCache().first_pdf_date('901') == LISTED
+    assert len(session.requested) < len(day_strs('2023-06-01', '2024-06-28'))
+
+
+def test_failed_probe_is_not_recorded_as_missing_pdf():
+    # 상장일 이전 요청이 모두 실패(404)해도 'PDF 없음'/첫 PDF 날짜로 기록하지 않고 전체 기간을 요청합니다.
+    session = FakeSession(before_listing=404)
+    df = fetch(902, session)
+    assert df['날짜'].min() == datetime.strptime(LISTED, '%Y-%m-%d')
+    cache = NegativeCache()
+    assert cache.first_pdf_date('902') is None
+    assert not any(cache.contains('902', d) for d in day_strs('2023-06-01', LISTED))
+    assert set(session.requested) == set(day_strs('2023-06-01', '2024-06-28'))
+
+
+def test_negative_cache_confirms_only_after_a_second_sighting(tmp_path, monkeypatch):
+    import timefolio_calendar
+    path = str(tmp_path / 'no_pdf.json')
+    cache = NegativeCache(path)
+    cache.add('1', '2024-01-05')
+    cache.add('1', '2024-01-05')  # 같은 실행/점검 시간 안에 다시 본 것은 확정하지 않음
+    assert not cache.contains('1', '2024-01-05')
+    cache.save()
+
+    monkeypatch.setattr(timefolio_calendar, 'NEGATIVE_CONFIRM_AFTER', timedelta(0))
+    later = NegativeCache(path)
+    assert not later.contains('1', '2024-01-05')
+    later.add('1', '2024-01-05')
+    assert later.contains('1', '2024-01-05')
+    later.save()
+    assert NegativeCache(path).contains('1', '2024-01-05')
+
+
+def test_negative_cache_discard_and_future_days(tmp_path, monkeypatch):
+    import timefolio_calendar
+    monkeypatch.setattr(timefolio_calendar, 'NEGATIVE_CONFIRM_AFTER', timedelta(0))
+    path = str(tmp_path / 'no_pdf.json')
+    cache = NegativeCache(path)
+    cache.add('1', '2024-01-08')
+    cache.save()
+    cache.discard('1', '2024-01-08')  # 그 뒤 PDF를 받음 -> 빈 페이지는 일시적이었음
+    cache.save()
+    again = NegativeCache(path)
+    again.add('1', '2024-01-08')
+    assert not again.contains('1', '2024-01-08')
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    cache.add('1', today)
+    cache.add('1', today)
+    assert not cache.contains('1', today)
+
+
+def test_negative_cache_reads_legacy_file_as_pending(tmp_path):
+    path = tmp_path / 'no_pdf.json'
+    path.write_text(json.dumps({'no_pdf': {'1': ['2024-01-05']}, 'first_pdf': {'1': '2023-01-02'}}), encoding='utf-8')
+    cache = NegativeCache(str(path))
+    assert not cache.contains('1', '2024-01-05')
+    assert cache.first_pdf_date('1') == '2023-01-02'
+    cache.add('1', '2024-01-05')
+    assert cache.contains('1', '2024-01-05')
+
+
+def test_trading_days_warns_for_years_without_holidays():
+    with pytest.warns(UserWarning, match='2030'):
+        days = trading_days(datetime(2030, 1, 1), datetime(2030, 1, 7))
+    assert [d.day for d in days] == [1, 2, 3, 4, 7]
+    assert len(trading_days(datetime(2024, 2, 8), datetime(2024, 2, 13))) == 2  # 설 연휴 제외
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from timefolio_changes import change_table, compute_rebalance_events
+
+
+def holdings(rows):
+    return pd.DataFrame(rows, columns=['날짜', '종목명', '비중(%)']).assign(날짜=lambda d: pd.to_datetime(d['날짜']))
+
+
+ROWS = [
+    ('2024-01-02', 'A', 50.0), ('2024-01-02', 'B', 30.0), ('2024-01-02', 'C', 20.0),
+    ('2024-01-03', 'A', 50.2), ('2024-01-03', 'B', 29.8), ('2024-01-03', 'D', 20.0),
+    ('2024-01-04', 'A', 45.0), ('2024-01-04', 'B', 35.0), ('2024-01-04', 'C', 20.0),
+]
+
+
+def test_daily_events_and_threshold():
+    events, _ = compute_rebalance_events(holdings(ROWS), threshold=0.5)
+    got = [(d.strftime('%m-%d'), n, k) for d, n, k in events[['날짜', '종목명', '구분']].itertuples(index=False)]
+    # 0.2%p 변화는 기록하지 않고, 같은 날은 종목 순으로 정렬됩니다.
+    assert got == [('01-03', 'C', '편출'), ('01-03', 'D', '편입'),
+                   ('01-04', 'A', '비중 변경'), ('01-04', 'B', '비중 변경'),
+                   ('01-04', 'C', '편입'), ('01-04', 'D', '편출')]
+    row = events[(events['종목명'] == 'A')].iloc[0]
+    assert (row['이전 비중'], row['비중'], row['비중 변화']) == pytest.approx((50.2, 45.0, -5.2), abs=1e-4)
+
+
+def test_summary_status():
+    _, summary = compute_rebalance_events(holdings(ROWS))
+    status = dict(zip(summary['종목명'], summary['상태']))
+    assert status == {'A': '비중 변경', 'B': '비중 변경', 'C': '비중 변경', 'D': '기간 중 편출입'}
+    d = summary.set_index('종목명').loc['D']
+    assert d['첫 편입일'] == d['마지막 보유일'] == pd.Timestamp('2024-01-03')
+
+    table = change_table(summary)
+    assert table['종목명'].tolist()[:2] == ['A', 'B']
+    assert table.set_index('종목명').loc['D', '상태'] == '기간 중 편출입 (2024-01-03 ~ 2024-01-03)'
+
+
+def test_per_fund_keys_and_categorical_dates():
+    df = pd.concat([holdings(ROWS[:6]).assign(ETF='X'), holdings(ROWS[:3]).assign(ETF='Y')], ignore_index=True)
+    df['날짜'] = df['날짜'].astype('category')
+    df = df[df['날짜'] != pd.Timestamp('2024-01-02')].reset_index(drop=True)  # 빠진 날짜 category가 남음
+    events, summary = compute_rebalance_events(df)
+    assert events.empty
+    assert len(summary) == 3 and set(summary['ETF']) == {'X'}
+    assert (summary['첫 편입일'] == pd.Timestamp('2024-01-03')).all()
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from timefolio_index import HoldingsIndex
+from timefolio_store import HoldingsStore
+
+
+def day_frame(date_str, weights):
+    return pd.DataFrame({'종목명': list(weights), '종목코드': [f'C{i}' for i in range(len(weights))],
+                         '수량': ['1'] * len(weights), '평가금액(원)': [100] * len(weights),
+                         '비중(%)': list(weights.values()), '날짜': pd.to_datetime(date_str)})
+
+
+def test_add_day_replaces_and_drops_empty_postings():
+    index = HoldingsIndex()
+    index.add_day('A', '2024-01-02', {'삼성전자': 10.0, 'NVIDIA': 5.0})
+    index.add_day('A', '2024-01-03', {'삼성전자': 11.0, 'NVIDIA': 4.0})
+    index.add_day('B', '2024-01-03', {'NVIDIA': 7.0})
+    index.add_day('A', '2024-01-03', {'삼성전자': 12.0, 'TSMC': 3.0})
+
+    assert index.holdings_as_of('A', '2024-01-03')[1] == {'삼성전자': 12.0, 'TSMC': 3.0}
+    assert index.holding_periods('NVIDIA', 'A') == [(pd.Timestamp('2024-01-02'), pd.Timestamp('2024-01-02'))]
+    assert 'NVIDIA' in index
+
+    index.add_day('A', '2024-01-02', {'삼성전자': 10.0})
+    index.add_day('B', '2024-01-03', {'삼성전자': 1.0})
+    assert 'NVIDIA' not in index
+    assert index.search('nvidia') == []
+
+
+def test_holding_periods_and_overlap():
+    index = HoldingsIndex()
+    for day, weights in [('2024-01-02', {'X': 1.0, 'Y': 2.0}), ('2024-01-03', {'Y': 2.5}),
+                         ('2024-01-04', {'X': 1.5, 'Y': 3.0})]:
+        index.add_day('A', day, weights)
+    index.add_day('B', '2024-01-04', {'X': 4.0})
+    assert [(a.day, b.day) for a, b in index.holding_periods('X', 'A')] == [(2, 2), (4, 4)]
+    overlap = index.overlap('A', 'B', '2024-01-05')
+    assert overlap['종목명'].tolist() == ['X'] and overlap['겹치는 비중'].tolist() == [1.5]
+
+
+def test_sync_from_store_refreshes_non_final_days(tmp_path):
+    today = datetime.now().strftime('%Y-%m-%d')
+    yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+    with HoldingsStore(str(tmp_path / 'holdings.sqlite')) as store:
+        store.save_days('7', {yesterday: day_frame(yesterday, {'X': 1.0}), today: day_frame(today, {'X': 1.0, 'Y': 2.0})})
+        store._conn.execute("UPDATE days SET fetched_at = ? WHERE pdf_date = ?", (f'{today}T00:00:01', today))
+        index = HoldingsIndex()
+        assert index.sync_from_store(store, {'7': 'A'}) == 2
+        assert index.sync_from_store(store, {'7': 'A'}) == 0
+        assert 'Y' in index
+
+        # 장중에 받은 오늘 페이지를 다시 받아 덮어쓰면 색인도 새 내용으로 바뀝니다. (확정된 어제는 다시 읽지 않음)
+        store.save_day('7', today, day_frame(today, {'X': 3.0, 'Z': 1.0}))
+        assert index.sync_from_store(store, {'7': 'A'}) == 1
+        assert index.holdings_as_of('A')[1] == {'X': 3.0, 'Z': 1.0}
+        assert 'Y' not in index
+
+        # 실행 중에 추가한(저장소 시각을 모르는) 오늘 데이터도 저장본으로 맞춥니다.
+        index.add_frame(day_frame(today, {'W': 9.0}), fund='A')
+        assert index.sync_from_store(store, {'7': 'A'}) == 1
+        assert 'W' not in index
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    index = HoldingsIndex()
+    index.add_day('A', '2024-01-02', {'X': 1.0})
+    path = str(tmp_path / 'index.pkl')
+    index.save(path)
+    loaded = HoldingsIndex.load(path)
+    assert loaded.holdings_as_of('A')[1] == {'X': 1.0}
+    assert HoldingsIndex.load(str(tmp_path / 'missing.pkl')).funds() == []
@@ -0,0 +1,17 @@
+import json
+import sys
+
+from timefolio_lazy import LazyModule, lazy_import
+
+
+def test_already_imported_module_is_returned_as_is():
+    assert lazy_import('json') is json
+
+
+def test_lazy_module_loads_on_first_attribute(monkeypatch):
+    monkeypatch.delitem(sys.modules, 'colorsys', raising=False)
+    mod = lazy_import('colorsys')
+    assert isinstance(mod, LazyModule)
+    assert 'not loaded' in repr(mod)
+    assert mod.rgb_to_hsv(1, 0, 0) == (0.0, 1.0, 1)
+    assert 'colorsys' in sys.modules and '(loaded)' in repr(mod)
@@ -0,0 +1,48 @@
+import numpy as np
+
+from timefolio_bench import EMPTY_PAGE, make_synthetic_page, read_html_baseline
+from timefolio_parser import parse_holdings_table
+
+NOTICE_TABLE = "<table><tr><th>공지</th></tr><tr><td>점검 안내</td></tr></table>"
+TRICKY_PAGE = (
+    "<html><body><TABLE class='pdf'><tr><th>종목명</th><th>종목코드</th><th>평가금액(원)</th><th>비중(%)</th></tr>"
+    "<tr><td><a href='#'>AT&amp;T</a></td><td>T</td><td>1,234,567</td><td>12.5</td></tr>"
+    "<tr><td>  S&amp;P   500 선물 </td><td>ES</td><td>2,000</td><td>0.25</td></tr>"
+    "<tr><td>현금</td><td>-</td><td>-</td><td>-</td></tr>"
+    "<tr><td></td><td>X</td><td>10</td><td>1.0</td></tr>"
+    "</TABLE></body></html>"
+)
+
+
+def assert_same_as_read_html(page):
+    old, new = read_html_baseline(page), parse_holdings_table(page)
+    assert old is not None and new is not None
+    assert old['종목명'].astype(str).tolist() == new['종목명'].astype(str).tolist()
+    assert old['평가금액(원)'].astype('int64').tolist() == new['평가금액(원)'].tolist()
+    assert np.allclose(old['비중(%)'].to_numpy(), new['비중(%)'].to_numpy(), atol=1e-4)
+    return new
+
+
+def test_matches_read_html_on_synthetic_pages():
+    for day in ('2024-03-04', '2024-03-05', '2024-03-06'):
+        new = assert_same_as_read_html(make_synthetic_page(day))
+        assert len(new) == 40
+        assert str(new['비중(%)'].dtype) == 'float32' and str(new['평가금액(원)'].dtype) == 'int64'
+        assert new['종목코드'].tolist()[0] == '100000'
+
+
+def test_skips_other_tables_and_incomplete_rows():
+    new = assert_same_as_read_html(TRICKY_PAGE)
+    assert new['종목명'].astype(str).tolist() == ['AT&T', 'S&P 500 선물']
+    assert new['평가금액(원)'].tolist() == [1234567, 2000]
+
+
+def test_finds_holdings_table_after_other_tables():
+    # read_html 방식은 첫 테이블만 보므로 앞에 다른 테이블이 있으면 보유종목을 놓칩니다.
+    page = TRICKY_PAGE.replace('<body>', '<body>' + NOTICE_TABLE)
+    assert parse_holdings_table(page)['종목명'].astype(str).tolist() == ['AT&T', 'S&P 500 선물']
+
+
+def test_page_without_holdings_table():
+    assert parse_holdings_table(EMPTY_PAGE) is None
+    assert parse_holdings_table(NOTICE_TABLE) is None
@@ -0,0 +1,36 @@
+import numpy as np
+
+from timefolio_plot import minmax_decimate
+
+
+def test_short_series_is_returned_unchanged():
+    x = np.arange(8, dtype=float)
+    y = x * 2
+    dx, dy = minmax_decimate(x, y, 2)
+    assert dx is x and dy is y
+
+
+def test_keeps_first_last_and_extremes_per_bucket():
+    rng = np.random.default_rng(0)
+    x = np.arange(10_000, dtype=float)
+    y = rng.normal(size=len(x))
+    y[1234], y[8765] = 50.0, -50.0
+    dx, dy = minmax_decimate(x, y, 100)
+
+    assert len(dx) <= 4 * 100 and np.all(np.diff(dx) > 0)
+    assert (dx[0], dx[-1]) == (x[0], x[-1])
+    assert 50.0 in dy and -50.0 in dy
+    assert np.array_equal(dy, y[dx.astype(int)])
+    buckets = (x / x[-1] * 100).astype(int).clip(max=99)
+    for b in (0, 37, 99):
+        in_bucket = buckets == b
+        assert y[in_bucket].max() in dy and y[in_bucket].min() in dy
+
+
+def test_nan_gaps_are_kept():
+    x = np.arange(1_000, dtype=float)
+    y = np.sin(x / 50)
+    y[400:600] = np.nan  # 보유하지 않은 구간
+    dx, dy = minmax_decimate(x, y, 20)
+    assert np.isnan(dy).any()
+    assert np.nanmax(dy) == np.nanmax(y) and np.nanmin(dy) == np.nanmin(y)
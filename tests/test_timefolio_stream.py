@@ -0,0 +1,42 @@
+import pandas as pd
+
+from timefolio_stream import StreamingAggregates
+
+
+def day_frame(weights, value=100):
+    return pd.DataFrame({'종목명': list(weights), '비중(%)': list(weights.values()), '평가금액(원)': [value] * len(weights)})
+
+
+def test_aggregates_out_of_order_days():
+    agg = StreamingAggregates()
+    agg.update('2024-01-03', day_frame({'A': 50.0, 'B': 30.0, 'C': 20.0}, value=200))
+    agg.update('2024-01-02', day_frame({'A': 60.0, 'B': 40.0}))
+    assert agg.days == 2 and agg.rows == 5
+    assert agg.last_day == pd.Timestamp('2024-01-03')
+    assert agg.top_names(2) == ['A', 'B']
+    assert agg.total_series().tolist() == [200 / 1e9, 600 / 1e9]
+    assert agg.weight_series('A').tolist() == [60.0, 50.0]
+
+    # 그래프에 그리는 종목은 이후 들어오는 날도 이어서 반영합니다.
+    agg.update('2024-01-04', day_frame({'A': 55.0, 'C': 45.0}))
+    assert agg.weight_series('A').tolist() == [60.0, 50.0, 55.0]
+    assert agg.weight_series('C').index.tolist() == [pd.Timestamp('2024-01-03'), pd.Timestamp('2024-01-04')]
+    assert agg.weight_series('없음').empty
+
+
+def test_to_frame_matches_input_rows():
+    agg = StreamingAggregates()
+    days = {'2024-01-02': {'A': 60.0, 'B': 40.0}, '2024-01-03': {'B': 70.0, 'C': 30.0}}
+    for day, weights in reversed(list(days.items())):
+        agg.update(day, day_frame(weights))
+    # 같은 날을 다시 받으면 그날 비중을 교체합니다.
+    agg.update('2024-01-03', day_frame({'B': 65.0, 'D': 35.0}))
+
+    frame = agg.to_frame()
+    assert frame['날짜'].is_monotonic_increasing
+    assert str(frame['비중(%)'].dtype) == 'float32'
+    assert isinstance(frame['종목명'].dtype, pd.CategoricalDtype)
+    got = {(d.strftime('%Y-%m-%d'), n): float(w) for d, n, w in frame.itertuples(index=False)}
+    assert got == {('2024-01-02', 'A'): 60.0, ('2024-01-02', 'B'): 40.0,
+                   ('2024-01-03', 'B'): 65.0, ('2024-01-03', 'D'): 35.0}
+    assert StreamingAggregates().to_frame().empty
@@ -0,0 +1,177 @@
+import types
+from datetime import datetime
+
+import pytest
+
+import tradingview
+from result_cache import ResultCache
+from scrape_timing import ScrapeTelemetry
+
+
+@pytest.fixture(autouse=True)
+def selenium_names():
+    tradingview.load_selenium()
+
+
+def test_shard_positions_cover_every_position_once():
+    shards = [list(tradingview.shard_positions(10, 3, k)) for k in range(3)]
+    assert shards == [[0, 3, 6, 9], [1, 4, 7], [2, 5, 8]]
+    assert list(tradingview.shard_positions(2, 4, 3)) == []
+
+
+class FakeDriver:
+    def __init__(self):
+        self.keys_sent = 0
+
+    def execute_script(self, script, *args):
+        return {'symbol': 0, 'report': 0, 'quietMs': 0}
+
+    def find_element(self, by, value):
+        return types.SimpleNamespace(send_keys=lambda *keys: setattr(self, 'keys_sent', self.keys_sent + len(keys)))
+
+
+class FailingWait:
+    def until(self, condition):
+        raise tradingview.TimeoutException("심볼이 바뀌지 않음")
+
+
+def test_advance_moves_position_even_if_wait_fails():
+    session = tradingview.BrowserSession.__new__(tradingview.BrowserSession)
+    session.driver, session.extract_wait, session.position = FakeDriver(), FailingWait(), 3
+    with pytest.raises(tradingview.TimeoutException):
+        session.advance(2)
+    assert session.position == 5 and session.driver.keys_sent == 2
+
+
+class FakeSession:
+    """advance가 키를 보낸 뒤 한 번 실패하는 세션. 실제 관심목록 위치(cursor)를 따로 추적합니다."""
+
+    session_id = 1
+
+    def __init__(self, fail_at):
+        self.fail_at = fail_at
+        self.cursor = 0
+        self.position = 0
+        self.report_rendered = False
+        self.last_profit_pct = ''
+        self.strategy_text = None
+
+    def is_alive(self):
+        return True
+
+    def read_symbol(self):
+        return f"SYM{self.cursor}"
+
+    def advance(self, steps, step):
+        self.cursor += steps
+        self.position += steps
+        if self.cursor == self.fail_at:
+            raise tradingview.TimeoutException("렌더 대기 시간 초과")
+
+
+def fake_app(total):
+    app = types.SimpleNamespace(
+        stop_requested=False, is_paused=False, telemetry=ScrapeTelemetry(total), journal={}, use_cache=False,
+        target_count=total, results={}, logs=[], scraped=[],
+        master=types.SimpleNamespace(after=lambda ms, f: None),
+    )
+    app.log_system = app.logs.append
+    app.set_session_status = lambda session, text: None
+    app.record_result = lambda position, data: app.results.__setitem__(position, data) if data else None
+
+    def scrape_symbol(session, symbol, target_periods, end_date_obj, step):
+        app.scraped.append(symbol)
+        return {'symbol': symbol, 'profit_pct': '1%', 'full_name': symbol}
+    app.scrape_symbol = scrape_symbol
+    return app
+
+
+def test_run_shard_stays_in_sync_after_failed_advance():
+    app = fake_app(10)
+    session = FakeSession(fail_at=3)
+    tradingview.TradingViewApp.run_shard(app, session, list(tradingview.shard_positions(10, 3, 0)), [], None)
+    # 위치 3은 실패로 기록되고, 그 뒤로도 세 칸씩만 이동해 6, 9를 정확히 수집합니다.
+    assert app.scraped == ['SYM0', 'SYM6', 'SYM9']
+    assert sorted(app.results) == [0, 6, 9]
+    assert session.cursor == 9
+
+
+class PropertiesDriver:
+    """'속성' 탭 클릭과 리포트 텍스트 읽기만 흉내 내는 드라이버."""
+
+    def __init__(self, properties):
+        self.properties = properties
+        self.clicked = []
+
+    def execute_script(self, script, *args):
+        if script == tradingview.CLICK_JS:
+            self.clicked.append(args[0])
+            return True
+        return {'properties': self.properties}
+
+
+class ImmediateWait:
+    """조건을 몇 번만 바로 확인하고, 만족하지 않으면 시간 초과로 처리합니다."""
+
+    def __init__(self, driver, attempts=3):
+        self.driver = driver
+        self.attempts = attempts
+
+    def until(self, condition):
+        for _ in range(self.attempts):
+            result = condition(self.driver)
+            if result:
+                return result
+        raise tradingview.TimeoutException("시간 초과")
+
+
+def test_read_cache_key_uses_properties_tab():
+    driver = PropertiesDriver("거래 범위 2020년 1월 2일 — 2024년 6월 28일\n수수료 0.1%")
+    fingerprint, last_bar = tradingview.read_cache_key(driver, ImmediateWait(driver), "전략 14", ['1M'])
+    assert driver.clicked == [tradingview.PROPERTIES_TAB_XPATH]
+    assert last_bar == '2024-06-28' and len(fingerprint) == 16
+
+    # 날짜가 보이지 않으면 (아직 그려지지 않았거나 탭이 다름) 캐시를 쓰지 않습니다.
+    driver.properties = "불러오는 중"
+    assert tradingview.read_cache_key(driver, ImmediateWait(driver), "전략 14", ['1M']) is None
+
+
+class FakeJournal(dict):
+    def append(self, position, symbol, data):
+        self[symbol] = data
+
+
+def test_cache_hit_recomputes_reference_date_metrics(tmp_path, monkeypatch):
+    monkeypatch.setattr(tradingview, 'read_cache_key', lambda *args: ('fp', '2024-06-28'))
+    cache = ResultCache(str(tmp_path / 'results.sqlite'))
+    raw = {'symbol': 'SYM0', 'profit_pct': '+21.00%', 'net_profit': '2,100 USD +21.00%', 'buy_hold_return': '+10.00%',
+           'trade_1_entry': '2020년 1월 1일', 'full_name': 'SYM0'}
+
+    def run(end_date):
+        app = fake_app(1)
+        app.use_cache, app.result_cache, app.journal = True, cache, FakeJournal()
+        app.add_derived_metrics = lambda data, end: tradingview.TradingViewApp.add_derived_metrics(app, data, end)
+
+        def scrape_symbol(session, symbol, target_periods, end_date_obj, step):
+            app.scraped.append(symbol)
+            data = dict(raw)
+            app.add_derived_metrics(data, end_date_obj)
+            return data
+        app.scrape_symbol = scrape_symbol
+        session = FakeSession(fail_at=None)
+        session.strategy_text = "전략 14"
+        session.driver = session.extract_wait = None
+        tradingview.TradingViewApp.run_shard(app, session, [0], ['1M'], end_date)
+        return app
+
+    first = run(datetime(2022, 1, 1))
+    assert first.scraped == ['SYM0'] and first.results[0]['trading_duration_years'] == '2.0년'
+    stored = cache.get('SYM0', 'fp', '2024-06-28')
+    assert not set(tradingview.DERIVED_KEYS) & set(stored)
+
+    # 기준일만 바꿔 다시 돌리면 캐시에서 가져오되 기간/수익률은 새 기준일로 계산합니다.
+    second = run(datetime(2024, 1, 1))
+    assert second.scraped == []
+    assert second.results[0]['trading_duration_years'] == '4.0년'
+    assert second.results[0]['simple_avg_return_pct'] == '5.25%'
+    assert second.results[0]['alpha_beta_status'] == '알파(α)'
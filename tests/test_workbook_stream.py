@@ -0,0 +1,56 @@
+import os
+
+import openpyxl
+
+from workbook_stream import StreamingWorkbook
+
+SHEETS = {'전체': [('No.', 'No.'), ('symbol', '심볼'), ('status', '상태')], '요약': [('symbol', '심볼')]}
+
+
+def rows(path, sheet):
+    return [list(r) for r in openpyxl.load_workbook(path)[sheet].iter_rows(values_only=True)]
+
+
+def test_rows_follow_watchlist_order(tmp_path):
+    path = str(tmp_path / 'out.xlsx')
+    book = StreamingWorkbook(path, SHEETS, highlight=('status', '알파(α)', {'bg_color': '#C6EFCE'}))
+    book.add(2, {'symbol': 'C', 'status': '베타(β)'})
+    book.add(0, {'symbol': 'A', 'status': '알파(α)'})
+    assert book.rows == 1  # 위치 1이 끝나기 전까지 C는 들고 있음
+    book.add(1, None)
+    book.add(4, {'symbol': 'E', 'status': '알파(α)'})
+    assert book.close(remaining=[{'symbol': 'A', 'status': 'x'}, {'symbol': 'Z', 'status': '베타(β)'}])
+    assert not os.path.exists(path + '.part')
+
+    assert rows(path, '전체') == [['No.', '심볼', '상태'], [1, 'A', '알파(α)'], [2, 'C', '베타(β)'],
+                                 [3, 'E', '알파(α)'], [4, 'Z', '베타(β)']]
+    assert rows(path, '요약') == [['심볼'], ['A'], ['C'], ['E'], ['Z']]
+    assert book.close()  # 두 번 닫아도 됨
+
+
+def test_header_uses_pandas_header_style(tmp_path):
+    # pandas 2.x 이하 to_excel의 기본 머리글 서식 (굵게, 얇은 테두리, 가운데/위쪽 정렬)
+    path = str(tmp_path / 'out.xlsx')
+    book = StreamingWorkbook(path, {'전체': [('symbol', '심볼')]})
+    book.add(0, {'symbol': 'A'})
+    book.close()
+
+    sheet = openpyxl.load_workbook(path)['전체']
+    header, body = sheet['A1'], sheet['A2']
+    assert header.font.b and not body.font.b
+    assert (header.alignment.horizontal, header.alignment.vertical) == ('center', 'top')
+    for side in ('left', 'right', 'top', 'bottom'):
+        assert getattr(header.border, side).style == 'thin'
+    assert body.border.left.style is None
+
+
+def test_close_without_rows_keeps_existing_file(tmp_path):
+    path = str(tmp_path / 'out.xlsx')
+    with open(path, 'wb') as f:
+        f.write(b'previous run')
+    book = StreamingWorkbook(path, SHEETS)
+    book.add(0, None)
+    assert not book.close()
+    assert sorted(os.listdir(tmp_path)) == ['out.xlsx']
+    with open(path, 'rb') as f:
+        assert f.read() == b'previous run'